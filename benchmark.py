@@ -0,0 +1,317 @@
+"""
+Offline parsing benchmark
+
+Runs CarDealerScraper's parsing stages against the captured inventory_page.html
+and synthetic pages built by repeating its vehicle cards, with no network or
+browser. Reports throughput, per-stage latency percentiles and peak memory, and
+writes the results as JSON so runs can be compared between commits.
+
+Usage:
+    python benchmark.py                          # captured page + 1k/10k cards
+    python benchmark.py --sizes 1000 --repeat 10
+    python benchmark.py --output after.json --compare before.json
+    python benchmark.py --parse-workers 4        # also time concurrent parsing in a ParsePool
+"""
+import argparse
+import gzip
+import json
+import logging
+import platform
+import re
+import statistics
+import subprocess
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List
+from bs4 import BeautifulSoup
+from extraction import scan_card
+from html_scope import scope_inventory_page
+from models import ScraperResponse
+from parse_pool import ParsePool
+from scraper import CarDealerScraper
+import serialization
+
+BASE_URL = "https://www.usautosofdallas.com"
+SAMPLE_PAGE = "inventory_page.html"
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+VIN_ATTR_RE = re.compile(r'data-vehicle-vin="[^"]*"')
+STOCK_ATTR_RE = re.compile(r'data-vehicle-stock-no="[^"]*"')
+
+# Page-level stages run at most this many cards' worth of work per repeat,
+# so the 10k page is parsed once while the captured page is parsed --repeat times
+PAGE_REPEAT_BUDGET = 100
+
+
+def percentiles(samples_ns: List[int]) -> dict:
+    """Latency summary in milliseconds"""
+    ordered = sorted(samples_ns)
+
+    def pick(q: float) -> float:
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index] / 1e6
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) / 1e6, 4),
+        "p50_ms": round(pick(0.50), 4),
+        "p90_ms": round(pick(0.90), 4),
+        "p99_ms": round(pick(0.99), 4),
+        "max_ms": round(ordered[-1] / 1e6, 4)
+    }
+
+
+def time_calls(fn: Callable, items: list, repeat: int = 1) -> dict:
+    """Time fn(item) for every item, repeat times, and summarize"""
+    samples = []
+    started = time.perf_counter_ns()
+    for _ in range(repeat):
+        for item in items:
+            t0 = time.perf_counter_ns()
+            fn(item)
+            samples.append(time.perf_counter_ns() - t0)
+    total = (time.perf_counter_ns() - started) / 1e9
+    result = percentiles(samples)
+    result["total_s"] = round(total, 4)
+    result["per_second"] = round(len(samples) / total, 1) if total else None
+    return result
+
+
+def stdlib_response_body(data: dict) -> bytes:
+    """Body the way JSONResponse renders it, the path /scrape used before serialization.py"""
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def build_synthetic_page(cards: List[str], count: int) -> str:
+    """A listing page with count cards, cycling the captured ones with unique VINs and stock numbers"""
+    body = []
+    for i in range(count):
+        card = cards[i % len(cards)]
+        card = VIN_ATTR_RE.sub(f'data-vehicle-vin="BENCH{i:012d}"', card)
+        card = STOCK_ATTR_RE.sub(f'data-vehicle-stock-no="S{i}"', card)
+        body.append(card)
+    return (
+        "<html><head><title>Synthetic inventory</title></head><body>"
+        "<div class=\"dws-vehicle-listing-grid\">" + "".join(body) + "</div></body></html>"
+    )
+
+
+def measure_pipeline(scraper: CarDealerScraper, html: str, scope: Callable[[str], str] = None):
+    """Seconds and traced peak bytes to parse a page into an LLM-format response"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    page_soup = BeautifulSoup(scope(html) if scope else html, "lxml")
+    page_cars = [
+        car for car in (scraper._parse_vehicle_card(e, BASE_URL) for e in scraper._find_vehicle_elements(page_soup))
+        if car
+    ]
+    ScraperResponse(
+        success=True,
+        total_cars=len(page_cars),
+        cars=page_cars,
+        scraped_at=datetime.now().isoformat()
+    ).to_llm_format()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    page_soup.decompose()
+    return seconds, peak
+
+
+def benchmark_page(name: str, html: str, repeat: int) -> dict:
+    """Run every parsing stage against one page"""
+    scraper = CarDealerScraper()
+
+    soup = BeautifulSoup(html, "lxml")
+    elements = scraper._find_vehicle_elements(soup)
+    cars = [car for car in (scraper._parse_vehicle_card(e, BASE_URL) for e in elements) if car]
+    titles = [f"{car.year} {car.make} {car.model}" for car in cars if car.make]
+    price_elements = (scan_card(e).price for e in elements)
+    price_texts = [e.get_text(strip=True) for e in price_elements if e is not None]
+    mileage_texts = [f"{car.mileage:,} miles" for car in cars if car.mileage is not None]
+    response = ScraperResponse(
+        success=True,
+        total_cars=len(cars),
+        cars=cars,
+        scraped_at=datetime.now().isoformat()
+    )
+
+    page_repeat = max(1, repeat * PAGE_REPEAT_BUDGET // max(len(elements), PAGE_REPEAT_BUDGET))
+    stages = {
+        "html_parse": time_calls(lambda h: BeautifulSoup(h, "lxml"), [html], page_repeat),
+        "scoped_html_parse": time_calls(lambda h: BeautifulSoup(scope_inventory_page(h), "lxml"), [html], page_repeat),
+        "card_discovery": time_calls(scraper._find_vehicle_elements, [soup], page_repeat),
+        "parse_vehicle_card": time_calls(lambda e: scraper._parse_vehicle_card(e, BASE_URL), elements, repeat),
+        "parse_vehicle_title": time_calls(scraper._parse_vehicle_title, titles, repeat),
+        "extract_price": time_calls(scraper._extract_price, price_texts, repeat),
+        "extract_number": time_calls(scraper._extract_number, mileage_texts, repeat),
+        "to_llm_format": time_calls(lambda r: r.to_llm_format(), [response], page_repeat),
+        # Full response bodies: model_dump/to_llm_format + stdlib json against the direct encoders
+        "serialize_llm_stdlib": time_calls(lambda r: stdlib_response_body(r.to_llm_format()), [response], page_repeat),
+        "serialize_llm_fast": time_calls(serialization.encode_llm_format, [response], page_repeat),
+        "serialize_full_stdlib": time_calls(lambda r: stdlib_response_body(r.model_dump()), [response], page_repeat),
+        "serialize_full_fast": time_calls(serialization.encode_model, [response], page_repeat)
+    }
+    llm_body = serialization.encode_llm_format(response)
+    stages["gzip_llm_body"] = time_calls(gzip.compress, [llm_body], page_repeat)
+    del soup, elements
+
+    # Peak memory of the whole pipeline, measured separately so tracing
+    # overhead doesn't skew the timings above
+    pipeline_seconds, peak = measure_pipeline(scraper, html)
+    # tracemalloc doesn't see lxml's C allocations, so this counts the scoped
+    # BeautifulSoup tree but not the transient lxml tree it was cut from
+    _, scoped_peak = measure_pipeline(scraper, html, scope_inventory_page)
+
+    return {
+        "page": name,
+        "html_bytes": len(html.encode("utf-8")),
+        "cards": len(cars),
+        "repeat": repeat,
+        "page_repeat": page_repeat,
+        "llm_body_bytes": len(llm_body),
+        "llm_body_gzip_bytes": len(gzip.compress(llm_body)),
+        "pipeline": {
+            "seconds": round(pipeline_seconds, 4),
+            "cards_per_second": round(len(cars) / pipeline_seconds, 1) if pipeline_seconds else None,
+            "peak_memory_mb": round(peak / 1024 / 1024, 2),
+            "scoped_peak_memory_mb": round(scoped_peak / 1024 / 1024, 2)
+        },
+        "stages": stages
+    }
+
+
+def benchmark_concurrent_parse(html: str, workers: int, chunk_size: int) -> dict:
+    """
+    Pages per second when `workers` scrape threads parse a page at once,
+    on the threads themselves and through a ParsePool of as many processes
+    """
+    pages = workers * 2
+    url = BASE_URL + "/inventory"
+    pool = ParsePool(workers=workers, chunk_size=chunk_size)
+    pool.start()
+    try:
+        rates = {}
+        for name, parse_pool in (("threads", None), ("parse_pool", pool)):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(
+                    lambda _: CarDealerScraper(parse_pool=parse_pool)._parse_page(html, url, BASE_URL),
+                    range(pages)
+                ))
+            rates[name] = round(pages / (time.perf_counter() - started), 2)
+    finally:
+        pool.shutdown()
+    return {"workers": workers, "chunk_size": chunk_size, "pages": pages, "pages_per_second": rates}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict):
+    """Print p50 latency changes per stage against an earlier results file"""
+    previous = {page["page"]: page for page in baseline.get("pages", [])}
+    print(f"\nCompared with {baseline.get('commit', 'unknown')}:")
+    for page in current["pages"]:
+        before = previous.get(page["page"])
+        if not before:
+            continue
+        print(f"  {page['page']}")
+        for stage, stats in page["stages"].items():
+            old = before["stages"].get(stage)
+            if not old or not old["p50_ms"]:
+                continue
+            change = (stats["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100
+            print(f"    {stage:<22} p50 {old['p50_ms']:>10.4f} -> {stats['p50_ms']:>10.4f} ms ({change:+.1f}%)")
+        old_peak = before["pipeline"]["peak_memory_mb"]
+        print(f"    {'peak_memory_mb':<22}     {old_peak:>10.2f} -> {page['pipeline']['peak_memory_mb']:>10.2f}")
+
+
+def print_report(results: dict):
+    for page in results["pages"]:
+        pipeline = page["pipeline"]
+        print(
+            f"\n{page['page']}: {page['cards']} cards, {page['html_bytes'] / 1024:.0f} KB, "
+            f"{pipeline['cards_per_second']} cards/s, peak {pipeline['peak_memory_mb']} MB "
+            f"({pipeline.get('scoped_peak_memory_mb')} MB scoped)"
+        )
+        print(f"  {'stage':<22} {'calls':>7} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'ops/s':>12}")
+        for stage, stats in page["stages"].items():
+            if not stats["count"]:
+                continue
+            print(
+                f"  {stage:<22} {stats['count']:>7} {stats['p50_ms']:>10.4f} {stats['p90_ms']:>10.4f} "
+                f"{stats['p99_ms']:>10.4f} {stats['per_second']:>12}"
+            )
+        concurrent = page.get("concurrent_parse")
+        if concurrent:
+            rates = concurrent["pages_per_second"]
+            print(
+                f"  {concurrent['workers']} concurrent parses: {rates['threads']} pages/s on threads, "
+                f"{rates['parse_pool']} pages/s in the parse pool"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the inventory parsing stages")
+    parser.add_argument("--page", default=SAMPLE_PAGE, help="Captured inventory page to benchmark")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated synthetic page sizes in cards (empty to skip)")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over each stage's inputs")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Also compare concurrent parsing on threads and in a ParsePool of this many processes")
+    parser.add_argument("--chunk-size", type=int, default=100, help="ParsePool cards per chunk")
+    args = parser.parse_args()
+
+    # Card discovery logs at INFO on every call
+    logging.getLogger("scraper").setLevel(logging.WARNING)
+
+    with open(args.page, encoding="utf-8") as f:
+        html = f.read()
+
+    pages = [("inventory_page.html", html)]
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    if sizes:
+        scraper = CarDealerScraper()
+        cards = [str(e) for e in scraper._find_vehicle_elements(BeautifulSoup(html, "lxml"))]
+        if not cards:
+            raise SystemExit(f"No vehicle cards found in {args.page}")
+        pages += [(f"synthetic_{size}", build_synthetic_page(cards, size)) for size in sizes]
+
+    results = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pages": []
+    }
+    for name, page_html in pages:
+        print(f"Benchmarking {name}...", flush=True)
+        page = benchmark_page(name, page_html, max(1, args.repeat))
+        if args.parse_workers > 0:
+            page["concurrent_parse"] = benchmark_concurrent_parse(page_html, args.parse_workers, args.chunk_size)
+        results["pages"].append(page)
+
+    print_report(results)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import logging
+import os
+import shutil
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+import config
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Requests the scraper never needs: we read DOM text and image URLs, not pixels,
+# media or fonts
+BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "ico", "bmp",
+    "mp4", "webm", "m3u8", "mp3", "ogg",
+    "woff", "woff2", "ttf", "otf", "eot",
+]
+
+# Analytics, ads, chat widgets and video embeds common on dealer sites
+BLOCKED_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "googlesyndication.com", "facebook.net", "bat.bing.com", "clarity.ms",
+    "hotjar.com", "segment.io", "newrelic.com", "nr-data.net", "tiktok.com", "snapchat.com",
+    "carchat24.com", "gubagoo.io", "podium.com", "livechatinc.com", "tawk.to", "intercom.io",
+    "drift.com", "zopim.com", "youtube.com", "ytimg.com", "vimeo.com", "cdn.carnow.com",
+]
+
+# Flags that trim Chrome's background work and per-tab memory
+LOW_MEMORY_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=MediaRouter,OptimizationHints,Translate",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--renderer-process-limit=2",
+    "--js-flags=--max-old-space-size=256",
+]
+
+# Bytes, request count and load time of the current page from the Performance API.
+# Cross-origin resources without Timing-Allow-Origin report a transferSize of 0,
+# so their encoded body size is used when known.
+PAGE_STATS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+const size = e => e.transferSize || e.encodedBodySize || 0;
+return {
+    bytes: (nav ? size(nav) : 0) + resources.reduce((total, e) => total + size(e), 0),
+    requests: resources.length + (nav ? 1 : 0),
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd / 1000 : null,
+    load_time: nav && nav.loadEventEnd ? nav.loadEventEnd / 1000 : null
+};
+"""
+
+
+def blocked_url_patterns() -> list:
+    """
+    Every URL the blocking profile rejects, in CDP Network.setBlockedURLs
+    wildcard syntax, including any BROWSER_BLOCKED_DOMAINS
+    """
+    patterns = []
+    for extension in BLOCKED_EXTENSIONS:
+        patterns += [f"*.{extension}", f"*.{extension}?*"]
+    domains = BLOCKED_DOMAINS + [d.strip() for d in config.BROWSER_BLOCKED_DOMAINS.split(",") if d.strip()]
+    return patterns + [f"*{domain}/*" for domain in domains]
+
+
+def apply_resource_blocking(driver):
+    """Have Chrome drop blocked requests before they hit the network (CDP)"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
+
+
+def page_stats(driver) -> dict:
+    """Transfer size and load timings of the page currently loaded in driver"""
+    stats = driver.execute_script(PAGE_STATS_JS)
+    for key in ("dom_content_loaded", "load_time"):
+        if stats.get(key) is not None:
+            stats[key] = round(stats[key], 3)
+    return stats
+
+
+def build_chrome_options(headless: bool = True, block_resources: bool = None) -> Options:
+    """Build the Chrome options used for every scraping session"""
+    if block_resources is None:
+        block_resources = config.BROWSER_BLOCK_RESOURCES
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    if config.BROWSER_LOW_MEMORY:
+        for argument in LOW_MEMORY_ARGUMENTS:
+            chrome_options.add_argument(argument)
+    if block_resources:
+        # Belt and braces with the CDP block list: never decode images or
+        # autoplay media, even from URLs the patterns miss
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    return chrome_options
+
+
+def create_chrome_driver(headless: bool = True, block_resources: bool = None) -> webdriver.Chrome:
+    """Launch a new Chrome WebDriver session"""
+    if block_resources is None:
+        block_resources = config.BROWSER_BLOCK_RESOURCES
+    with metrics.STAGE_SECONDS.time(stage="driver_startup"):
+        driver = _launch_chrome(build_chrome_options(headless, block_resources))
+    if block_resources:
+        try:
+            apply_resource_blocking(driver)
+        except Exception as e:
+            logger.warning(f"Could not enable request blocking: {e}")
+    return driver
+
+
+def _launch_chrome(chrome_options: Options) -> webdriver.Chrome:
+    """Start Chrome with the given options, locating the binary and driver"""
+
+    # Check if running in Railway/Nixpacks environment
+    chrome_bin = shutil.which("chromium") or shutil.which("chromium-browser") or shutil.which("google-chrome")
+
+    # Try multiple possible chromedriver locations
+    chromedriver_path = (
+        shutil.which("chromedriver") or
+        shutil.which("chromium-chromedriver") or
+        shutil.which("chromedriver-chromium") or
+        "/usr/bin/chromedriver" if os.path.exists("/usr/bin/chromedriver") else None or
+        "/usr/lib/chromium-browser/chromedriver" if os.path.exists("/usr/lib/chromium-browser/chromedriver") else None
+    )
+
+    logger.info(f"Chrome binary detected: {chrome_bin}")
+    logger.info(f"ChromeDriver detected: {chromedriver_path}")
+
+    if chrome_bin:
+        logger.info(f"Using system Chrome at: {chrome_bin}")
+        chrome_options.binary_location = chrome_bin
+
+    # If we found system chromedriver, use it directly
+    if chromedriver_path and os.path.exists(chromedriver_path):
+        logger.info(f"Using system ChromeDriver at: {chromedriver_path}")
+        service = Service(chromedriver_path)
+        return webdriver.Chrome(service=service, options=chrome_options)
+    # If we have chromium installed (Railway), try without explicit service
+    elif chrome_bin:
+        logger.info("System Chrome found but no chromedriver in PATH, trying default initialization")
+        try:
+            return webdriver.Chrome(options=chrome_options)
+        except Exception as e:
+            logger.error(f"Default initialization failed: {e}")
+            # Fallback to webdriver-manager as last resort
+            logger.info("Trying webdriver-manager as fallback")
+            service = Service(ChromeDriverManager().install())
+            return webdriver.Chrome(service=service, options=chrome_options)
+    # Local development - use webdriver-manager
+    else:
+        logger.info("No system Chrome found, using webdriver-manager")
+        service = Service(ChromeDriverManager().install())
+        return webdriver.Chrome(service=service, options=chrome_options)
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from models import ScraperResponse
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a dealership URL so equivalent spellings share a cache entry"""
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    return urlunsplit(("https", host, path, parts.query, ""))
+
+
+class CacheEntry:
+    """A cached ScraperResponse, when it was stored and an optional per-entry freshness ttl"""
+
+    def __init__(self, value: ScraperResponse, ttl: Optional[float] = None):
+        self.value = value
+        self.ttl = ttl
+        self.created_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of ScraperResponse objects
+
+    Fresh entries (younger than ttl) are served directly. Entries older than ttl
+    but within ttl + stale_ttl are served immediately while a single background
+    refresh runs. Concurrent misses for the same key share one in-flight scrape.
+    Only successful scrapes are stored.
+
+    Each fetch runs in its own task that callers await through asyncio.shield,
+    so a caller that is cancelled (a disconnected client, a scheduler shutting
+    down) leaves the fetch running for everyone else waiting on it.
+    """
+
+    def __init__(self, ttl: float = 300.0, stale_ttl: float = 900.0, max_entries: int = 100):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background = set()
+        self._counts = {"hit": 0, "stale": 0, "miss": 0, "coalesced": 0, "refresh": 0}
+
+    @staticmethod
+    def make_key(url: str, **options) -> str:
+        """Cache key from the normalized URL plus any options that change the result"""
+        opts = "&".join(f"{name}={options[name]}" for name in sorted(options))
+        return f"{normalize_url(url)}|{opts}"
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[ScraperResponse]],
+        force_refresh: bool = False,
+        ttl: Optional[float] = None
+    ) -> Tuple[ScraperResponse, str, float]:
+        """
+        Return a cached response or run fetch() to produce one
+
+        Args:
+            key: Cache key from make_key()
+            fetch: Produces a fresh response on a miss
+            force_refresh: Skip any cached entry and fetch again
+            ttl: Freshness of the stored result, if not the cache default
+
+        Returns:
+            (response, cache status, age in seconds). Status is one of
+            hit, stale, miss, coalesced or refresh.
+        """
+        entry = self._entries.get(key)
+        if entry and not force_refresh:
+            age = entry.age
+            fresh_for = entry.ttl if entry.ttl is not None else self.ttl
+            if age <= fresh_for:
+                self._entries.move_to_end(key)
+                self._counts["hit"] += 1
+                return entry.value, "hit", age
+            if age <= fresh_for + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._counts["stale"] += 1
+                self._refresh_in_background(key, fetch, entry.ttl)
+                return entry.value, "stale", age
+
+        if key in self._inflight:
+            self._counts["coalesced"] += 1
+            value = await self._wait(self._inflight[key])
+            return value, "coalesced", 0.0
+
+        status = "refresh" if force_refresh else "miss"
+        self._counts[status] += 1
+        value = await self._wait(self._start_fetch(key, fetch, ttl))
+        return value, status, 0.0
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Cached entry for key regardless of age, without touching LRU order"""
+        return self._entries.get(key)
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a fetch for key is running, so a get_or_fetch() now would join it"""
+        return key in self._inflight
+
+    def put(self, key: str, value: ScraperResponse, ttl: Optional[float] = None):
+        """Store a response, evicting the least recently used entries over max_entries"""
+        self._entries[key] = CacheEntry(value, ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Entry count and hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "in_flight": len(self._inflight),
+            **self._counts
+        }
+
+    async def shutdown(self):
+        """Cancel the fetches still in flight and wait for them to stop"""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[ScraperResponse]],
+        ttl: Optional[float] = None
+    ) -> asyncio.Task:
+        task = asyncio.create_task(self._fetch(key, fetch, ttl))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return task
+
+    async def _fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[ScraperResponse]],
+        ttl: Optional[float] = None
+    ) -> ScraperResponse:
+        value = await fetch()
+        if value.success:
+            self.put(key, value, ttl)
+        return value
+
+    def _fetch_done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody waited for doesn't log a warning
+            task.exception()
+
+    async def _wait(self, task: asyncio.Task) -> ScraperResponse:
+        """Result of a fetch task without cancelling it when the caller is cancelled"""
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled() and not asyncio.current_task().cancelling():
+                # The fetch itself was cancelled, not this caller
+                raise RuntimeError("Scrape was cancelled before it finished")
+            raise
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[ScraperResponse]],
+        ttl: Optional[float] = None
+    ):
+        if key in self._inflight:
+            return
+        task = self._start_fetch(key, fetch, ttl)
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task):
+        self._background.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
@@ -0,0 +1,81 @@
+"""
+Compare page weight and load time with and without the resource-blocking profile
+
+Loads a dealer inventory page in fresh Chrome sessions with blocking off and
+on, and reports bytes transferred, request count, page load time and how long
+the vehicle cards took to become ready. Needs Chrome, like the live tests.
+
+Usage:
+    python compare_blocking.py
+    python compare_blocking.py --url https://www.usautosofdallas.com/inventory --runs 5 --output blocking.json
+"""
+import argparse
+import json
+import logging
+import statistics
+import time
+from bs4 import BeautifulSoup
+from browser import create_chrome_driver, page_stats
+from scraper import CarDealerScraper
+
+DEFAULT_URL = "https://www.usautosofdallas.com/inventory"
+
+
+def measure(url: str, block_resources: bool, headless: bool) -> dict:
+    """Load url once in a new browser session and collect its stats"""
+    driver = create_chrome_driver(headless, block_resources=block_resources)
+    try:
+        scraper = CarDealerScraper(headless=headless)
+        scraper.driver = driver
+        started = time.monotonic()
+        driver.get(url)
+        ready = scraper._wait_for_inventory()
+        stats = page_stats(driver)
+        stats["wall_time"] = round(time.monotonic() - started, 3)
+        stats["ready_wait"] = ready
+        stats["vehicles"] = len(scraper._find_vehicle_elements(BeautifulSoup(driver.page_source, "lxml")))
+        return stats
+    finally:
+        driver.quit()
+
+
+def summarize(runs: list) -> dict:
+    summary = {"runs": runs}
+    for key in ("bytes", "requests", "load_time", "wall_time", "vehicles"):
+        values = [run[key] for run in runs if run.get(key) is not None]
+        summary[f"median_{key}"] = statistics.median(values) if values else None
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the effect of browser resource blocking")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Inventory page to load")
+    parser.add_argument("--runs", type=int, default=3, help="Page loads per profile")
+    parser.add_argument("--show-browser", action="store_true", help="Run Chrome with a window")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    for name in ("scraper", "browser"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    results = {"url": args.url}
+    for label, block in (("unblocked", False), ("blocked", True)):
+        print(f"Loading {args.url} {args.runs}x with blocking {'on' if block else 'off'}...", flush=True)
+        results[label] = summarize([measure(args.url, block, not args.show_browser) for _ in range(args.runs)])
+
+    before, after = results["unblocked"], results["blocked"]
+    print(f"\n{'':<14} {'unblocked':>12} {'blocked':>12} {'change':>9}")
+    for key in ("bytes", "requests", "load_time", "wall_time", "vehicles"):
+        old, new = before[f"median_{key}"], after[f"median_{key}"]
+        change = f"{(new - old) / old * 100:+.0f}%" if old and new is not None else "n/a"
+        print(f"{key:<14} {str(old):>12} {str(new):>12} {change:>9}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
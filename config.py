@@ -0,0 +1,140 @@
+"""
+Runtime configuration for the scraper API.
+Values are read from environment variables so they can be tuned per deployment
+(Railway, Docker, local) without code changes.
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Chrome WebDriver pool
+DRIVER_POOL_ENABLED = _env_bool("DRIVER_POOL_ENABLED", True)
+DRIVER_POOL_SIZE = _env_int("DRIVER_POOL_SIZE", 2)
+DRIVER_MAX_USES = _env_int("DRIVER_MAX_USES", 25)
+DRIVER_IDLE_TIMEOUT = _env_float("DRIVER_IDLE_TIMEOUT", 300.0)
+DRIVER_ACQUIRE_TIMEOUT = _env_float("DRIVER_ACQUIRE_TIMEOUT", 60.0)
+
+# Scrape executor: concurrent scrapes per worker process and how many may wait
+SCRAPE_WORKERS = _env_int("SCRAPE_WORKERS", DRIVER_POOL_SIZE)
+SCRAPE_QUEUE_SIZE = _env_int("SCRAPE_QUEUE_SIZE", 4)
+
+# Pooled HTTP client used by the browserless fetch path
+HTTP_POOL_CONNECTIONS = _env_int("HTTP_POOL_CONNECTIONS", 10)
+HTTP_POOL_MAXSIZE = _env_int("HTTP_POOL_MAXSIZE", 20)
+HTTP_TIMEOUT = _env_float("HTTP_TIMEOUT", 15.0)
+
+# Readiness wait: ceiling for vehicle cards to render, and how long the card
+# count must hold steady (or the loaded page stay empty) before parsing
+READY_TIMEOUT = _env_float("READY_TIMEOUT", 15.0)
+READY_STABLE_SECONDS = _env_float("READY_STABLE_SECONDS", 0.75)
+READY_EMPTY_GRACE = _env_float("READY_EMPTY_GRACE", 3.0)
+
+# Detail-page fallback: pages fetched in parallel, per-page timeout and default cap
+DETAIL_CONCURRENCY = _env_int("DETAIL_CONCURRENCY", 4)
+DETAIL_TIMEOUT = _env_float("DETAIL_TIMEOUT", 15.0)
+MAX_DETAIL_PAGES = _env_int("MAX_DETAIL_PAGES", 50)
+
+# /scrape response cache
+CACHE_TTL = _env_float("CACHE_TTL", 300.0)
+CACHE_STALE_TTL = _env_float("CACHE_STALE_TTL", 900.0)
+CACHE_MAX_ENTRIES = _env_int("CACHE_MAX_ENTRIES", 100)
+
+# Persistent inventory store
+STORE_ENABLED = _env_bool("STORE_ENABLED", True)
+STORE_PATH = os.getenv("STORE_PATH", "inventory.db")
+# Days earlier vehicle versions are kept for delta `since` reads (0 keeps them all)
+STORE_HISTORY_DAYS = _env_float("STORE_HISTORY_DAYS", 30.0)
+
+# Pagination: most inventory pages to crawl, pages fetched in parallel over HTTP,
+# and an optional cap on vehicles per scrape (0 = no cap)
+MAX_PAGES = _env_int("MAX_PAGES", 20)
+PAGE_CONCURRENCY = _env_int("PAGE_CONCURRENCY", 4)
+MAX_VEHICLES = _env_int("MAX_VEHICLES", 0)
+
+# Batch scraping: most URLs per request, dealers scraped at once (capped by
+# SCRAPE_WORKERS) and concurrent scrapes against any one site
+BATCH_MAX_URLS = _env_int("BATCH_MAX_URLS", 100)
+BATCH_CONCURRENCY = _env_int("BATCH_CONCURRENCY", SCRAPE_WORKERS)
+BATCH_PER_HOST_CONCURRENCY = _env_int("BATCH_PER_HOST_CONCURRENCY", 1)
+
+# Asynchronous scrape jobs: persistent queue file, jobs run at once, and how
+# long finished jobs are kept
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "jobs.db")
+JOB_WORKERS = _env_int("JOB_WORKERS", 1)
+JOB_RETENTION = _env_float("JOB_RETENTION", 7 * 24 * 3600.0)
+# Let job callbacks go to loopback and private network hosts (e.g. n8n on the same network)
+CALLBACK_ALLOW_PRIVATE = _env_bool("CALLBACK_ALLOW_PRIVATE", False)
+
+# Lightweight browser profile: block images, media, fonts and third-party
+# trackers/widgets (plus any extra comma-separated domains), and trim Chrome flags
+BROWSER_BLOCK_RESOURCES = _env_bool("BROWSER_BLOCK_RESOURCES", True)
+BROWSER_BLOCKED_DOMAINS = os.getenv("BROWSER_BLOCKED_DOMAINS", "")
+BROWSER_LOW_MEMORY = _env_bool("BROWSER_LOW_MEMORY", True)
+
+# Response encoding: compress JSON bodies of at least RESPONSE_COMPRESS_MIN_BYTES
+# with gzip (or brotli when installed) if the client sends Accept-Encoding
+RESPONSE_COMPRESSION = _env_bool("RESPONSE_COMPRESSION", True)
+RESPONSE_COMPRESS_MIN_BYTES = _env_int("RESPONSE_COMPRESS_MIN_BYTES", 1024)
+GZIP_LEVEL = _env_int("GZIP_LEVEL", 6)
+BROTLI_QUALITY = _env_int("BROTLI_QUALITY", 4)
+# Results with at least this many vehicles are encoded and compressed on a
+# worker thread instead of the event loop
+RESPONSE_OFFLOAD_MIN_VEHICLES = _env_int("RESPONSE_OFFLOAD_MIN_VEHICLES", 100)
+
+# Scheduled refresh: dealers re-scraped in the background so reads hit warm data.
+# SCHEDULE_URLS is comma-separated, each URL optionally followed by |seconds
+SCHEDULE_URLS = os.getenv("SCHEDULE_URLS", "")
+SCHEDULE_INTERVAL = _env_float("SCHEDULE_INTERVAL", 900.0)
+SCHEDULE_JITTER = _env_float("SCHEDULE_JITTER", 0.1)
+SCHEDULE_CONCURRENCY = _env_int("SCHEDULE_CONCURRENCY", 1)
+SCHEDULE_MAX_BACKOFF = _env_float("SCHEDULE_MAX_BACKOFF", 3600.0)
+
+# Structured data: read vehicles from JSON-LD and inline inventory JSON before
+# falling back to vehicle cards, and fetch the DWS inventory feed a page loads
+STRUCTURED_DATA = _env_bool("STRUCTURED_DATA", True)
+DWS_FEED_FETCH = _env_bool("DWS_FEED_FETCH", True)
+
+# Detail-page enrichment: default page and time budget per scrape, and how long
+# parsed detail pages are reused for vehicles whose listing hasn't changed
+ENRICH_MAX_PAGES = _env_int("ENRICH_MAX_PAGES", 25)
+ENRICH_BUDGET = _env_float("ENRICH_BUDGET", 30.0)
+DETAIL_CACHE_TTL = _env_float("DETAIL_CACHE_TTL", 24 * 3600.0)
+DETAIL_CACHE_MAX_ENTRIES = _env_int("DETAIL_CACHE_MAX_ENTRIES", 5000)
+
+# Fetch policy, per dealer host: request rate and burst (0 = no limit),
+# retries for transient failures with jittered exponential backoff, and a
+# circuit breaker that pauses a host after consecutive failures
+FETCH_RATE = _env_float("FETCH_RATE", 4.0)
+FETCH_BURST = _env_int("FETCH_BURST", 8)
+FETCH_RETRIES = _env_int("FETCH_RETRIES", 2)
+FETCH_BACKOFF_BASE = _env_float("FETCH_BACKOFF_BASE", 0.5)
+FETCH_BACKOFF_MAX = _env_float("FETCH_BACKOFF_MAX", 8.0)
+CIRCUIT_FAILURE_THRESHOLD = _env_int("CIRCUIT_FAILURE_THRESHOLD", 5)
+CIRCUIT_RESET_TIMEOUT = _env_float("CIRCUIT_RESET_TIMEOUT", 60.0)
+
+# Scoped parsing: build BeautifulSoup trees from only the vehicle cards, links
+# and structured data scripts of inventory pages, and drop script, style and
+# svg content from detail pages, instead of parsing whole documents
+PARSE_SCOPE = _env_bool("PARSE_SCOPE", True)
+
+# HTML parsing in worker processes, so concurrent scrapes parse in parallel
+# instead of taking turns on the GIL (0 = parse on the scrape thread), and
+# the most vehicle cards one worker parses before a page is split across workers
+PARSE_WORKERS = _env_int("PARSE_WORKERS", 0)
+PARSE_CHUNK_SIZE = _env_int("PARSE_CHUNK_SIZE", 100)
@@ -0,0 +1,77 @@
+import hashlib
+import json
+from typing import List, Optional
+from models import LISTING_METADATA_FIELDS, CarListing, FieldChange, InventoryDelta, StoredVehicle, VehicleChange
+from storage import dealership_id, vehicle_key
+
+# CarListing fields that describe the vehicle itself, compared between scrapes
+FINGERPRINT_FIELDS = tuple(name for name in CarListing.model_fields if name not in LISTING_METADATA_FIELDS)
+
+
+def fingerprint(car: CarListing) -> str:
+    """Content hash over a vehicle's fields, stable across scrapes"""
+    data = car.model_dump(include=set(FINGERPRINT_FIELDS))
+    encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def field_changes(old: CarListing, new: CarListing) -> dict:
+    """Per-field old/new values for every fingerprinted field that differs"""
+    changes = {}
+    for name in FINGERPRINT_FIELDS:
+        old_value = getattr(old, name)
+        new_value = getattr(new, name)
+        if old_value != new_value:
+            changes[name] = FieldChange(old=old_value, new=new_value)
+    return changes
+
+
+def diff_inventory(
+    url: str,
+    previous: List[StoredVehicle],
+    current: List[CarListing],
+    scraped_at: str,
+    include_removed: bool = True
+) -> InventoryDelta:
+    """
+    Compare a scrape against the previous snapshot for the same dealership
+
+    Args:
+        url: The dealership website URL
+        previous: Vehicles stored before this scrape
+        current: Vehicles found by this scrape
+        scraped_at: When the current scrape ran
+        include_removed: Report stored vehicles missing from this scrape. Turn
+            off for scrapes with errors, which may simply have missed them.
+
+    Returns:
+        InventoryDelta with added, removed and modified vehicles
+    """
+    before = {vehicle.vehicle_key: vehicle.car for vehicle in previous}
+    previous_scraped_at: Optional[str] = max((v.scraped_at for v in previous), default=None)
+
+    delta = InventoryDelta(
+        dealership=dealership_id(url),
+        scraped_at=scraped_at,
+        previous_scraped_at=previous_scraped_at
+    )
+
+    seen = set()
+    for car in current:
+        key = vehicle_key(car)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+
+        old = before.get(key)
+        if old is None:
+            delta.added.append(car)
+        elif fingerprint(old) == fingerprint(car):
+            delta.unchanged += 1
+        else:
+            delta.modified.append(VehicleChange(vehicle_key=key, car=car, changes=field_changes(old, car)))
+
+    if include_removed:
+        delta.removed = [car for key, car in before.items() if key not in seen]
+
+    return delta
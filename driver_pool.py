@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+from browser import create_chrome_driver
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolError(Exception):
+    """Raised when a driver cannot be checked out of the pool"""
+
+
+class PooledDriver:
+    """A Chrome WebDriver session owned by a DriverPool"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Bounded pool of pre-launched Chrome WebDriver sessions
+
+    Drivers are checked out per scrape, reset between uses (cookies, storage and
+    extra tabs cleared) and recycled after max_uses checkouts, after sitting idle
+    longer than idle_timeout seconds, or when they fail a health check.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_uses: int = 25,
+        idle_timeout: float = 300.0,
+        headless: bool = True,
+        acquire_timeout: float = 60.0
+    ):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.idle_timeout = idle_timeout
+        self.headless = headless
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._in_use = 0
+        self._closed = False
+        self._recycled = 0
+
+    def start(self):
+        """Pre-launch drivers so the first requests don't pay browser startup"""
+        for _ in range(self.size):
+            try:
+                pooled = PooledDriver(create_chrome_driver(self.headless))
+            except Exception as e:
+                logger.warning(f"Could not pre-launch pooled driver, will launch on demand: {e}")
+                break
+            with self._lock:
+                self._idle.append(pooled)
+        logger.info(f"Driver pool started with {len(self._idle)}/{self.size} warm drivers")
+
+    def shutdown(self):
+        """Quit every idle driver and refuse further checkouts"""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for pooled in idle:
+            self._quit(pooled)
+        logger.info(f"Driver pool shut down ({len(idle)} drivers closed)")
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Check out a healthy driver, launching one if none are idle"""
+        if self._closed:
+            raise DriverPoolError("Driver pool is shut down")
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise DriverPoolError(f"No driver available after {timeout}s")
+
+        try:
+            self.reap_idle()
+            while True:
+                with self._lock:
+                    pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    pooled = PooledDriver(create_chrome_driver(self.headless))
+                    break
+                if self._is_healthy(pooled):
+                    break
+                logger.info("Discarding unhealthy pooled driver")
+                self._quit(pooled)
+        except Exception:
+            self._slots.release()
+            raise
+
+        pooled.uses += 1
+        pooled.last_used = time.monotonic()
+        with self._lock:
+            self._in_use += 1
+        return pooled
+
+    def release(self, pooled: PooledDriver, discard: bool = False):
+        """Return a driver to the pool, or quit it if it is worn out or broken"""
+        try:
+            if discard or self._closed or pooled.uses >= self.max_uses:
+                self._quit(pooled)
+            else:
+                try:
+                    self._reset(pooled.driver)
+                    pooled.last_used = time.monotonic()
+                    with self._lock:
+                        self._idle.append(pooled)
+                except Exception as e:
+                    logger.warning(f"Failed to reset pooled driver, recycling it: {e}")
+                    self._quit(pooled)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Context manager yielding a checked-out WebDriver"""
+        pooled = self.acquire(timeout)
+        discard = False
+        try:
+            yield pooled.driver
+        except Exception:
+            # A crash mid-scrape may leave the browser in a bad state
+            discard = not self._is_healthy(pooled)
+            raise
+        finally:
+            self.release(pooled, discard=discard)
+
+    def reap_idle(self):
+        """Quit drivers that have been idle longer than idle_timeout"""
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for pooled in list(self._idle):
+                if now - pooled.last_used > self.idle_timeout:
+                    self._idle.remove(pooled)
+                    expired.append(pooled)
+        for pooled in expired:
+            logger.info("Recycling idle pooled driver")
+            self._quit(pooled)
+
+    def stats(self) -> dict:
+        """Current pool utilization"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "recycled": self._recycled,
+                "max_uses": self.max_uses,
+                "idle_timeout": self.idle_timeout
+            }
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.execute_script("return 1")
+            return bool(pooled.driver.window_handles)
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        """Clear cookies, storage and extra tabs so the next checkout starts clean"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # about:blank and some error pages have no storage
+            pass
+        driver.delete_all_cookies()
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": "*",
+                "storageTypes": "local_storage,session_storage,indexeddb,cache_storage,service_workers"
+            })
+        except Exception as e:
+            logger.debug(f"CDP storage reset unavailable: {e}")
+        driver.get("about:blank")
+
+    def _quit(self, pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled driver: {e}")
+        with self._lock:
+            self._recycled += 1
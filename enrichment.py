@@ -0,0 +1,120 @@
+"""
+Detail-page enrichment for vehicles parsed from listing cards.
+
+Listing cards carry little more than title, price, mileage, link and images.
+Enrichment fetches the detail pages of vehicles that are missing fields and
+merges what they add (VIN, stock number, colours, drivetrain and, at full
+depth, features and description) into the card. Fetched details are kept in a
+DetailCache keyed by VIN or listing URL, together with a fingerprint of the
+card they were fetched for, so re-scrapes only fetch detail pages for
+vehicles that are new or whose listing changed.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from delta import fingerprint
+from models import CarListing
+
+# How much a scrape enriches: nothing, the spec fields, or specs plus
+# features, description and the detail page's image gallery
+ENRICH_DEPTHS = ("off", "specs", "full")
+
+SPEC_FIELDS = (
+    "vin", "stock_number", "exterior_color", "interior_color", "transmission",
+    "fuel_type", "engine", "drivetrain", "body_style"
+)
+FULL_FIELDS = SPEC_FIELDS + ("features", "description")
+MAX_IMAGES = 10
+
+
+def enrich_fields(depth: str) -> Tuple[str, ...]:
+    """CarListing fields filled from detail pages at an enrichment depth"""
+    return FULL_FIELDS if depth == "full" else SPEC_FIELDS if depth == "specs" else ()
+
+
+def needs_enrichment(car: CarListing, depth: str) -> bool:
+    """Whether a vehicle has a detail page and is missing any field its depth fills"""
+    return bool(car.listing_url) and any(not getattr(car, name) for name in enrich_fields(depth))
+
+
+def merge_details(car: CarListing, detail: CarListing, depth: str) -> CarListing:
+    """
+    Copy of car with its empty fields filled from the detail page
+
+    Values already on the card win, since the listing shows current prices.
+    At full depth the detail page's images are appended to the card's.
+    """
+    updates = {
+        name: getattr(detail, name)
+        for name in enrich_fields(depth)
+        if not getattr(car, name) and getattr(detail, name)
+    }
+    if depth == "full" and detail.image_urls:
+        updates["image_urls"] = list(dict.fromkeys(car.image_urls + detail.image_urls))[:MAX_IMAGES]
+    return car.model_copy(update=updates) if updates else car
+
+
+class DetailEntry:
+    """Parsed detail page, the fingerprint of the card it was fetched for and when"""
+
+    def __init__(self, card_fingerprint: str, detail: CarListing):
+        self.card_fingerprint = card_fingerprint
+        self.detail = detail
+        self.created_at = time.monotonic()
+
+
+class DetailCache:
+    """
+    In-process LRU cache of parsed vehicle detail pages
+
+    Entries are keyed by vehicle_key() (VIN, else stock number, else listing
+    URL) and only served while younger than ttl and while the vehicle's card
+    still has the fingerprint it had when the page was fetched, so a price
+    drop or any other listing change refetches the page. Thread-safe, since
+    scrapes run on executor threads.
+    """
+
+    def __init__(self, ttl: float = 86400.0, max_entries: int = 5000):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, DetailEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"hit": 0, "miss": 0, "changed": 0, "expired": 0}
+
+    def get(self, key: str, card: CarListing) -> Optional[CarListing]:
+        """Cached detail for a vehicle, or None when it is missing, expired or the card changed"""
+        card_fingerprint = fingerprint(card)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                status = "miss"
+            elif time.monotonic() - entry.created_at > self.ttl:
+                status = "expired"
+                del self._entries[key]
+            elif entry.card_fingerprint != card_fingerprint:
+                status = "changed"
+            else:
+                status = "hit"
+                self._entries.move_to_end(key)
+            self._counts[status] += 1
+            return entry.detail if status == "hit" else None
+
+    def put(self, key: str, card: CarListing, detail: CarListing):
+        """Store a parsed detail page for a card, evicting the least recently used entries"""
+        entry = DetailEntry(fingerprint(card), detail)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Entry count and lookup counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                **self._counts
+            }
@@ -0,0 +1,145 @@
+"""
+Single-pass extraction of vehicle cards from parsed inventory pages.
+
+Selectors are compiled once at import time. Card discovery walks the page's
+divs once and each card's subtree is walked once, filling every field slot as
+it goes. Field priority and document-order semantics match the original
+BeautifulSoup find() fallback chains: a class pattern is matched against the
+element's space-joined class list, and within each field the highest-priority
+selector that matches anything wins, taking its first match in document order.
+"""
+import re
+from typing import List, Optional, Tuple
+
+# Card containers, in discovery priority order
+DWS_VEHICLE_ITEM = "dws-vehicle-item"
+DWS_LISTING_ITEM_CLASS = "dws-vehicle-listing-item"
+DWS_MOBILE_CONTAINER_CLASS = "dws-vehicle-listing-mobile-container"
+DWS_LISTING = "dws-listing"
+VEHICLE_ID_ATTR = "data-vehicle-id"
+
+# Field selectors within a card. Each field lists its class patterns and
+# heading tags in priority order; the slot index is that priority.
+TITLE_DWS_RE = re.compile(r'dws.*title|title.*dws', re.I)
+TITLE_GENERIC_RE = re.compile(r'title|name|vehicle.*name', re.I)
+TITLE_HEADING_SLOTS = {"h2": 1, "h3": 2, "h4": 3}
+TITLE_SLOTS = 5
+PRICE_RES = (
+    re.compile(r'dws.*price|price.*dws', re.I),
+    re.compile(r'price', re.I),
+)
+MILEAGE_RES = (
+    re.compile(r'dws.*mileage|mileage.*dws', re.I),
+    re.compile(r'mileage|miles|odometer', re.I),
+)
+
+
+class CardFields:
+    """Elements holding each field of one vehicle card"""
+
+    __slots__ = ("title", "price", "mileage", "link", "images")
+
+    def __init__(self, title=None, price=None, mileage=None, link=None, images=None):
+        self.title = title
+        self.price = price
+        self.mileage = mileage
+        self.link = link
+        self.images = images if images is not None else []
+
+
+def _first(slots: list):
+    for element in slots:
+        if element is not None:
+            return element
+    return None
+
+
+def _class_string(element) -> Optional[str]:
+    classes = element.get("class")
+    if not classes:
+        return None
+    return " ".join(classes) if isinstance(classes, list) else classes
+
+
+def scan_card(element) -> CardFields:
+    """Walk a card's subtree once and pick the element for every field"""
+    title = [None] * TITLE_SLOTS
+    price = [None] * len(PRICE_RES)
+    mileage = [None] * len(MILEAGE_RES)
+    link = None
+    images = []
+
+    for tag in element.descendants:
+        name = tag.name
+        if name is None:
+            # NavigableString, Comment and friends
+            continue
+
+        if name == "img":
+            images.append(tag)
+        elif name == "a":
+            if link is None and tag.get("href") is not None:
+                link = tag
+        elif name in TITLE_HEADING_SLOTS:
+            slot = TITLE_HEADING_SLOTS[name]
+            if title[slot] is None:
+                title[slot] = tag
+
+        classes = _class_string(tag)
+        if classes is None:
+            continue
+        if title[0] is None and TITLE_DWS_RE.search(classes):
+            title[0] = tag
+        if title[4] is None and TITLE_GENERIC_RE.search(classes):
+            title[4] = tag
+        for i, pattern in enumerate(PRICE_RES):
+            if price[i] is None and pattern.search(classes):
+                price[i] = tag
+        for i, pattern in enumerate(MILEAGE_RES):
+            if mileage[i] is None and pattern.search(classes):
+                mileage[i] = tag
+
+    return CardFields(_first(title), _first(price), _first(mileage), link, images)
+
+
+def find_vehicle_elements(soup) -> Tuple[List, Optional[str]]:
+    """
+    Locate vehicle card elements in one walk over the page's divs
+
+    Returns:
+        (card elements, name of the selector that found them). The selector
+        name is None when no cards were found.
+    """
+    vehicle_items = []
+    listing_items = []
+    listings = []
+    vehicle_id_items = []
+
+    for div in soup.find_all("div"):
+        classes = div.get("class")
+        if classes:
+            joined = " ".join(classes) if isinstance(classes, list) else classes
+            if DWS_VEHICLE_ITEM in joined:
+                vehicle_items.append(div)
+            if DWS_LISTING_ITEM_CLASS in classes:
+                listing_items.append(div)
+            if DWS_LISTING in joined:
+                listings.append(div)
+        if div.get(VEHICLE_ID_ATTR) is not None:
+            vehicle_id_items.append(div)
+
+    if vehicle_items:
+        return vehicle_items, "DWS vehicle-item class"
+    if listing_items:
+        # The DWS async widget renders each car twice: in the desktop grid and
+        # again in a mobile-only container
+        desktop = [
+            item for item in listing_items
+            if not item.find_parent(class_=DWS_MOBILE_CONTAINER_CLASS)
+        ]
+        return desktop or listing_items, "DWS vehicle-listing-item class"
+    if listings:
+        return listings, "DWS listing class"
+    if vehicle_id_items:
+        return vehicle_id_items, f"{VEHICLE_ID_ATTR} attribute"
+    return [], None
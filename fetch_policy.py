@@ -0,0 +1,326 @@
+"""
+Per-host fetch policy shared by the HTTP and browser fetch paths.
+
+Every page load for a dealer site goes through FetchPolicy.call(), which
+applies, per host:
+
+- a token bucket, so concurrent page, feed and detail fetches don't exceed
+  `rate` requests per second (with bursts of up to `burst`);
+- retries with jittered exponential backoff for transient failures
+  (timeouts, connection errors, 429 and 5xx responses, browser timeouts),
+  honouring Retry-After;
+- a circuit breaker that opens after `failure_threshold` consecutive
+  transient failures and fails fast with CircuitOpen for `reset_timeout`
+  seconds, then lets a single probe through to decide whether to close.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+import requests
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import config
+import metrics
+from cache import normalize_url
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: rate limited, or the server is struggling
+TRANSIENT_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# Chrome network errors in WebDriverException messages worth retrying
+TRANSIENT_BROWSER_ERRORS = (
+    "net::ERR_CONNECTION", "net::ERR_TIMED_OUT", "net::ERR_NETWORK_CHANGED",
+    "net::ERR_EMPTY_RESPONSE", "net::ERR_NAME_NOT_RESOLVED"
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+CIRCUIT_STATES = (CLOSED, HALF_OPEN, OPEN)
+
+
+class CircuitOpen(Exception):
+    """Raised instead of fetching from a host whose circuit breaker is open"""
+
+    def __init__(self, host: str, retry_after: float):
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"{host} is failing, fetches paused for {retry_after:.0f}s")
+
+
+def host_of(url: str) -> str:
+    """Rate limit and breaker key for a URL: its normalized host"""
+    return urlsplit(normalize_url(url)).netloc
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a fetch error is worth retrying and counts against the host's breaker"""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in TRANSIENT_STATUSES
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, TimeoutException)):
+        return True
+    if isinstance(error, WebDriverException):
+        return any(marker in str(error) for marker in TRANSIENT_BROWSER_ERRORS)
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from a 429/503 response's Retry-After header, if it has one"""
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    acquire() reserves a token and sleeps until it is due, so waiting callers
+    are served in the order they arrived without holding the lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, waiting if the bucket is empty; returns the seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self, host: str):
+        """Raise CircuitOpen unless a fetch may go ahead; an expired open circuit admits one probe"""
+        with self._lock:
+            if self.state == OPEN and self.retry_after() <= 0:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == OPEN or (self.state == HALF_OPEN and self._probing):
+                raise CircuitOpen(host, self.retry_after() or self.reset_timeout)
+            if self.state == HALF_OPEN:
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, host: str):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                    logger.warning(f"Circuit opened for {host} after {self.failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self):
+        """Let another probe through after a half-open call ended without a verdict"""
+        with self._lock:
+            self._probing = False
+
+
+class HostPolicy:
+    """Rate limiter, breaker and counters for one host"""
+
+    def __init__(self, rate: float, burst: int, failure_threshold: int, reset_timeout: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def to_dict(self, host: str) -> dict:
+        breaker = self.breaker
+        return {
+            "host": host,
+            "state": breaker.state,
+            "consecutive_failures": breaker.failures,
+            "retry_after": round(breaker.retry_after(), 1) if breaker.state == OPEN else None,
+            "times_opened": breaker.times_opened,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected
+        }
+
+
+class FetchPolicy:
+    """Per-host rate limits, retries and circuit breakers, shared by every scrape in the process"""
+
+    def __init__(
+        self,
+        rate: float = 4.0,
+        burst: int = 8,
+        retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.retries = max(0, retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: Dict[str, HostPolicy] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> HostPolicy:
+        policy = self._hosts.get(host)
+        if policy is None:
+            with self._lock:
+                policy = self._hosts.setdefault(
+                    host, HostPolicy(self.rate, self.burst, self.failure_threshold, self.reset_timeout)
+                )
+        return policy
+
+    def check(self, url: str):
+        """Raise CircuitOpen if url's host is failing, without using a probe or a token"""
+        host = host_of(url)
+        policy = self._hosts.get(host)
+        if policy and policy.breaker.state == OPEN and policy.breaker.retry_after() > 0:
+            raise CircuitOpen(host, policy.breaker.retry_after())
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential delay before retry number attempt (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def call(self, url: str, fetch: Callable[[], T], kind: str = "http") -> T:
+        """
+        Run fetch() for url under its host's rate limit, retry and breaker
+
+        Args:
+            url: Page being loaded; its host selects the policy
+            fetch: Performs the load, e.g. an HTTP GET or driver.get()
+            kind: "http" or "browser", for metrics
+
+        Returns:
+            fetch()'s result
+
+        Raises:
+            CircuitOpen: The host's breaker is open
+            Exception: fetch()'s last error, at once for errors that aren't transient
+        """
+        host = host_of(url)
+        policy = self._host(host)
+        for attempt in range(self.retries + 1):
+            try:
+                policy.breaker.before_call(host)
+            except CircuitOpen:
+                policy.rejected += 1
+                metrics.FETCHES.inc(kind=kind, outcome="rejected")
+                raise
+            waited = policy.bucket.acquire()
+            if waited:
+                metrics.RATE_LIMIT_WAIT.observe(waited, kind=kind)
+            policy.requests += 1
+            try:
+                result = fetch()
+            except Exception as e:
+                if not is_transient(e):
+                    # The host answered; a 404 or parse problem says nothing about its health
+                    policy.breaker.release_probe()
+                    metrics.FETCHES.inc(kind=kind, outcome="failed")
+                    raise
+                policy.breaker.record_failure(host)
+                if attempt == self.retries or policy.breaker.state == OPEN:
+                    policy.failures += 1
+                    metrics.FETCHES.inc(kind=kind, outcome="failed")
+                    raise
+                delay = max(self.backoff(attempt + 1), min(_retry_after(e) or 0.0, self.backoff_max))
+                policy.retries += 1
+                metrics.FETCHES.inc(kind=kind, outcome="retried")
+                logger.info(f"Transient {kind} failure for {url} ({e}), retry {attempt + 1} in {delay:.2f}s")
+                time.sleep(delay)
+            else:
+                policy.breaker.record_success()
+                metrics.FETCHES.inc(kind=kind, outcome="success")
+                return result
+
+    def states(self) -> Dict[str, str]:
+        """Breaker state of every host seen"""
+        with self._lock:
+            hosts = list(self._hosts.items())
+        return {host: policy.breaker.state for host, policy in hosts}
+
+    def stats(self) -> dict:
+        """Settings and host counts per breaker state"""
+        states = list(self.states().values())
+        return {
+            "hosts": len(states),
+            **{state: states.count(state) for state in CIRCUIT_STATES},
+            "rate": self.rate,
+            "burst": self.burst,
+            "retries": self.retries
+        }
+
+    def status(self) -> dict:
+        """Per-host breaker state and counters, failing hosts first"""
+        with self._lock:
+            hosts = list(self._hosts.items())
+        rows = sorted(
+            (policy.to_dict(host) for host, policy in hosts),
+            key=lambda row: (-CIRCUIT_STATES.index(row["state"]), row["host"])
+        )
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "retries": self.retries,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "hosts": rows
+        }
+
+
+# Shared by every scraper in the process, so limits hold across concurrent scrapes
+POLICY = FetchPolicy(
+    rate=config.FETCH_RATE,
+    burst=config.FETCH_BURST,
+    retries=config.FETCH_RETRIES,
+    backoff_base=config.FETCH_BACKOFF_BASE,
+    backoff_max=config.FETCH_BACKOFF_MAX,
+    failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=config.CIRCUIT_RESET_TIMEOUT
+)
@@ -0,0 +1,142 @@
+"""
+Scoped HTML for the BeautifulSoup trees the scraper builds.
+
+A DWS inventory page is mostly inline scripts, stylesheets, SVG icons and
+modals; as a BeautifulSoup tree that is many MB of Python objects, of which
+extraction reads only the vehicle cards, a handful of links and the JSON
+scripts. These helpers parse the page with lxml, whose tree lives in C and is
+freed as soon as it goes out of scope, drop what extraction never reads, and
+return the much smaller HTML that BeautifulSoup then parses.
+
+- parse_document() returns the lxml tree without script, style and svg
+  content or comments, keeping the scripts structured_data reads (JSON-LD,
+  inline JSON and JSONP, DWS feed src); strip_page() returns it as HTML.
+- scope_inventory_page() also keeps only the title, the vehicle card
+  containers, the page status text and bare links for pagination and detail
+  page discovery.
+"""
+import copy
+import logging
+import re
+from lxml import etree, html as lxml_html
+import config
+from extraction import (
+    DWS_LISTING, DWS_LISTING_ITEM_CLASS, DWS_MOBILE_CONTAINER_CLASS, DWS_VEHICLE_ITEM, VEHICLE_ID_ATTR
+)
+from structured_data import DWS_FEED_RE, JSON_LD_TYPE, JSON_TYPE, JSONP_RE
+
+logger = logging.getLogger(__name__)
+
+DISCARDED_TAGS = ("style", "svg")
+# The "Page 1 of 4" status find_pager() reads
+PAGE_STATUS_RE = re.compile(r'Page\s+\d+\s+of\s+\d+', re.I)
+
+_PARSER = lxml_html.HTMLParser(remove_comments=True, remove_pis=True)
+_BYTES_PARSER = lxml_html.HTMLParser(remove_comments=True, remove_pis=True, encoding="utf-8")
+
+
+def _parse(page_source: str):
+    try:
+        return lxml_html.document_fromstring(page_source, parser=_PARSER)
+    except ValueError:
+        # lxml refuses str input with an XML encoding declaration
+        return lxml_html.document_fromstring(page_source.encode("utf-8"), parser=_BYTES_PARSER)
+
+
+def _keep_script(script) -> bool:
+    """Whether structured_data reads this script"""
+    src = script.get("src")
+    if src:
+        return bool(DWS_FEED_RE.search(src))
+    if not config.STRUCTURED_DATA:
+        return False
+    script_type = (script.get("type") or "").lower()
+    return script_type in (JSON_LD_TYPE, JSON_TYPE) or bool(JSONP_RE.match(script.text or ""))
+
+
+def _strip(root):
+    etree.strip_elements(root, *DISCARDED_TAGS, with_tail=False)
+    for script in list(root.iter("script")):
+        if not _keep_script(script):
+            script.drop_tree()
+
+
+def _is_card_container(element) -> bool:
+    """Divs find_vehicle_elements() may pick as vehicle cards, and the mobile container it checks for"""
+    if element.get(VEHICLE_ID_ATTR) is not None:
+        return True
+    classes = element.get("class")
+    if not classes:
+        return False
+    return (
+        DWS_VEHICLE_ITEM in classes
+        or DWS_LISTING in classes
+        or DWS_LISTING_ITEM_CLASS in classes.split()
+        or DWS_MOBILE_CONTAINER_CLASS in classes.split()
+    )
+
+
+def parse_document(page_source: str):
+    """
+    lxml tree of a page without script, style and svg content, keeping structured data scripts
+
+    Raises:
+        lxml.etree.ParserError: The page is empty
+    """
+    root = _parse(page_source)
+    _strip(root)
+    return root
+
+
+def strip_page(page_source: str) -> str:
+    """Page source without script, style and svg content, or unchanged when lxml can't parse it"""
+    try:
+        root = parse_document(page_source)
+    except (etree.ParserError, ValueError):
+        return page_source
+    return lxml_html.tostring(root, encoding="unicode")
+
+
+def scope_inventory_page(page_source: str) -> str:
+    """
+    Just the parts of an inventory page that inventory extraction reads
+
+    Keeps the title, structured data scripts, the outermost vehicle card
+    containers with everything in them, the "Page 1 of N" status and the href
+    of every link, in page order.
+
+    Returns:
+        Scoped HTML, or the page source unchanged when lxml can't parse it
+    """
+    try:
+        root = parse_document(page_source)
+    except (etree.ParserError, ValueError):
+        return page_source
+
+    scoped = lxml_html.Element("html")
+    head = etree.SubElement(scoped, "head")
+    body = etree.SubElement(scoped, "body")
+    title = root.find(".//title")
+    if title is not None:
+        etree.SubElement(head, "title").text = title.text_content()
+    for script in root.iter("script"):
+        kept = etree.SubElement(head, "script", dict(script.attrib))
+        kept.text = script.text
+
+    container = None
+    for element in root.iter("div", "a"):
+        if container is not None and container in element.iterancestors():
+            continue
+        if element.tag == "a":
+            if element.get("href"):
+                etree.SubElement(body, "a", href=element.get("href"))
+        elif _is_card_container(element):
+            container = element
+            kept = copy.deepcopy(element)
+            kept.tail = None
+            body.append(kept)
+
+    status = next((text for text in root.itertext() if PAGE_STATUS_RE.search(text)), None)
+    if status:
+        etree.SubElement(body, "div").text = status.strip()
+    return lxml_html.tostring(scoped, encoding="unicode")
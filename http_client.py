@@ -0,0 +1,51 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+import config
+
+logger = logging.getLogger(__name__)
+
+# Same user agent the browser sessions present
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared requests session with a pooled, keep-alive connection adapter"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=config.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=config.HTTP_POOL_MAXSIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "User-Agent": USER_AGENT,
+                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": "en-US,en;q=0.9"
+                })
+                _session = session
+    return _session
+
+
+def fetch_html(url: str, timeout: float = None) -> str:
+    """GET a page over the pooled session and return its HTML"""
+    response = get_session().get(url, timeout=timeout or config.HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response.text
+
+
+def close_session():
+    """Close pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
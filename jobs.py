@@ -0,0 +1,312 @@
+import asyncio
+import ipaddress
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+from urllib.parse import urlsplit
+from http_client import get_session
+from models import ScrapeJob
+
+logger = logging.getLogger(__name__)
+
+# Callback delivery: attempts, and the delay before the first retry (doubled each time)
+CALLBACK_ATTEMPTS = 3
+CALLBACK_RETRY_DELAY = 2.0
+
+# Progress is written at most this often per job
+PROGRESS_WRITE_INTERVAL = 1.0
+
+
+def check_callback_url(url: str, allow_private: bool = False):
+    """
+    Make sure a callback URL is an http(s) URL of a public host
+
+    The host is resolved, and every address it resolves to must be public
+    unless allow_private is set, so a callback can't reach the server's own
+    loopback, private network or link-local (cloud metadata) addresses.
+
+    Raises:
+        ValueError: The URL is not allowed
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url must be an http or https URL")
+    if allow_private:
+        return
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, ValueError) as e:
+        raise ValueError(f"callback_url host can't be resolved: {e}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"callback_url resolves to a non-public address ({ip})")
+
+
+class JobStore:
+    """
+    Scrape jobs persisted in a local SQLite file
+
+    The table is the durable queue: a job is queued until a worker marks it
+    running, and a job still running when the process stops is queued again
+    on the next start.
+    """
+
+    def __init__(self, path: str = "jobs.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    error TEXT,
+                    result TEXT,
+                    callback_url TEXT,
+                    callback_status TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def create(self, url: str, options: dict, callback_url: Optional[str] = None) -> ScrapeJob:
+        """Add a queued job"""
+        job_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (id, url, options, status, created_at, callback_url)
+                VALUES (?, ?, ?, 'queued', ?, ?)
+                """,
+                (job_id, url, json.dumps(options), datetime.now().isoformat(), callback_url)
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def mark_running(self, job_id: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', started_at = ?, progress = 0, attempts = attempts + 1
+                WHERE id = ?
+                """,
+                (datetime.now().isoformat(), job_id)
+            )
+
+    def set_progress(self, job_id: str, vehicles: int):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (vehicles, job_id))
+
+    def finish(self, job_id: str, result: Optional[dict] = None, error: Optional[str] = None, progress: int = None):
+        """Record a job's outcome: succeeded with a result body, or failed with an error"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?,
+                    progress = COALESCE(?, progress)
+                WHERE id = ?
+                """,
+                (
+                    "failed" if error else "succeeded",
+                    datetime.now().isoformat(),
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    progress,
+                    job_id
+                )
+            )
+
+    def set_callback_status(self, job_id: str, status: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET callback_status = ? WHERE id = ?", (status, job_id))
+
+    def requeue_interrupted(self) -> List[str]:
+        """
+        Put jobs left running by a stopped process back in the queue
+
+        Returns:
+            IDs of every queued job, oldest first
+        """
+        with self._lock, self._conn:
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'"
+            ).rowcount
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at, rowid"
+            ).fetchall()
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted scrape jobs")
+        return [row["id"] for row in rows]
+
+    def purge_finished(self, older_than: float) -> int:
+        """Delete finished jobs more than older_than seconds old"""
+        cutoff = datetime.fromtimestamp(time.time() - older_than).isoformat()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                (cutoff,)
+            ).rowcount
+
+    def counts(self) -> dict:
+        """Number of jobs in each status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _to_job(self, row) -> ScrapeJob:
+        return ScrapeJob(
+            id=row["id"],
+            url=row["url"],
+            status=row["status"],
+            options=json.loads(row["options"]),
+            progress=row["progress"],
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            error=row["error"],
+            callback_url=row["callback_url"],
+            callback_status=row["callback_status"],
+            result=json.loads(row["result"]) if row["result"] else None
+        )
+
+
+class JobQueue:
+    """
+    Background workers that run scrape jobs from a JobStore
+
+    run_job receives the job and a progress function (safe to call from any
+    thread) and returns the response body to store. Jobs are processed in
+    submission order by a fixed number of asyncio workers; when a job has a
+    callback_url, the finished job is POSTed there. Callback URLs are checked
+    with check_callback_url() again before each delivery, and redirects are
+    not followed.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        run_job: Callable[[ScrapeJob, Callable[[int], None]], Awaitable[dict]],
+        workers: int = 1,
+        allow_private_callbacks: bool = False
+    ):
+        self.store = store
+        self.run_job = run_job
+        self.workers = max(1, workers)
+        self.allow_private_callbacks = allow_private_callbacks
+        self._queue: "asyncio.Queue[str]" = None
+        self._tasks = []
+
+    def start(self):
+        """Start the workers and queue any jobs left over from a previous run"""
+        self._queue = asyncio.Queue()
+        for job_id in self.store.requeue_interrupted():
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)]
+        logger.info(f"Started {self.workers} job workers with {self._queue.qsize()} queued jobs")
+
+    def submit(self, url: str, options: dict, callback_url: Optional[str] = None) -> ScrapeJob:
+        """Persist a new job and queue it"""
+        job = self.store.create(url, options, callback_url)
+        self._queue.put_nowait(job.id)
+        logger.info(f"Queued scrape job {job.id} for {url}")
+        return job
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, **self.store.counts()}
+
+    async def shutdown(self):
+        """Stop the workers; jobs they were running stay 'running' and are requeued on restart"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Job worker failed on {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None or job.status != "queued":
+            return
+
+        self.store.mark_running(job_id)
+        logger.info(f"Running scrape job {job_id} for {job.url}")
+        # [vehicles parsed so far, when progress was last written]
+        state = [0, 0.0]
+
+        def progress(vehicles: int):
+            state[0] = vehicles
+            now = time.monotonic()
+            if now - state[1] >= PROGRESS_WRITE_INTERVAL:
+                state[1] = now
+                self.store.set_progress(job_id, vehicles)
+
+        try:
+            result = await self.run_job(job, progress)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Scrape job {job_id} failed: {e}", exc_info=True)
+            self.store.finish(job_id, error=f"Scraping failed: {str(e)}")
+        else:
+            self.store.finish(job_id, result=result, progress=state[0])
+
+        if job.callback_url:
+            await self._notify(job_id)
+
+    async def _notify(self, job_id: str):
+        """POST the finished job to its callback URL, retrying with backoff"""
+        job = self.store.get(job_id)
+        payload = job.model_dump()
+        delay = CALLBACK_RETRY_DELAY
+        for attempt in range(1, CALLBACK_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(self._post, job.callback_url, payload)
+                self.store.set_callback_status(job_id, "delivered")
+                return
+            except Exception as e:
+                logger.warning(f"Callback for job {job_id} failed (attempt {attempt}): {e}")
+                status = f"failed: {e}"
+            if attempt < CALLBACK_ATTEMPTS:
+                await asyncio.sleep(delay)
+                delay *= 2
+        self.store.set_callback_status(job_id, status)
+
+    def _post(self, url: str, payload: dict):
+        check_callback_url(url, self.allow_private_callbacks)
+        response = get_session().post(url, json=payload, timeout=10, allow_redirects=False)
+        response.raise_for_status()
@@ -1,9 +1,33 @@
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+import asyncio
 import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Literal, Optional, Tuple
+from urllib.parse import urlsplit
+import config
+import metrics
+import serialization
+from browser import page_stats
+from cache import ResponseCache, normalize_url
+from delta import diff_inventory
+from driver_pool import DriverPool
+from enrichment import DetailCache
+from fetch_policy import CIRCUIT_STATES, POLICY as fetch_policy
+from html_scope import parse_document
+from http_client import close_session
+from jobs import JobQueue, JobStore, check_callback_url
+from parse_pool import ParsePool
+from scheduler import RefreshScheduler, parse_schedule
 from scraper import CarDealerScraper
-from models import ScraperResponse
+from models import BatchScrapeRequest, CarListing, ScrapeJob, ScraperResponse
+from storage import InventoryStore, SQLiteInventoryStore
+from workers import ScrapeExecutor, ExecutorSaturated
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +52,584 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shared pool of warm Chrome sessions, created at startup
+driver_pool = None
+
+# Persistent copy of every scrape's vehicles, opened at startup
+inventory_store: InventoryStore = None
+
+# Recent results, shared by identical /scrape calls
+response_cache = ResponseCache(
+    ttl=config.CACHE_TTL,
+    stale_ttl=config.CACHE_STALE_TTL,
+    max_entries=config.CACHE_MAX_ENTRIES
+)
+
+# Parsed vehicle detail pages, reused by enrichment while a listing is unchanged
+detail_cache = DetailCache(ttl=config.DETAIL_CACHE_TTL, max_entries=config.DETAIL_CACHE_MAX_ENTRIES)
+
+# Worker processes for HTML parsing (PARSE_WORKERS > 0); started at startup
+parse_pool: ParsePool = None
+
+# Asynchronous /scrape jobs, persisted so they survive restarts; started at startup
+job_queue: JobQueue = None
+
+# Background refresh of tracked dealerships; started at startup
+refresh_scheduler: RefreshScheduler = None
+
+# Blocking scrape work runs here so the event loop stays responsive
+scrape_executor = ScrapeExecutor(
+    max_workers=config.SCRAPE_WORKERS,
+    max_queue=config.SCRAPE_QUEUE_SIZE
+)
+
+
+def _driver_pool_browsers():
+    if not driver_pool:
+        return None
+    stats = driver_pool.stats()
+    return {("idle",): stats["idle"], ("in_use",): stats["in_use"]}
+
+
+def _scrape_queue_depth():
+    stats = scrape_executor.stats()
+    return {("running",): stats["running"], ("queued",): stats["queued"]}
+
+
+def _cache_requests():
+    stats = response_cache.stats()
+    return {(status,): stats[status] for status in ("hit", "stale", "miss", "coalesced", "refresh")}
+
+
+def _job_counts():
+    if not job_queue:
+        return None
+    return {(status,): count for status, count in job_queue.store.counts().items()}
+
+
+def _scheduled_dealers():
+    if not refresh_scheduler:
+        return None
+    stats = refresh_scheduler.stats()
+    return {("total",): stats["dealers"], ("running",): stats["running"], ("failing",): stats["failing"]}
+
+
+def _circuit_breakers():
+    states = list(fetch_policy.states().values())
+    return {(state,): states.count(state) for state in CIRCUIT_STATES}
+
+
+def _host_circuits():
+    # 0 closed, 1 half open, 2 open
+    return {(host,): CIRCUIT_STATES.index(state) for host, state in fetch_policy.states().items()}
+
+
+# Pool, queue, cache, job and fetch policy state, read when /metrics is scraped
+for _metric in (
+    metrics.CallbackMetric("scraper_driver_pool_size", "Configured pooled browsers",
+                           lambda: driver_pool.size if driver_pool else None),
+    metrics.CallbackMetric("scraper_driver_pool_browsers", "Pooled browsers by state",
+                           _driver_pool_browsers, ["state"]),
+    metrics.CallbackMetric("scraper_driver_pool_recycled_total", "Browsers retired by the pool",
+                           lambda: driver_pool.stats()["recycled"] if driver_pool else None, type="counter"),
+    metrics.CallbackMetric("scraper_scrape_queue", "Scrapes running or waiting for a worker",
+                           _scrape_queue_depth, ["state"]),
+    metrics.CallbackMetric("scraper_scrape_rejected_total", "Scrapes rejected because the queue was full",
+                           lambda: scrape_executor.stats()["rejected"], type="counter"),
+    metrics.CallbackMetric("scraper_cache_requests_total", "Response cache lookups by outcome",
+                           _cache_requests, ["status"], type="counter"),
+    metrics.CallbackMetric("scraper_cache_entries", "Cached /scrape results",
+                           lambda: response_cache.stats()["entries"]),
+    metrics.CallbackMetric("scraper_detail_cache_entries", "Cached vehicle detail pages for enrichment",
+                           lambda: detail_cache.stats()["entries"]),
+    metrics.CallbackMetric("scraper_process_resident_memory_bytes", "Resident memory of this API process",
+                           metrics.rss_bytes),
+    metrics.CallbackMetric("scraper_parse_pool_workers", "Configured HTML parse worker processes",
+                           lambda: parse_pool.workers if parse_pool else None),
+    metrics.CallbackMetric("scraper_parse_pool_restarts_total", "Parse pools replaced after a worker died",
+                           lambda: parse_pool.stats()["restarts"] if parse_pool else None, type="counter"),
+    metrics.CallbackMetric("scraper_jobs", "Asynchronous scrape jobs by status", _job_counts, ["status"]),
+    metrics.CallbackMetric("scraper_scheduled_dealers", "Dealers on the refresh schedule by state",
+                           _scheduled_dealers, ["state"]),
+    metrics.CallbackMetric("scraper_circuit_breakers", "Dealer hosts by circuit breaker state",
+                           _circuit_breakers, ["state"]),
+    metrics.CallbackMetric("scraper_host_circuit_state", "Circuit breaker state per dealer host "
+                           "(0 closed, 1 half open, 2 open)", _host_circuits, ["host"]),
+):
+    metrics.REGISTRY.register(_metric)
+
+
+@app.middleware("http")
+async def count_requests(request: Request, call_next):
+    """Count API requests by route and status code"""
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.REQUESTS.inc(endpoint=getattr(route, "path", "unmatched"), status=response.status_code)
+    return response
+
+
+@app.on_event("startup")
+async def start_workers():
+    """Open the inventory store, start the parse workers, resume queued jobs, start scheduled refreshes and pre-launch the WebDriver pool"""
+    global driver_pool, inventory_store, job_queue, parse_pool, refresh_scheduler
+    if config.STORE_ENABLED:
+        inventory_store = SQLiteInventoryStore(config.STORE_PATH, history_days=config.STORE_HISTORY_DAYS)
+
+    if config.PARSE_WORKERS > 0:
+        parse_pool = ParsePool(workers=config.PARSE_WORKERS, chunk_size=config.PARSE_CHUNK_SIZE)
+        await asyncio.get_running_loop().run_in_executor(None, parse_pool.start)
+
+    job_store = JobStore(config.JOB_STORE_PATH)
+    purged = job_store.purge_finished(config.JOB_RETENTION)
+    if purged:
+        logger.info(f"Purged {purged} finished scrape jobs")
+    job_queue = JobQueue(
+        job_store,
+        _run_job,
+        workers=config.JOB_WORKERS,
+        allow_private_callbacks=config.CALLBACK_ALLOW_PRIVATE
+    )
+    job_queue.start()
+
+    refresh_scheduler = RefreshScheduler(
+        _scheduled_refresh,
+        concurrency=config.SCHEDULE_CONCURRENCY,
+        jitter=config.SCHEDULE_JITTER,
+        max_backoff=config.SCHEDULE_MAX_BACKOFF
+    )
+    for url, interval in parse_schedule(config.SCHEDULE_URLS, config.SCHEDULE_INTERVAL):
+        refresh_scheduler.add(url, interval)
+    refresh_scheduler.start()
+
+    if not config.DRIVER_POOL_ENABLED:
+        logger.info("Driver pool disabled, each scrape will launch its own browser")
+        return
+    driver_pool = DriverPool(
+        size=config.DRIVER_POOL_SIZE,
+        max_uses=config.DRIVER_MAX_USES,
+        idle_timeout=config.DRIVER_IDLE_TIMEOUT,
+        acquire_timeout=config.DRIVER_ACQUIRE_TIMEOUT
+    )
+    driver_pool.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    """Stop the scheduler, job workers, cached fetches and scrape executor, close HTTP connections, the stores, parse workers and pooled browsers"""
+    global driver_pool, inventory_store, job_queue, parse_pool, refresh_scheduler
+    if refresh_scheduler:
+        await refresh_scheduler.shutdown()
+        refresh_scheduler = None
+    if job_queue:
+        await job_queue.shutdown()
+        job_queue.store.close()
+        job_queue = None
+    await response_cache.shutdown()
+    scrape_executor.shutdown()
+    close_session()
+    if inventory_store:
+        inventory_store.close()
+        inventory_store = None
+    if parse_pool:
+        parse_pool.shutdown()
+        parse_pool = None
+    if driver_pool:
+        driver_pool.shutdown()
+        driver_pool = None
+
+
+def _capacity_error(e: ExecutorSaturated) -> HTTPException:
+    """503 telling the client how busy we are and when to come back"""
+    return HTTPException(
+        status_code=503,
+        detail={
+            "message": "Scraper is at capacity, retry later",
+            "queue_depth": e.queue_depth,
+            "retry_after": e.retry_after
+        },
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+def _scrape_and_store(scraper: CarDealerScraper, url: str, **options) -> ScraperResponse:
+    """Run a scrape, diff it against the stored snapshot and persist it (blocking)"""
+    result = scraper.scrape_inventory(url, **options)
+    if inventory_store and result.success:
+        try:
+            # A scrape with errors or crawl limits may have missed cars, so don't mark them removed
+            clean = not result.errors and not result.truncated
+            previous = inventory_store.get_inventory(url)
+            cars = result.stored_cars()
+            result.delta = diff_inventory(url, previous, cars, result.scraped_at, include_removed=clean)
+            inventory_store.save_inventory(url, cars, result.scraped_at, mark_removed=clean)
+        except Exception as e:
+            logger.error(f"Failed to store inventory for {url}: {e}", exc_info=True)
+    return result
+
+
+def _parse_since(since: Optional[str], delta: bool) -> Optional[str]:
+    """A delta `since` cursor in the local ISO format scraped_at uses; 400 when it isn't one"""
+    if since is None:
+        return None
+    if not delta:
+        raise HTTPException(status_code=400, detail="since needs delta")
+    try:
+        parsed = datetime.fromisoformat(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since must be an ISO timestamp, e.g. a previous scraped_at")
+    if parsed.tzinfo:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _delta_since(url: str, result: ScraperResponse, since: Optional[str]) -> ScraperResponse:
+    """
+    Result whose delta compares it with the stored inventory as of `since` (blocking)
+
+    The stored delta covers only the latest scrape, and scheduled refreshes move
+    it on, so a delta reader passes the scraped_at it last saw and gets every
+    change after it. Returns a copy, since result may be shared through the cache.
+    """
+    if since is None or inventory_store is None or not result.success:
+        return result
+    try:
+        previous = inventory_store.get_inventory_at(url, since)
+        clean = not result.errors and not result.truncated
+        delta = diff_inventory(url, previous, result.stored_cars(), result.scraped_at, include_removed=clean)
+        delta.previous_scraped_at = since
+    except Exception as e:
+        logger.error(f"Failed to compare {url} with its inventory as of {since}: {e}", exc_info=True)
+        delta = None
+    return result.model_copy(update={"delta": delta})
+
+
+async def _cached_scrape(
+    url: str,
+    headless: bool,
+    fetch_mode: str,
+    max_detail_pages: int,
+    max_pages: int,
+    max_vehicles: Optional[int],
+    force_refresh: bool = False,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    cache_ttl: Optional[float] = None,
+    enrich: str = "off",
+    enrich_max_pages: int = config.ENRICH_MAX_PAGES,
+    enrich_budget: float = config.ENRICH_BUDGET
+) -> Tuple[ScraperResponse, str, float]:
+    """
+    Scrape a dealership through the response cache on the scrape executor
+
+    cache_ttl keeps the result fresh for longer than the cache default.
+    Enriched results are cached separately from plain ones. progress_callback
+    only hears from a scrape this call waits for: a stale hit's background
+    refresh may outlive the caller, so it stops reporting once this returns.
+
+    Returns:
+        (result, cache status, cache age in seconds)
+    """
+    waiting = True
+
+    def report_progress(vehicles: int):
+        if waiting:
+            progress_callback(vehicles)
+
+    async def run_scrape():
+        # Initialize scraper
+        scraper = CarDealerScraper(
+            headless=headless,
+            driver_pool=driver_pool,
+            progress_callback=report_progress if progress_callback else None,
+            detail_cache=detail_cache,
+            parse_pool=parse_pool
+        )
+
+        # Scrape the inventory off the event loop
+        return await scrape_executor.run(_scrape_and_store, scraper, url, **options)
+
+    options = {
+        "fetch_mode": fetch_mode,
+        "max_detail_pages": max_detail_pages,
+        "max_pages": max_pages,
+        "max_vehicles": max_vehicles
+    }
+    if enrich != "off":
+        options.update(enrich=enrich, enrich_max_pages=enrich_max_pages, enrich_budget=enrich_budget)
+    cache_key = ResponseCache.make_key(url, **options)
+    try:
+        return await response_cache.get_or_fetch(cache_key, run_scrape, force_refresh=force_refresh, ttl=cache_ttl)
+    finally:
+        waiting = False
+
+
+async def _scheduled_refresh(url: str, ttl: float) -> ScraperResponse:
+    """Re-scrape a tracked dealership with /scrape's default options, so plain reads hit the refreshed entry"""
+    result, _, _ = await _cached_scrape(
+        url,
+        headless=True,
+        fetch_mode="auto",
+        max_detail_pages=config.MAX_DETAIL_PAGES,
+        max_pages=config.MAX_PAGES,
+        max_vehicles=config.MAX_VEHICLES or None,
+        force_refresh=True,
+        cache_ttl=ttl
+    )
+    return result
+
+
+def _format_result(
+    result: ScraperResponse,
+    llm_format: bool,
+    delta: bool,
+    cache_status: str,
+    cache_age: float,
+    compact: Optional[dict] = None
+) -> dict:
+    """
+    Response body for a scrape result
+
+    compact holds to_compact_llm_format() options and takes precedence over llm_format.
+    A failed scrape has no change data, so in delta mode it is returned as is,
+    with its errors. Raises 409 when delta mode is used without the inventory
+    store and 503 when the store couldn't diff a successful scrape.
+    """
+    if delta and inventory_store is None:
+        raise HTTPException(status_code=409, detail="Delta mode needs the inventory store")
+    if delta and result.delta is None and result.success:
+        raise HTTPException(
+            status_code=503,
+            detail={"message": "Couldn't compare this scrape with the stored inventory", "errors": result.errors or None}
+        )
+
+    if compact is not None:
+        response_data = result.to_compact_llm_format(**compact)
+    elif delta and result.delta is not None:
+        response_data = result.delta.to_llm_format() if llm_format else result.delta.model_dump()
+        response_data["errors"] = result.errors or None
+    elif llm_format:
+        response_data = result.to_llm_format()
+    else:
+        response_data = result.model_dump()
+    response_data["cache"] = {"status": cache_status, "age": round(cache_age, 1)}
+    return response_data
+
+
+async def _run_job(job: ScrapeJob, progress: Callable[[int], None]) -> dict:
+    """Run a queued /scrape job, waiting for a free scrape worker instead of failing"""
+    options = dict(job.options)
+    llm_format = options.pop("llm_format")
+    delta = options.pop("delta")
+    since = options.pop("since", None)
+    compact = options.pop("compact", None)
+    timings = options.pop("timings", False)
+    while True:
+        try:
+            result, cache_status, cache_age = await _cached_scrape(job.url, progress_callback=progress, **options)
+            break
+        except ExecutorSaturated as e:
+            logger.info(f"Scrape queue full, job {job.id} retries in {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+
+    progress(result.total_cars)
+    result = await run_in_threadpool(_delta_since, job.url, result, since)
+    try:
+        response_data = _format_result(result, llm_format, delta, cache_status, cache_age, compact)
+    except HTTPException as e:
+        raise RuntimeError(e.detail)
+    if timings:
+        response_data["timings"] = result.timings
+        response_data["peak_memory_mb"] = result.peak_memory_mb
+    return response_data
+
+
+# Media types for the /scrape stream formats
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _stream_record(kind: str, payload: dict, stream_format: str) -> bytes:
+    """One streamed record: an NDJSON line or a server-sent event"""
+    if stream_format == "sse":
+        return f"event: {kind}\ndata: ".encode() + serialization.dumps(payload) + b"\n\n"
+    return serialization.dumps({"type": kind, **payload}) + b"\n"
+
+
+def _vehicle_record(car: CarListing, llm_format: bool) -> dict:
+    if llm_format:
+        return {"summary": car.to_llm_summary(), "full_details": car.model_dump(exclude_none=True)}
+    return car.model_dump()
+
+
+def _summary_record(
+    result: ScraperResponse,
+    cache_status: str,
+    started: float,
+    first_vehicle: Optional[float]
+) -> dict:
+    return {
+        "success": result.success,
+        "total_cars": result.total_cars,
+        "scraped_at": result.scraped_at,
+        "fetch_mode": result.fetch_mode,
+        "pages_crawled": result.pages_crawled,
+        "truncated": result.truncated,
+        "errors": result.errors or None,
+        "cache": cache_status,
+        "seconds": round(time.monotonic() - started, 3),
+        "first_vehicle_seconds": first_vehicle,
+        "peak_memory_mb": result.peak_memory_mb
+    }
+
+
+class _VehicleFeed:
+    """
+    Vehicles a streaming scrape has parsed so far, relayed to every stream of the same dealer
+
+    Lives on the event loop: the scrape thread publishes through call_soon_threadsafe.
+    A stream that subscribes late gets the vehicles parsed before it joined first.
+    """
+
+    def __init__(self):
+        self.cars: List[CarListing] = []
+        self.listeners = set()
+        self.publishing = False
+        self.admitted = asyncio.Event()
+
+    def publish(self, car: CarListing):
+        self.cars.append(car)
+        for listener in self.listeners:
+            listener.put_nowait(car)
+
+    def subscribe(self) -> "asyncio.Queue[CarListing]":
+        listener = asyncio.Queue()
+        for car in self.cars:
+            listener.put_nowait(car)
+        self.listeners.add(listener)
+        return listener
+
+
+# Feeds of streaming scrapes by cache key, while a scrape or a stream uses them
+_vehicle_feeds: Dict[str, _VehicleFeed] = {}
+
+
+def _release_feed(cache_key: str, feed: _VehicleFeed):
+    if _vehicle_feeds.get(cache_key) is feed and not feed.publishing and not feed.listeners:
+        del _vehicle_feeds[cache_key]
+
+
+async def _start_stream(
+    url: str,
+    stream_format: str,
+    llm_format: bool,
+    headless: bool,
+    force_refresh: bool,
+    **options
+) -> StreamingResponse:
+    """
+    Begin a streamed scrape and return the response that relays it
+
+    A fresh cached result is replayed at once. Otherwise the scrape goes
+    through the response cache like a normal /scrape, so streams of the same
+    dealer share one scrape: each vehicle is sent as soon as the shared scrape
+    parses it. A stream that joins a scrape started by a plain /scrape gets
+    the vehicles when it finishes, as does a stale cache hit.
+    """
+    started = time.monotonic()
+    media_type = STREAM_MEDIA_TYPES[stream_format]
+    cache_key = ResponseCache.make_key(url, **options)
+
+    entry = response_cache.peek(cache_key)
+    fresh_for = None
+    if entry:
+        fresh_for = entry.ttl if entry.ttl is not None else response_cache.ttl
+    if entry and entry.age <= fresh_for and not force_refresh:
+        async def replay():
+            for car in entry.value.cars:
+                yield _stream_record("vehicle", _vehicle_record(car, llm_format), stream_format)
+            yield _stream_record("summary", _summary_record(entry.value, "hit", started, None), stream_format)
+        return StreamingResponse(replay(), media_type=media_type)
+
+    loop = asyncio.get_running_loop()
+
+    async def run_scrape():
+        feed = _vehicle_feeds.setdefault(cache_key, _VehicleFeed())
+        feed.publishing = True
+        try:
+            scraper = CarDealerScraper(
+                headless=headless,
+                driver_pool=driver_pool,
+                vehicle_callback=lambda car: loop.call_soon_threadsafe(feed.publish, car),
+                parse_pool=parse_pool
+            )
+            scrape = asyncio.ensure_future(scrape_executor.run(_scrape_and_store, scraper, url, **options))
+            # The executor admits or rejects a scrape before it first yields
+            await asyncio.sleep(0)
+            if not scrape.done():
+                feed.admitted.set()
+            return await scrape
+        finally:
+            feed.publishing = False
+            if _vehicle_feeds.get(cache_key) is feed:
+                del _vehicle_feeds[cache_key]
+
+    feed = _vehicle_feeds.setdefault(cache_key, _VehicleFeed())
+    vehicles = feed.subscribe()
+    joined = response_cache.in_flight(cache_key)
+    scrape = asyncio.create_task(response_cache.get_or_fetch(cache_key, run_scrape, force_refresh=force_refresh))
+
+    if not joined:
+        # A full scrape queue can then still be answered with a 503 before any of the stream is sent
+        admitted = asyncio.ensure_future(feed.admitted.wait())
+        await asyncio.wait({scrape, admitted}, return_when=asyncio.FIRST_COMPLETED)
+        admitted.cancel()
+        if scrape.done() and isinstance(scrape.exception(), ExecutorSaturated):
+            feed.listeners.discard(vehicles)
+            _release_feed(cache_key, feed)
+            logger.warning(f"Rejecting streamed scrape for {url}: {scrape.exception()}")
+            raise _capacity_error(scrape.exception())
+
+    async def relay():
+        first_vehicle = None
+        sent = 0
+        next_vehicle = asyncio.ensure_future(vehicles.get())
+        try:
+            while not scrape.done():
+                await asyncio.wait({next_vehicle, scrape}, return_when=asyncio.FIRST_COMPLETED)
+                if next_vehicle.done():
+                    if first_vehicle is None:
+                        first_vehicle = round(time.monotonic() - started, 3)
+                    sent += 1
+                    yield _stream_record("vehicle", _vehicle_record(next_vehicle.result(), llm_format), stream_format)
+                    next_vehicle = asyncio.ensure_future(vehicles.get())
+            try:
+                result, cache_status, _ = scrape.result()
+            except Exception as e:
+                logger.error(f"Streamed scrape of {url} failed: {e}", exc_info=True)
+                yield _stream_record("error", {"error": f"Scraping failed: {str(e)}"}, stream_format)
+                return
+
+            if sent or cache_status not in ("hit", "stale"):
+                # Vehicles are queued before the scrape's result is delivered,
+                # so whatever is left can be drained now
+                while not vehicles.empty():
+                    sent += 1
+                    yield _stream_record("vehicle", _vehicle_record(vehicles.get_nowait(), llm_format), stream_format)
+            if not sent:
+                # A cached result, or a shared scrape that didn't stream its vehicles
+                for car in result.cars:
+                    if first_vehicle is None:
+                        first_vehicle = round(time.monotonic() - started, 3)
+                    yield _stream_record("vehicle", _vehicle_record(car, llm_format), stream_format)
+            logger.info(f"Streamed scrape completed. Found {result.total_cars} vehicles (cache {cache_status})")
+            yield _stream_record("summary", _summary_record(result, cache_status, started, first_vehicle), stream_format)
+        finally:
+            next_vehicle.cancel()
+            feed.listeners.discard(vehicles)
+            _release_feed(cache_key, feed)
+            # Client went away mid-scrape: the shared scrape finishes and is cached, retrieve its outcome quietly
+            scrape.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    return StreamingResponse(relay(), media_type=media_type)
+
 
 @app.get("/")
 async def root():
@@ -37,7 +639,13 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/scrape": "Scrape car inventory from a dealership website",
-            "/health": "Health check endpoint"
+            "/scrape/batch": "Scrape several dealerships, streaming each result as it finishes",
+            "/jobs/{job_id}": "Status, progress and result of an asynchronous scrape",
+            "/inventory": "Stored inventory from the last scrape of a dealership",
+            "/inventory/dealerships": "Dealerships with stored inventory",
+            "/health": "Health check endpoint",
+            "/fetch-policy": "Per-host rate limit, retry and circuit breaker state",
+            "/metrics": "Prometheus metrics"
         }
     }
 
@@ -45,11 +653,34 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "driver_pool": driver_pool.stats() if driver_pool else None,
+        "scrape_queue": scrape_executor.stats(),
+        "cache": response_cache.stats(),
+        "detail_cache": detail_cache.stats(),
+        "parse_pool": parse_pool.stats() if parse_pool else None,
+        "jobs": job_queue.stats() if job_queue else None,
+        "schedule": refresh_scheduler.stats() if refresh_scheduler else None,
+        "fetch_policy": fetch_policy.stats()
+    }
+
+
+@app.get("/fetch-policy")
+async def get_fetch_policy():
+    """Fetch policy settings and every dealer host's breaker state and counters, failing hosts first"""
+    return fetch_policy.status()
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Counters and histograms in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 
 @app.get("/scrape", response_model=dict)
 async def scrape_inventory(
+    request: Request,
     url: str = Query(
         default="https://www.usautosofdallas.com/",
         description="The dealership website URL to scrape"
@@ -61,6 +692,96 @@ async def scrape_inventory(
     headless: bool = Query(
         default=True,
         description="Run browser in headless mode"
+    ),
+    fetch_mode: Literal["auto", "http", "browser"] = Query(
+        default="auto",
+        description="auto: plain HTTP first, browser only if no vehicle cards are found; "
+                    "http: never launch a browser; browser: always use Selenium"
+    ),
+    max_detail_pages: int = Query(
+        default=config.MAX_DETAIL_PAGES,
+        ge=0,
+        le=500,
+        description="Most vehicle detail pages to visit when the inventory page has no vehicle cards"
+    ),
+    max_pages: int = Query(
+        default=config.MAX_PAGES,
+        ge=1,
+        le=200,
+        description="Most inventory pages (or load-more rounds) to crawl"
+    ),
+    max_vehicles: Optional[int] = Query(
+        default=config.MAX_VEHICLES or None,
+        ge=1,
+        description="Stop crawling once this many vehicles have been found"
+    ),
+    force_refresh: bool = Query(
+        default=False,
+        description="Ignore any cached result and scrape the site again"
+    ),
+    delta: bool = Query(
+        default=False,
+        description="Return only vehicles added, removed or changed since the previous scrape"
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        description="With delta, compare with the stored inventory as of this ISO timestamp "
+                    "(the scraped_at of the last delta read) instead of the previous scrape"
+    ),
+    async_mode: bool = Query(
+        default=False,
+        description="Queue the scrape as a background job and return its ID immediately"
+    ),
+    callback_url: Optional[str] = Query(
+        default=None,
+        description="With async_mode, URL that receives the finished job as a JSON POST"
+    ),
+    stream: Optional[Literal["ndjson", "sse"]] = Query(
+        default=None,
+        description="Stream each vehicle as soon as it is parsed, as NDJSON or server-sent events"
+    ),
+    timings: bool = Query(
+        default=False,
+        description="Include the seconds spent in each scrape stage and the peak process memory"
+    ),
+    compact: bool = Query(
+        default=False,
+        description="Return vehicles as a compact table (header row, one line per car) for LLM prompts"
+    ),
+    max_tokens: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="With compact, fit the table to roughly this many tokens"
+    ),
+    max_chars: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="With compact, fit the table to this many characters"
+    ),
+    include_images: bool = Query(
+        default=False,
+        description="With compact, add each vehicle's first image URL"
+    ),
+    include_description: bool = Query(
+        default=False,
+        description="With compact, add each vehicle's description"
+    ),
+    enrich: Literal["off", "specs", "full"] = Query(
+        default="off",
+        description="Fill fields missing from listing cards from vehicle detail pages: "
+                    "specs (VIN, stock, colours, drivetrain...) or full (also features and description)"
+    ),
+    enrich_max_pages: int = Query(
+        default=config.ENRICH_MAX_PAGES,
+        ge=0,
+        le=500,
+        description="With enrich, most detail pages to fetch; cached details don't count"
+    ),
+    enrich_budget: float = Query(
+        default=config.ENRICH_BUDGET,
+        gt=0,
+        le=600,
+        description="With enrich, seconds after which no further detail pages are started"
     )
 ):
     """
@@ -70,31 +791,162 @@ async def scrape_inventory(
         url: The dealership website URL (default: https://www.usautosofdallas.com/)
         llm_format: Whether to return data in LLM-friendly format (default: True)
         headless: Whether to run browser in headless mode (default: True)
+        fetch_mode: How to fetch the inventory page (default: auto)
+        max_detail_pages: Cap on detail pages for the link fallback (default: 50)
+        max_pages: Cap on inventory pages to crawl (default: 20)
+        max_vehicles: Cap on vehicles returned (default: no cap)
+        force_refresh: Bypass the response cache (default: False)
+        delta: Return only changes since the previous scrape (default: False)
+        since: With delta, report changes since this timestamp instead (default: none)
+        async_mode: Return a job ID at once and scrape in the background (default: False)
+        callback_url: Notified with the finished job in async mode (default: none)
+        stream: Stream vehicles as ndjson or sse instead of one JSON body (default: none)
+        timings: Include per-stage scrape timings and peak memory in the response (default: False)
+        compact: Return a budgeted table instead of per-vehicle objects (default: False)
+        max_tokens: Token budget for the compact table (default: none)
+        max_chars: Character budget for the compact table (default: none)
+        include_images: Add first image URLs to the compact table (default: False)
+        include_description: Add descriptions to the compact table (default: False)
+        enrich: Detail-page enrichment depth: off, specs or full (default: off)
+        enrich_max_pages: Cap on detail pages fetched for enrichment (default: 25)
+        enrich_budget: Seconds to spend starting enrichment fetches (default: 30)
 
     Returns:
-        JSON response with car inventory data
+        JSON response with car inventory data, 202 with a job ID in async mode,
+        or a stream of vehicle records closed by a summary or error record.
+        Results carry an ETag; a matching If-None-Match gets 304 Not Modified.
     """
+    if stream and (async_mode or delta):
+        raise HTTPException(status_code=400, detail="stream can't be combined with async_mode or delta")
+    if compact and (stream or delta):
+        raise HTTPException(status_code=400, detail="compact can't be combined with stream or delta")
+    if stream and enrich != "off":
+        # Streamed vehicles are sent as cards are parsed, before enrichment runs
+        raise HTTPException(status_code=400, detail="enrich can't be combined with stream")
+    since = _parse_since(since, delta)
+
+    compact_options = {
+        "max_tokens": max_tokens,
+        "max_chars": max_chars,
+        "include_images": include_images,
+        "include_description": include_description
+    } if compact else None
+
+    if async_mode:
+        if not job_queue:
+            raise HTTPException(status_code=503, detail="Job queue is not running")
+        if callback_url:
+            try:
+                await run_in_threadpool(check_callback_url, callback_url, config.CALLBACK_ALLOW_PRIVATE)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        job = job_queue.submit(
+            url,
+            {
+                "llm_format": llm_format,
+                "headless": headless,
+                "fetch_mode": fetch_mode,
+                "max_detail_pages": max_detail_pages,
+                "max_pages": max_pages,
+                "max_vehicles": max_vehicles,
+                "force_refresh": force_refresh,
+                "delta": delta,
+                "since": since,
+                "compact": compact_options,
+                "timings": timings,
+                "enrich": enrich,
+                "enrich_max_pages": enrich_max_pages,
+                "enrich_budget": enrich_budget
+            },
+            callback_url=callback_url
+        )
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"},
+            headers={"Location": f"/jobs/{job.id}"}
+        )
+
+    if stream:
+        return await _start_stream(
+            url,
+            stream,
+            llm_format=llm_format,
+            headless=headless,
+            force_refresh=force_refresh,
+            fetch_mode=fetch_mode,
+            max_detail_pages=max_detail_pages,
+            max_pages=max_pages,
+            max_vehicles=max_vehicles
+        )
+
     try:
         logger.info(f"Received scrape request for: {url}")
 
-        # Initialize scraper
-        scraper = CarDealerScraper(headless=headless)
+        result, cache_status, cache_age = await _cached_scrape(
+            url,
+            headless=headless,
+            fetch_mode=fetch_mode,
+            max_detail_pages=max_detail_pages,
+            max_pages=max_pages,
+            max_vehicles=max_vehicles,
+            force_refresh=force_refresh,
+            enrich=enrich,
+            enrich_max_pages=enrich_max_pages,
+            enrich_budget=enrich_budget
+        )
+        headers = {"X-Cache": cache_status.upper(), "X-Cache-Age": str(int(cache_age))}
+        if not delta:
+            # Delta bodies depend on the previous snapshot, not just this result
+            headers["ETag"] = serialization.make_etag(
+                result.content_hash(), "scrape", llm_format, compact_options, timings
+            )
+            if serialization.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+                logger.info(f"Inventory unchanged for {url}, returning 304 (cache {cache_status})")
+                return serialization.not_modified(headers)
 
-        # Scrape the inventory
-        result = scraper.scrape_inventory(url)
+        if delta:
+            result = await run_in_threadpool(_delta_since, url, result, since)
 
-        # Return appropriate format
-        if llm_format:
-            response_data = result.to_llm_format()
-        else:
-            response_data = result.model_dump()
+        def render() -> Response:
+            serialize_started = time.perf_counter()
+            if compact_options is None and not delta:
+                # Full results are the big ones: encode them straight from the models
+                extra = {"cache": {"status": cache_status, "age": round(cache_age, 1)}}
+                if timings:
+                    extra["timings"] = result.timings
+                    extra["peak_memory_mb"] = result.peak_memory_mb
+                if llm_format:
+                    body = serialization.encode_llm_format(result, extra)
+                else:
+                    body = serialization.encode_model(result, extra)
+            else:
+                response_data = _format_result(result, llm_format, delta, cache_status, cache_age, compact_options)
+                if timings:
+                    response_data["timings"] = result.timings
+                    response_data["peak_memory_mb"] = result.peak_memory_mb
+                body = serialization.dumps(response_data)
 
-        logger.info(f"Scraping completed. Found {result.total_cars} vehicles")
+            response = serialization.json_response(body, request.headers.get("accept-encoding"), headers=headers)
+            metrics.observe_stage("serialization", time.perf_counter() - serialize_started)
+            return response
 
-        return JSONResponse(content=response_data)
+        # Encoding and compressing a large inventory would hold up the event loop
+        if result.total_cars >= config.RESPONSE_OFFLOAD_MIN_VEHICLES:
+            response = await run_in_threadpool(render)
+        else:
+            response = render()
+        logger.info(f"Scraping completed. Found {result.total_cars} vehicles (cache {cache_status})")
+        return response
 
+    except ExecutorSaturated as e:
+        logger.warning(f"Rejecting scrape for {url}: {e}")
+        metrics.record_error("api", e)
+        raise _capacity_error(e)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error during scraping: {e}", exc_info=True)
+        metrics.record_error("api", e)
         raise HTTPException(
             status_code=500,
             detail=f"Scraping failed: {str(e)}"
@@ -103,9 +955,29 @@ async def scrape_inventory(
 
 @app.post("/scrape")
 async def scrape_inventory_post(
+    request: Request,
     url: str = "https://www.usautosofdallas.com/",
     llm_format: bool = True,
-    headless: bool = True
+    headless: bool = True,
+    fetch_mode: Literal["auto", "http", "browser"] = "auto",
+    max_detail_pages: int = config.MAX_DETAIL_PAGES,
+    max_pages: int = config.MAX_PAGES,
+    max_vehicles: Optional[int] = config.MAX_VEHICLES or None,
+    force_refresh: bool = False,
+    delta: bool = False,
+    since: Optional[str] = None,
+    async_mode: bool = False,
+    callback_url: Optional[str] = None,
+    stream: Optional[Literal["ndjson", "sse"]] = None,
+    timings: bool = False,
+    compact: bool = False,
+    max_tokens: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    include_images: bool = False,
+    include_description: bool = False,
+    enrich: Literal["off", "specs", "full"] = "off",
+    enrich_max_pages: int = config.ENRICH_MAX_PAGES,
+    enrich_budget: float = config.ENRICH_BUDGET
 ):
     """
     POST endpoint for scraping (useful for n8n workflows that prefer POST)
@@ -114,56 +986,412 @@ async def scrape_inventory_post(
         url: The dealership website URL
         llm_format: Whether to return data in LLM-friendly format
         headless: Whether to run browser in headless mode
+        fetch_mode: How to fetch the inventory page (auto, http or browser)
+        max_detail_pages: Cap on detail pages for the link fallback
+        max_pages: Cap on inventory pages to crawl
+        max_vehicles: Cap on vehicles returned
+        force_refresh: Bypass the response cache
+        delta: Return only changes since the previous scrape
+        since: With delta, report changes since this timestamp instead
+        async_mode: Return a job ID at once and scrape in the background
+        callback_url: Notified with the finished job in async mode
+        stream: Stream vehicles as ndjson or sse instead of one JSON body
+        timings: Include per-stage scrape timings and peak memory in the response
+        compact: Return a budgeted table instead of per-vehicle objects
+        max_tokens: Token budget for the compact table
+        max_chars: Character budget for the compact table
+        include_images: Add first image URLs to the compact table
+        include_description: Add descriptions to the compact table
+        enrich: Detail-page enrichment depth: off, specs or full
+        enrich_max_pages: Cap on detail pages fetched for enrichment
+        enrich_budget: Seconds to spend starting enrichment fetches
 
     Returns:
-        JSON response with car inventory data
+        JSON response with car inventory data, 202 with a job ID in async mode,
+        or a stream of vehicle records
     """
-    return await scrape_inventory(url=url, llm_format=llm_format, headless=headless)
+    return await scrape_inventory(
+        request=request,
+        url=url,
+        llm_format=llm_format,
+        headless=headless,
+        fetch_mode=fetch_mode,
+        max_detail_pages=max_detail_pages,
+        max_pages=max_pages,
+        max_vehicles=max_vehicles,
+        force_refresh=force_refresh,
+        delta=delta,
+        since=since,
+        async_mode=async_mode,
+        callback_url=callback_url,
+        stream=stream,
+        timings=timings,
+        compact=compact,
+        max_tokens=max_tokens,
+        max_chars=max_chars,
+        include_images=include_images,
+        include_description=include_description,
+        enrich=enrich,
+        enrich_max_pages=enrich_max_pages,
+        enrich_budget=enrich_budget
+    )
 
 
-@app.get("/debug")
-async def debug_page(url: str = "https://www.usautosofdallas.com/inventory"):
+# Attempts per dealer when the scrape executor is full, and the longest wait between them
+BATCH_SATURATED_ATTEMPTS = 3
+BATCH_SATURATED_MAX_WAIT = 10.0
+
+
+async def _batch_scrape_one(
+    url: str,
+    request: BatchScrapeRequest,
+    global_limit: asyncio.Semaphore,
+    host_limit: asyncio.Semaphore
+) -> dict:
+    """Scrape one dealer of a batch and describe the outcome as an NDJSON record"""
+    started = time.monotonic()
+    try:
+        # Take the host slot first so a dealer waiting on its site doesn't hold a global slot
+        async with host_limit, global_limit:
+            for attempt in range(1, BATCH_SATURATED_ATTEMPTS + 1):
+                try:
+                    result, cache_status, cache_age = await _cached_scrape(
+                        url,
+                        headless=request.headless,
+                        fetch_mode=request.fetch_mode,
+                        max_detail_pages=request.max_detail_pages if request.max_detail_pages is not None
+                        else config.MAX_DETAIL_PAGES,
+                        max_pages=request.max_pages or config.MAX_PAGES,
+                        max_vehicles=request.max_vehicles or config.MAX_VEHICLES or None,
+                        force_refresh=request.force_refresh,
+                        enrich=request.enrich,
+                        enrich_max_pages=request.enrich_max_pages if request.enrich_max_pages is not None
+                        else config.ENRICH_MAX_PAGES,
+                        enrich_budget=request.enrich_budget or config.ENRICH_BUDGET
+                    )
+                    break
+                except ExecutorSaturated as e:
+                    if attempt == BATCH_SATURATED_ATTEMPTS:
+                        raise
+                    logger.info(f"Scrape queue full, retrying {url} in {min(e.retry_after, BATCH_SATURATED_MAX_WAIT)}s")
+                    await asyncio.sleep(min(e.retry_after, BATCH_SATURATED_MAX_WAIT))
+
+        result = await run_in_threadpool(_delta_since, url, result, request.since)
+        format_args = (result, request.llm_format, request.delta, cache_status, cache_age)
+        if result.total_cars >= config.RESPONSE_OFFLOAD_MIN_VEHICLES:
+            data = await run_in_threadpool(_format_result, *format_args)
+        else:
+            data = _format_result(*format_args)
+        return {
+            "type": "result",
+            "url": url,
+            "success": result.success,
+            "total_cars": result.total_cars,
+            "cache": cache_status,
+            "seconds": round(time.monotonic() - started, 3),
+            "error": None if result.success else "; ".join(result.errors) or "Scrape failed",
+            "data": data
+        }
+    except HTTPException as e:
+        error = e.detail if isinstance(e.detail, str) else str(e.detail)
+    except Exception as e:
+        logger.error(f"Batch scrape failed for {url}: {e}", exc_info=True)
+        error = f"Scraping failed: {str(e)}"
+    return {
+        "type": "error",
+        "url": url,
+        "success": False,
+        "error": error,
+        "seconds": round(time.monotonic() - started, 3)
+    }
+
+
+async def _stream_batch(urls: List[str], request: BatchScrapeRequest):
+    """Run a batch and yield one NDJSON line per dealer as it finishes, then a summary"""
+    started = time.monotonic()
+    # More concurrent dealers than scrape workers would only fill the shared queue
+    concurrency = min(request.concurrency or config.BATCH_CONCURRENCY, scrape_executor.max_workers)
+    per_host = request.per_host_concurrency or config.BATCH_PER_HOST_CONCURRENCY
+    global_limit = asyncio.Semaphore(max(1, concurrency))
+    host_limits = defaultdict(lambda: asyncio.Semaphore(max(1, per_host)))
+
+    tasks = [
+        asyncio.create_task(_batch_scrape_one(url, request, global_limit, host_limits[urlsplit(normalize_url(url)).netloc]))
+        for url in urls
+    ]
+    outcomes = {}
+    try:
+        for finished in asyncio.as_completed(tasks):
+            record = await finished
+            outcomes[record["url"]] = record
+            if record.get("total_cars", 0) >= config.RESPONSE_OFFLOAD_MIN_VEHICLES:
+                yield await run_in_threadpool(serialization.dumps, record) + b"\n"
+            else:
+                yield serialization.dumps(record) + b"\n"
+    finally:
+        # Client went away: stop scheduling the rest of the batch
+        for task in tasks:
+            task.cancel()
+
+    records = [outcomes[url] for url in urls]
+    succeeded = [record for record in records if record["success"]]
+    summary = {
+        "type": "summary",
+        "total": len(records),
+        "succeeded": len(succeeded),
+        "failed": len(records) - len(succeeded),
+        "total_cars": sum(record["total_cars"] for record in succeeded),
+        "seconds": round(time.monotonic() - started, 3),
+        "concurrency": concurrency,
+        "per_host_concurrency": per_host,
+        "dealers": [
+            {
+                "url": record["url"],
+                "success": record["success"],
+                "total_cars": record.get("total_cars", 0),
+                "cache": record.get("cache"),
+                "seconds": record["seconds"],
+                "error": record["error"]
+            }
+            for record in records
+        ]
+    }
+    logger.info(
+        f"Batch completed: {summary['succeeded']}/{summary['total']} dealers, "
+        f"{summary['total_cars']} vehicles in {summary['seconds']}s"
+    )
+    yield serialization.dumps(summary) + b"\n"
+
+
+@app.post("/scrape/batch")
+async def scrape_batch(request: BatchScrapeRequest):
     """
-    Debug endpoint to see what the scraper is actually retrieving
+    Scrape several dealerships in one call
+
+    Dealers are scheduled across the shared driver pool and HTTP client with a
+    global concurrency cap and a per-site limit. The response is NDJSON: one
+    "result" or "error" line per dealer in the order they finish, then a
+    "summary" line with per-dealer timings.
+
+    Args:
+        request: URLs plus the same options as /scrape and optional concurrency limits
+
+    Returns:
+        Streaming application/x-ndjson response
     """
-    import traceback
-    try:
-        from scraper import CarDealerScraper
-        from bs4 import BeautifulSoup
-        import time
+    urls = {}
+    for url in request.urls:
+        if url.strip():
+            urls.setdefault(normalize_url(url), url.strip())
+    if not urls:
+        raise HTTPException(status_code=400, detail="No URLs to scrape")
+    request.since = _parse_since(request.since, request.delta)
+    if len(urls) > config.BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many URLs ({len(urls)}), the limit is {config.BATCH_MAX_URLS} per batch"
+        )
+
+    logger.info(f"Received batch scrape request for {len(urls)} dealers")
+    return StreamingResponse(_stream_batch(list(urls.values()), request), media_type="application/x-ndjson")
 
-        logger.info("Starting debug endpoint")
-        scraper = CarDealerScraper(headless=True)
 
-        logger.info("Initializing driver")
-        scraper._init_driver()
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Status of an asynchronous scrape job
+
+    Returns:
+        The job's status (queued, running, succeeded or failed), progress as
+        vehicles parsed so far, and once finished its response body or error
+    """
+    if not job_queue:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    job = job_queue.store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"No job {job_id}")
+    return job.model_dump()
+
+
+@app.get("/schedule")
+async def get_schedule():
+    """Tracked dealerships, when each is next refreshed and how its last refresh went"""
+    if not refresh_scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler is not running")
+    return refresh_scheduler.status()
+
+
+@app.post("/schedule")
+async def schedule_dealer(
+    url: str = Query(description="The dealership website URL to keep refreshed"),
+    interval: Optional[float] = Query(
+        default=None,
+        ge=60,
+        description="Seconds between refreshes, before jitter (default: current interval, else SCHEDULE_INTERVAL)"
+    ),
+    run_now: bool = Query(
+        default=False,
+        description="Refresh immediately instead of waiting for the first slot"
+    )
+):
+    """
+    Add a dealership to the refresh schedule, or change its interval
+
+    Dealers added here are kept until restart; use SCHEDULE_URLS for a
+    permanent schedule.
+    """
+    if not refresh_scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler is not running")
+    if interval is None:
+        current = refresh_scheduler.get(url)
+        interval = current.interval if current else config.SCHEDULE_INTERVAL
+    dealer = refresh_scheduler.add(url, interval)
+    if run_now:
+        refresh_scheduler.run_now(url)
+    return dealer.to_dict()
+
+
+@app.delete("/schedule")
+async def unschedule_dealer(url: str = Query(description="The dealership website URL")):
+    """Stop refreshing a dealership"""
+    if not refresh_scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler is not running")
+    if not refresh_scheduler.remove(url):
+        raise HTTPException(status_code=404, detail=f"{url} is not scheduled")
+    return {"url": url, "scheduled": False}
 
+
+@app.get("/inventory/dealerships")
+def list_stored_dealerships():
+    """Dealerships with stored inventory and when each was last scraped"""
+    if not inventory_store:
+        raise HTTPException(status_code=503, detail="Inventory store is disabled")
+    return {"dealerships": inventory_store.list_dealerships()}
+
+
+@app.get("/inventory")
+def get_stored_inventory(
+    request: Request,
+    url: str = Query(
+        default="https://www.usautosofdallas.com/",
+        description="The dealership website URL"
+    ),
+    llm_format: bool = Query(
+        default=True,
+        description="Return data in LLM-friendly format"
+    ),
+    include_removed: bool = Query(
+        default=False,
+        description="Also return vehicles that have disappeared from the site"
+    )
+):
+    """
+    Stored inventory for a dealership, served without launching a browser
+
+    Args:
+        url: The dealership website URL
+        llm_format: Whether to return data in LLM-friendly format (default: True)
+        include_removed: Include vehicles no longer listed (default: False)
+
+    Returns:
+        JSON response with the stored vehicles, or 304 when If-None-Match
+        matches the ETag
+    """
+    if not inventory_store:
+        raise HTTPException(status_code=503, detail="Inventory store is disabled")
+
+    vehicles = inventory_store.get_inventory(url, include_removed=include_removed)
+    if not vehicles:
+        raise HTTPException(status_code=404, detail=f"No stored inventory for {url}")
+
+    result = ScraperResponse(
+        success=True,
+        total_cars=len(vehicles),
+        cars=[vehicle.car for vehicle in vehicles],
+        scraped_at=max(vehicle.scraped_at for vehicle in vehicles)
+    )
+    removed = sorted(vehicle.vehicle_key for vehicle in vehicles if vehicle.removed_at)
+    headers = {"ETag": serialization.make_etag(result.content_hash(), "inventory", llm_format, removed)}
+    if serialization.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return serialization.not_modified(headers)
+
+    if llm_format:
+        body = serialization.encode_llm_format(result)
+    else:
+        body = serialization.dumps({
+            "dealership": vehicles[0].dealership,
+            "total_cars": len(vehicles),
+            "vehicles": [vehicle.model_dump(exclude_none=True) for vehicle in vehicles]
+        })
+    return serialization.json_response(body, request.headers.get("accept-encoding"), headers=headers)
+
+
+@app.get("/inventory/vehicle")
+def get_stored_vehicle(
+    url: str = Query(description="The dealership website URL"),
+    key: str = Query(description="Vehicle key, e.g. vin:1HGCM82633A004352 or stock:343106")
+):
+    """A single stored vehicle by its key"""
+    if not inventory_store:
+        raise HTTPException(status_code=503, detail="Inventory store is disabled")
+    vehicle = inventory_store.get_vehicle(url, key)
+    if not vehicle:
+        raise HTTPException(status_code=404, detail=f"No stored vehicle {key} for {url}")
+    return vehicle.model_dump(exclude_none=True)
+
+
+def _inspect_page(url: str) -> dict:
+    """Load a page in the browser and summarize what the scraper sees (blocking)"""
+    scraper = CarDealerScraper(headless=True, driver_pool=driver_pool)
+
+    logger.info("Initializing driver")
+    scraper._init_driver()
+    try:
         logger.info(f"Navigating to {url}")
         scraper.driver.get(url)
-        time.sleep(5)  # Wait for page to load
+        wait_time = scraper._wait_for_inventory()
+        stats = page_stats(scraper.driver)
 
         logger.info("Getting page source")
         page_source = scraper.driver.page_source
-        soup = BeautifulSoup(page_source, 'lxml')
+    finally:
+        # Always hand the driver back, pooled slots are limited
+        scraper._close_driver()
 
-        page_title = soup.find('title')
-        title_text = page_title.get_text() if page_title else "No title"
+    # Only a summary is needed, so skip building a BeautifulSoup tree
+    root = parse_document(page_source)
 
-        # Find all links
-        all_links = [a.get('href') for a in soup.find_all('a', href=True)][:20]
+    title_text = root.findtext('.//title') or "No title"
 
-        # Find common divs
-        divs_with_class = [str(div.get('class')) for div in soup.find_all('div', class_=True)][:20]
+    # Find all links
+    all_links = root.xpath('//a/@href')[:20]
 
-        scraper._close_driver()
+    # Find common divs
+    divs_with_class = [str(classes.split()) for classes in root.xpath('//div/@class')[:20]]
 
-        return {
-            "page_title": title_text,
-            "page_length": len(page_source),
-            "sample_links": all_links,
-            "sample_div_classes": list(set(divs_with_class)),
-            "html_snippet": page_source[:1000]
-        }
+    return {
+        "page_title": title_text,
+        "page_length": len(page_source),
+        "wait_time": wait_time,
+        "resource_blocking": config.BROWSER_BLOCK_RESOURCES,
+        "page_stats": stats,
+        "sample_links": all_links,
+        "sample_div_classes": list(set(divs_with_class)),
+        "html_snippet": page_source[:1000]
+    }
+
+
+@app.get("/debug")
+async def debug_page(url: str = "https://www.usautosofdallas.com/inventory"):
+    """
+    Debug endpoint to see what the scraper is actually retrieving
+    """
+    import traceback
+    try:
+        logger.info("Starting debug endpoint")
+        return await scrape_executor.run(_inspect_page, url)
+    except ExecutorSaturated as e:
+        raise _capacity_error(e)
     except Exception as e:
         logger.error(f"Debug endpoint error: {e}", exc_info=True)
         return {
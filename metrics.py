@@ -0,0 +1,275 @@
+"""
+Prometheus-style metrics, rendered in the text exposition format for /metrics.
+
+A small in-process implementation (counters, histograms and callback gauges)
+so the API doesn't need prometheus_client. Metrics are process-local; every
+update takes the metric's lock, so they can be used from scrape threads.
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds, from per-card parsing up to full browser scrapes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Resident memory buckets in bytes, 64 MB to 4 GB
+MEMORY_BUCKETS = tuple(mb * 1024 * 1024 for mb in (64, 128, 256, 384, 512, 768, 1024, 1536, 2048, 3072, 4096))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base for a named metric family with optional labels"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every labelled value of this metric"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the with-block takes"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    Gauge or counter whose values are read from a function at scrape time
+
+    The function returns a number, or a dict mapping label value tuples to
+    numbers for labelled metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        fn: Callable[[], object],
+        labelnames: Iterable[str] = (),
+        type: str = "gauge"
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+        self.type = type
+
+    def samples(self) -> List[str]:
+        try:
+            values = self.fn()
+        except Exception:
+            return []
+        if values is None:
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        lines = []
+        for key, value in sorted(values.items()):
+            key = key if isinstance(key, tuple) else (key,)
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# Content type of the text exposition format (the response adds the charset)
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "scraper_stage_seconds",
+    "Time spent in each scrape stage (driver_startup, driver_acquire, navigation, readiness_wait, "
+    "http_fetch, html_parse, structured_extraction, card_extraction, detail_fetch, enrichment, serialization)",
+    ["stage"]
+))
+SCRAPES = REGISTRY.register(Counter(
+    "scraper_scrapes_total",
+    "Completed scrapes by fetch mode and outcome",
+    ["fetch_mode", "outcome"]
+))
+SCRAPE_PEAK_RSS = REGISTRY.register(Histogram(
+    "scraper_scrape_peak_rss_bytes",
+    "Highest resident memory of the API process sampled during a scrape",
+    ["fetch_mode"],
+    buckets=MEMORY_BUCKETS
+))
+SCRAPE_SECONDS = REGISTRY.register(Histogram(
+    "scraper_scrape_seconds",
+    "End-to-end scrape_inventory duration",
+    ["fetch_mode"]
+))
+VEHICLES = REGISTRY.register(Counter(
+    "scraper_vehicles_total",
+    "Vehicles returned by completed scrapes"
+))
+ERRORS = REGISTRY.register(Counter(
+    "scraper_errors_total",
+    "Errors by stage and exception type",
+    ["stage", "type"]
+))
+ENRICHED_VEHICLES = REGISTRY.register(Counter(
+    "scraper_enrichment_vehicles_total",
+    "Vehicles considered for detail-page enrichment by outcome (cached, fetched, failed, skipped)",
+    ["outcome"]
+))
+FETCHES = REGISTRY.register(Counter(
+    "scraper_fetches_total",
+    "Dealer page loads through the fetch policy by kind (http, browser) and outcome "
+    "(success, retried, failed, rejected by an open circuit)",
+    ["kind", "outcome"]
+))
+RATE_LIMIT_WAIT = REGISTRY.register(Histogram(
+    "scraper_rate_limit_wait_seconds",
+    "Time fetches waited for their host's rate limit",
+    ["kind"]
+))
+REQUESTS = REGISTRY.register(Counter(
+    "scraper_http_requests_total",
+    "API requests by endpoint and status code",
+    ["endpoint", "status"]
+))
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+def record_error(stage: str, error: BaseException):
+    ERRORS.inc(stage=stage, type=type(error).__name__)
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident memory of this process, or None where /proc isn't available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
@@ -1,6 +1,56 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+import hashlib
+import math
+import re
+import pydantic_core
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Dict, Literal, Optional, List
 from datetime import datetime
+from urllib.parse import urlsplit
+
+# Compact LLM table: columns in priority order, highest first. When a budget
+# is set, long text columns are shortened first, then columns are dropped from
+# the end of this list (never the core ones), then vehicles from the end.
+COMPACT_COLUMNS = [
+    ("year", lambda car: car.year),
+    ("make", lambda car: car.make),
+    ("model", lambda car: car.model),
+    ("price", lambda car: car.price),
+    ("mileage", lambda car: car.mileage),
+    ("stock", lambda car: car.stock_number),
+    ("vin", lambda car: car.vin),
+    ("url", lambda car: car.listing_url),
+    ("ext_color", lambda car: car.exterior_color),
+    ("int_color", lambda car: car.interior_color),
+    ("trans", lambda car: car.transmission),
+    ("drive", lambda car: car.drivetrain),
+    ("fuel", lambda car: car.fuel_type),
+    ("engine", lambda car: car.engine),
+    ("body", lambda car: car.body_style),
+    ("features", lambda car: "; ".join(car.features)),
+    ("description", lambda car: car.description),
+    ("image", lambda car: car.image_urls[0] if car.image_urls else None),
+]
+COMPACT_CORE_COLUMNS = ("year", "make", "model", "price", "mileage")
+# Longest value kept for free-text columns once the budget is tight
+COMPACT_TEXT_LIMITS = {"description": 100, "features": 80}
+# Rough size of a token in characters, for token budgets
+CHARS_PER_TOKEN = 4
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _compact_value(value) -> str:
+    """One table cell: numbers without trailing .0, text on one line with no column separators"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else f"{value:.2f}"
+    return _WHITESPACE_RE.sub(" ", str(value)).replace("|", "/").strip()
+
+
+# CarListing fields that describe how a vehicle was scraped rather than the
+# vehicle itself; left out of change detection and content hashes
+LISTING_METADATA_FIELDS = frozenset({"source"})
 
 
 class CarListing(BaseModel):
@@ -23,6 +73,9 @@ class CarListing(BaseModel):
     features: List[str] = Field(default_factory=list)
     image_urls: List[str] = Field(default_factory=list)
     listing_url: Optional[str] = None
+    # Extraction strategy that produced the listing: json_ld, inline_json,
+    # dws_feed, dom_card or detail_page
+    source: Optional[str] = None
 
     # LLM-friendly summary
     def to_llm_summary(self) -> str:
@@ -56,6 +109,89 @@ class CarListing(BaseModel):
         return summary
 
 
+class FieldChange(BaseModel):
+    """Old and new value of one CarListing field"""
+    old: Any = None
+    new: Any = None
+
+
+class VehicleChange(BaseModel):
+    """A vehicle whose details changed between two scrapes"""
+    vehicle_key: str
+    car: CarListing
+    changes: Dict[str, FieldChange]
+
+    def to_llm_summary(self) -> str:
+        """Vehicle summary followed by what changed"""
+        parts = []
+        for name, change in self.changes.items():
+            if name == "price" and change.old is not None and change.new is not None:
+                parts.append(f"price ${change.old:,.2f} -> ${change.new:,.2f}")
+            elif name in ("features", "image_urls"):
+                parts.append(f"{name} updated")
+            else:
+                parts.append(f"{name} {change.old} -> {change.new}")
+        return f"{self.car.to_llm_summary()} | Changed: {'; '.join(parts)}"
+
+
+class InventoryDelta(BaseModel):
+    """Vehicles added, removed and modified since the previous scrape"""
+    dealership: str
+    scraped_at: str
+    previous_scraped_at: Optional[str] = None
+    added: List[CarListing] = Field(default_factory=list)
+    removed: List[CarListing] = Field(default_factory=list)
+    modified: List[VehicleChange] = Field(default_factory=list)
+    unchanged: int = 0
+
+    def to_llm_format(self) -> dict:
+        """Only the changes, formatted for LLM consumption"""
+        since = f" since {self.previous_scraped_at}" if self.previous_scraped_at else " (first scrape)"
+        return {
+            "summary": (
+                f"{len(self.added)} new, {len(self.removed)} removed, "
+                f"{len(self.modified)} changed, {self.unchanged} unchanged vehicles{since}"
+            ),
+            "scraped_at": self.scraped_at,
+            "previous_scraped_at": self.previous_scraped_at,
+            "added": [
+                {"summary": car.to_llm_summary(), "full_details": car.model_dump(exclude_none=True)}
+                for car in self.added
+            ],
+            "removed": [{"summary": car.to_llm_summary(), "listing_url": car.listing_url} for car in self.removed],
+            "modified": [
+                {
+                    "summary": change.to_llm_summary(),
+                    "changes": {name: diff.model_dump() for name, diff in change.changes.items()}
+                }
+                for change in self.modified
+            ]
+        }
+
+
+class PageResult(BaseModel):
+    """One inventory page visited during a scrape"""
+    url: str
+    vehicles: int
+    seconds: float
+    # Browser pages only: bytes transferred and page load time from the Performance API
+    bytes: Optional[int] = None
+    load_time: Optional[float] = None
+
+
+class EnrichmentResult(BaseModel):
+    """What detail-page enrichment did during a scrape"""
+    depth: str
+    # Vehicles with a detail page that were missing fields at this depth
+    candidates: int = 0
+    cached: int = 0
+    fetched: int = 0
+    failed: int = 0
+    # Left unenriched by the page or time budget
+    skipped: int = 0
+    seconds: float = 0.0
+
+
 class ScraperResponse(BaseModel):
     """Response model for the scraper API"""
     success: bool
@@ -63,6 +199,43 @@ class ScraperResponse(BaseModel):
     cars: List[CarListing]
     scraped_at: str = Field(default_factory=lambda: datetime.now().isoformat())
     errors: List[str] = Field(default_factory=list)
+    fetch_mode: Optional[str] = None
+    wait_time: Optional[float] = None
+    pages_crawled: int = 0
+    pages: List[PageResult] = Field(default_factory=list)
+    # True when max_pages or max_vehicles stopped the crawl before the end
+    truncated: bool = False
+    # Set when detail-page enrichment was requested
+    enrichment: Optional[EnrichmentResult] = None
+    # The vehicles as parsed from the listing, before enrichment; the inventory
+    # store keeps these so enriched and plain scrapes share one snapshot
+    listing_cars: Optional[List[CarListing]] = Field(default=None, exclude=True)
+    # Changes against the previous stored snapshot; only returned in delta mode
+    delta: Optional[InventoryDelta] = Field(default=None, exclude=True)
+    # Seconds spent per scrape stage; only returned when timings are requested
+    timings: Optional[Dict[str, float]] = Field(default=None, exclude=True)
+    # Highest API process RSS sampled during the scrape, in MB; returned with timings
+    peak_memory_mb: Optional[float] = Field(default=None, exclude=True)
+    _content_hash: Optional[str] = PrivateAttr(default=None)
+
+    def content_hash(self) -> str:
+        """
+        Hash of the vehicle set, for ETags
+
+        Independent of vehicle order and of scrape metadata such as scraped_at,
+        so re-scraping an unchanged inventory gives the same hash. Computed once
+        per response, so cached responses hash for free.
+        """
+        if self._content_hash is None:
+            digest = hashlib.sha1(f"{self.success}|{self.truncated}".encode("utf-8"))
+            for car_hash in sorted(hashlib.sha1(pydantic_core.to_json(car, exclude=LISTING_METADATA_FIELDS)).digest() for car in self.cars):
+                digest.update(car_hash)
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def stored_cars(self) -> List[CarListing]:
+        """Vehicles to diff and store: the listing's, whether or not they were enriched"""
+        return self.listing_cars if self.listing_cars is not None else self.cars
 
     # LLM-friendly format
     def to_llm_format(self) -> dict:
@@ -79,3 +252,147 @@ class ScraperResponse(BaseModel):
             ],
             "errors": self.errors if self.errors else None
         }
+
+    def to_compact_llm_format(
+        self,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        include_images: bool = False,
+        include_description: bool = False
+    ) -> dict:
+        """
+        Vehicles as a pipe-delimited table, one line per car, fitted to a size budget
+
+        Columns nobody has a value for are left out, and listing URLs that share
+        a host are written relative to url_base. With a budget, the table is
+        fitted by shortening free text, then dropping the lowest-priority
+        columns, then leaving out vehicles from the end.
+
+        Args:
+            max_chars: Most characters the table may use
+            max_tokens: Most tokens, estimated at CHARS_PER_TOKEN characters each
+            include_images: Add a column with each car's first image URL
+            include_description: Add the (possibly shortened) description
+
+        Returns:
+            Dict with the table, its columns and how many vehicles were included
+        """
+        budgets = [b for b in (max_chars, max_tokens * CHARS_PER_TOKEN if max_tokens else None) if b]
+        budget = min(budgets) if budgets else None
+
+        columns = [
+            (name, get) for name, get in COMPACT_COLUMNS
+            if (name != "image" or include_images) and (name != "description" or include_description)
+        ]
+        values = {name: [_compact_value(get(car)) for car in self.cars] for name, get in columns}
+
+        url_base = None
+        hosts = {"{0}://{1}".format(*urlsplit(url)[:2]) for url in values.get("url", []) if url}
+        if len(hosts) == 1:
+            url_base = hosts.pop()
+            values["url"] = [url[len(url_base):] if url.startswith(url_base) else url for url in values["url"]]
+
+        names = [name for name, _ in columns if any(values[name])]
+        shortened, dropped = [], []
+        rows = len(self.cars)
+
+        def render(count: int) -> str:
+            lines = ["|".join(names)]
+            lines.extend("|".join(values[name][i] for name in names) for i in range(count))
+            return "\n".join(lines)
+
+        table = render(rows)
+        if budget:
+            for name, limit in COMPACT_TEXT_LIMITS.items():
+                if len(table) <= budget:
+                    break
+                if name in names and any(len(v) > limit for v in values[name]):
+                    values[name] = [v if len(v) <= limit else v[:limit - 3].rstrip() + "..." for v in values[name]]
+                    shortened.append(name)
+                    table = render(rows)
+
+            while len(table) > budget and names and names[-1] not in COMPACT_CORE_COLUMNS:
+                dropped.append(names.pop())
+                table = render(rows)
+
+            if len(table) > budget:
+                # Keep as many leading vehicles as fit under the header
+                size = len("|".join(names))
+                fitted = 0
+                for i in range(rows):
+                    size += 1 + len("|".join(values[name][i] for name in names))
+                    if size > budget:
+                        break
+                    fitted += 1
+                rows = fitted
+                table = render(rows)
+
+        summary = f"Found {self.total_cars} vehicles at the dealership"
+        if rows < len(self.cars):
+            summary += f", showing the first {rows}"
+        return {
+            "summary": summary,
+            "scraped_at": self.scraped_at,
+            "format": "pipe-delimited table, header row then one vehicle per line",
+            "columns": names,
+            "url_base": url_base,
+            "table": table,
+            "vehicles_included": rows,
+            "vehicles_omitted": len(self.cars) - rows,
+            "shortened_columns": shortened,
+            "dropped_columns": dropped,
+            "chars": len(table),
+            "estimated_tokens": math.ceil(len(table) / CHARS_PER_TOKEN),
+            "errors": self.errors if self.errors else None
+        }
+
+
+class StoredVehicle(BaseModel):
+    """A vehicle as saved in the inventory store"""
+    dealership: str
+    vehicle_key: str
+    first_seen: str
+    scraped_at: str
+    removed_at: Optional[str] = None
+    car: CarListing
+
+
+class BatchScrapeRequest(BaseModel):
+    """Request body for POST /scrape/batch"""
+    urls: List[str] = Field(min_length=1, description="Dealership website URLs to scrape")
+    llm_format: bool = True
+    headless: bool = True
+    fetch_mode: Literal["auto", "http", "browser"] = "auto"
+    # Crawl and scheduling limits; None uses the server defaults
+    max_detail_pages: Optional[int] = Field(default=None, ge=0, le=500)
+    max_pages: Optional[int] = Field(default=None, ge=1, le=200)
+    max_vehicles: Optional[int] = Field(default=None, ge=1)
+    force_refresh: bool = False
+    delta: bool = False
+    # With delta, compare with the stored inventory as of this ISO timestamp
+    since: Optional[str] = None
+    enrich: Literal["off", "specs", "full"] = "off"
+    enrich_max_pages: Optional[int] = Field(default=None, ge=0, le=500)
+    enrich_budget: Optional[float] = Field(default=None, gt=0, le=600)
+    concurrency: Optional[int] = Field(default=None, ge=1, description="Dealers scraped at the same time")
+    per_host_concurrency: Optional[int] = Field(default=None, ge=1, description="Concurrent scrapes per site")
+
+
+class ScrapeJob(BaseModel):
+    """An asynchronous scrape and, once finished, its response body"""
+    id: str
+    url: str
+    # queued, running, succeeded or failed
+    status: str
+    options: Dict[str, Any] = Field(default_factory=dict)
+    # Vehicles parsed so far
+    progress: int = 0
+    attempts: int = 0
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    callback_url: Optional[str] = None
+    # delivered, or failed with the last error
+    callback_status: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
@@ -0,0 +1,112 @@
+"""
+Process pool for CPU-bound HTML parsing.
+
+BeautifulSoup/lxml parsing and card extraction hold the GIL, so scrapes that
+finish together in one API process parse one after another on their scrape
+threads. With a ParsePool, inventory pages are parsed in worker processes
+instead: a worker takes the raw page source and sends back the page's
+listings serialized as JSON (see scraper.ParsedPage). Pages with more than
+chunk_size cards are split, and the remaining card chunks are parsed by
+several workers at once.
+
+Workers are started with the "spawn" method, so they don't inherit the API
+process's threads, browsers or sockets.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up():
+    """Import the parsing code in a fresh worker so the first scrape doesn't pay for it"""
+    import scraper  # noqa: F401
+
+
+class ParsePool:
+    """
+    Worker processes for parsing inventory pages
+
+    Thread-safe: scrape threads call run() and map() concurrently and their
+    tasks queue on the shared workers. A pool whose worker died is replaced on
+    the next call.
+    """
+
+    def __init__(self, workers: int = 2, chunk_size: int = 100):
+        self.workers = max(1, workers)
+        self.chunk_size = max(0, chunk_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counts = {"pages": 0, "chunks": 0, "failures": 0, "restarts": 0}
+
+    def start(self):
+        """Spawn the workers ahead of the first scrape"""
+        executor = self._get_executor()
+        for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+        logger.info(f"Started parse pool with {self.workers} workers")
+
+    def run(self, fn: Callable, *args):
+        """Run fn(*args) for one page in a worker and wait for its result"""
+        self._count("pages", 1)
+        return next(self._results([self._get_executor().submit(fn, *args)]))
+
+    def map(self, fn: Callable, items: List, *args) -> Iterator:
+        """
+        Run fn(item, *args) for every item across the workers
+
+        All items are submitted at once; results are yielded in item order,
+        each as soon as it and the ones before it are done.
+        """
+        self._count("chunks", len(items))
+        executor = self._get_executor()
+        return self._results([executor.submit(fn, item, *args) for item in items])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "chunk_size": self.chunk_size, **self._counts}
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _results(self, futures: list) -> Iterator:
+        try:
+            for future in futures:
+                yield future.result()
+        except BrokenProcessPool:
+            # A worker was killed (out of memory, signal): replace the whole pool
+            with self._lock:
+                broken, self._executor = self._executor, None
+                self._counts["failures"] += 1
+                self._counts["restarts"] += 1
+            if broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+            logger.warning("Parse worker died, restarting the parse pool")
+            raise
+        except Exception:
+            self._count("failures", 1)
+            raise
+        finally:
+            # Nothing left to wait for once the caller stops or a task failed
+            for future in futures:
+                future.cancel()
+
+    def _count(self, name: str, amount: int):
+        with self._lock:
+            self._counts[name] += amount
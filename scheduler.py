@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from cache import normalize_url
+from models import ScraperResponse
+from workers import ExecutorSaturated
+
+logger = logging.getLogger(__name__)
+
+# Longest the scheduler sleeps before re-checking which dealers are due
+POLL_INTERVAL = 30.0
+
+
+def parse_schedule(spec: str, default_interval: float) -> List[Tuple[str, float]]:
+    """
+    Dealers from a schedule spec: comma-separated URLs, each optionally
+    followed by |seconds for its own interval
+
+    Example: "https://a-dealer.com|600,https://b-dealer.com"
+
+    Entries without a URL or with an interval that isn't a positive number
+    are logged and skipped.
+    """
+    dealers = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        url, _, interval = item.partition("|")
+        url = url.strip()
+        try:
+            seconds = float(interval) if interval.strip() else default_interval
+        except ValueError:
+            seconds = None
+        if not url or seconds is None or not seconds > 0:
+            logger.warning(f"Skipping schedule entry {item!r}: expected URL or URL|seconds")
+            continue
+        dealers.append((url, seconds))
+    return dealers
+
+
+class ScheduledDealer:
+    """A tracked dealership and the outcome of its last refresh"""
+
+    def __init__(self, url: str, interval: float):
+        self.url = url
+        self.interval = interval
+        self.next_run = time.monotonic()
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_started: Optional[str] = None
+        self.last_finished: Optional[str] = None
+        self.last_status: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_vehicles: Optional[int] = None
+        self.last_seconds: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "interval": self.interval,
+            "running": self.running,
+            "next_run_in": None if self.running else round(max(0.0, self.next_run - time.monotonic()), 1),
+            "runs": self.runs,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_started": self.last_started,
+            "last_finished": self.last_finished,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_vehicles": self.last_vehicles,
+            "last_seconds": self.last_seconds
+        }
+
+
+class RefreshScheduler:
+    """
+    Periodically re-scrapes tracked dealerships so API reads hit warm data
+
+    refresh(url, ttl) runs one scrape and returns its result; it is expected to
+    write the result to the response cache (fresh for ttl seconds) and the
+    inventory store. Each dealer runs on its own interval with +/- jitter, at
+    most `concurrency` refreshes run at once, and repeated failures double the
+    delay up to max_backoff. A full scrape queue defers a refresh without
+    counting as a failure.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[str, float], Awaitable[ScraperResponse]],
+        concurrency: int = 1,
+        jitter: float = 0.1,
+        max_backoff: float = 3600.0
+    ):
+        self.refresh = refresh
+        self.concurrency = max(1, concurrency)
+        self.jitter = max(0.0, min(jitter, 1.0))
+        self.max_backoff = max_backoff
+        self._dealers: Dict[str, ScheduledDealer] = {}
+        self._limit: asyncio.Semaphore = None
+        self._wakeup: asyncio.Event = None
+        self._task: asyncio.Task = None
+        self._running = set()
+
+    def add(self, url: str, interval: float) -> ScheduledDealer:
+        """Track a dealership, or change its interval; new dealers are first refreshed within one jittered spread"""
+        key = normalize_url(url)
+        dealer = self._dealers.get(key)
+        if dealer:
+            dealer.interval = interval
+            if not dealer.running:
+                dealer.next_run = min(dealer.next_run, time.monotonic() + self._jittered(interval))
+        else:
+            dealer = self._dealers[key] = ScheduledDealer(url, interval)
+            # Spread first refreshes so a restart doesn't scrape every dealer at once
+            dealer.next_run = time.monotonic() + random.uniform(0, self.jitter * interval)
+            logger.info(f"Scheduled {url} every {interval:.0f}s")
+        self._wake()
+        return dealer
+
+    def remove(self, url: str) -> bool:
+        """Stop tracking a dealership; a refresh already running finishes"""
+        removed = self._dealers.pop(normalize_url(url), None) is not None
+        if removed:
+            logger.info(f"Unscheduled {url}")
+        return removed
+
+    def get(self, url: str) -> Optional[ScheduledDealer]:
+        return self._dealers.get(normalize_url(url))
+
+    def run_now(self, url: str) -> Optional[ScheduledDealer]:
+        """Make a tracked dealer due immediately"""
+        dealer = self._dealers.get(normalize_url(url))
+        if dealer and not dealer.running:
+            dealer.next_run = time.monotonic()
+            self._wake()
+        return dealer
+
+    def start(self):
+        self._limit = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(), name="refresh-scheduler")
+        logger.info(f"Started refresh scheduler with {len(self._dealers)} dealers")
+
+    async def shutdown(self):
+        tasks = [task for task in (self._task, *self._running) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running.clear()
+
+    def stats(self) -> dict:
+        dealers = list(self._dealers.values())
+        return {
+            "dealers": len(dealers),
+            "running": sum(1 for dealer in dealers if dealer.running),
+            "failing": sum(1 for dealer in dealers if dealer.consecutive_failures),
+            "concurrency": self.concurrency
+        }
+
+    def status(self) -> dict:
+        """Scheduler settings and every dealer's state, soonest due first"""
+        dealers = sorted(self._dealers.values(), key=lambda dealer: (not dealer.running, dealer.next_run))
+        return {
+            "concurrency": self.concurrency,
+            "jitter": self.jitter,
+            "max_backoff": self.max_backoff,
+            "dealers": [dealer.to_dict() for dealer in dealers]
+        }
+
+    def _wake(self):
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _next_delay(self, dealer: ScheduledDealer) -> float:
+        if not dealer.consecutive_failures:
+            return self._jittered(dealer.interval)
+        backoff = dealer.interval * 2 ** min(dealer.consecutive_failures, 16)
+        return self._jittered(min(backoff, max(self.max_backoff, dealer.interval)))
+
+    async def _loop(self):
+        while True:
+            now = time.monotonic()
+            for dealer in list(self._dealers.values()):
+                if not dealer.running and dealer.next_run <= now:
+                    dealer.running = True
+                    task = asyncio.create_task(self._run(dealer))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+
+            waiting = [dealer.next_run for dealer in self._dealers.values() if not dealer.running]
+            delay = min([POLL_INTERVAL] + [max(0.0, due - now) for due in waiting])
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, dealer: ScheduledDealer):
+        try:
+            async with self._limit:
+                # Keep the result fresh until just after the next refresh should land
+                ttl = dealer.interval * (1 + self.jitter) + POLL_INTERVAL
+                dealer.last_started = datetime.now().isoformat()
+                started = time.monotonic()
+                try:
+                    result = await self.refresh(dealer.url, ttl)
+                except ExecutorSaturated as e:
+                    logger.info(f"Scrape queue full, refresh of {dealer.url} deferred {e.retry_after}s")
+                    dealer.next_run = time.monotonic() + e.retry_after
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._record(dealer, started, error=str(e))
+                else:
+                    error = None if result.success else "; ".join(result.errors) or "Scrape failed"
+                    self._record(dealer, started, error=error, vehicles=result.total_cars)
+                dealer.next_run = time.monotonic() + self._next_delay(dealer)
+        finally:
+            dealer.running = False
+            self._wake()
+
+    def _record(self, dealer: ScheduledDealer, started: float, error: Optional[str] = None, vehicles: int = None):
+        dealer.runs += 1
+        dealer.last_finished = datetime.now().isoformat()
+        dealer.last_seconds = round(time.monotonic() - started, 3)
+        dealer.last_vehicles = vehicles
+        dealer.last_error = error
+        if error:
+            dealer.failures += 1
+            dealer.consecutive_failures += 1
+            dealer.last_status = "failed"
+            logger.warning(
+                f"Scheduled refresh of {dealer.url} failed ({dealer.consecutive_failures} in a row): {error}"
+            )
+        else:
+            dealer.consecutive_failures = 0
+            dealer.last_status = "succeeded"
+            logger.info(f"Refreshed {dealer.url}: {vehicles} vehicles in {dealer.last_seconds}s")
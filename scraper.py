@@ -1,104 +1,480 @@
 import logging
+import queue
 import re
-from typing import List, Optional
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import pydantic_core
+from bs4 import BeautifulSoup, Comment
+from pydantic import TypeAdapter
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from models import CarListing, ScraperResponse
+import config
+from browser import create_chrome_driver, page_stats
+from cache import normalize_url
+from driver_pool import DriverPool
+from enrichment import ENRICH_DEPTHS, DetailCache, merge_details, needs_enrichment
+from extraction import find_vehicle_elements, scan_card
+import fetch_policy
+from fetch_policy import CircuitOpen, FetchPolicy
+from html_scope import scope_inventory_page, strip_page
+from http_client import fetch_html
+import metrics
+from models import CarListing, EnrichmentResult, PageResult, ScraperResponse
+from parse_pool import ParsePool
+from storage import vehicle_key
+from structured_data import (
+    SOURCE_DWS_FEED, extract_page_data, feed_page_urls, feed_total, parse_json, vehicles_from_json
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How scrape_inventory retrieves the inventory page
+FETCH_MODES = ("auto", "http", "browser")
+
+# CarListing.source for vehicles parsed from the DOM; structured_data.py
+# defines the structured-data sources
+SOURCE_DOM_CARD = "dom_card"
+SOURCE_DETAIL_PAGE = "detail_page"
+
+# Spec labels on vehicle detail pages, lower-cased and without the colon. A
+# label is read from "Label: value" text or from a line of its own followed
+# by the value, which covers dt/dd, th/td and label/span layouts.
+DETAIL_SPEC_LABELS = {
+    "exterior": "exterior_color",
+    "exterior color": "exterior_color",
+    "ext. color": "exterior_color",
+    "ext color": "exterior_color",
+    "color": "exterior_color",
+    "interior": "interior_color",
+    "interior color": "interior_color",
+    "int. color": "interior_color",
+    "int color": "interior_color",
+    "transmission": "transmission",
+    "trans": "transmission",
+    "engine": "engine",
+    "drivetrain": "drivetrain",
+    "drive train": "drivetrain",
+    "drive type": "drivetrain",
+    "fuel": "fuel_type",
+    "fuel type": "fuel_type",
+    "body": "body_style",
+    "body style": "body_style",
+    "body type": "body_style",
+}
+DETAIL_SPEC_MAX_LENGTH = 80
+FEATURES_HEADING_RE = re.compile(r'^\s*(features|options|equipment|highlights)\b', re.I)
+DESCRIPTION_CLASS_RE = re.compile(r'description|comments', re.I)
+MAX_DETAIL_FEATURES = 50
+
+# CSS equivalent of the card discovery in _find_vehicle_elements, used to
+# decide when a rendered page is ready to parse
+VEHICLE_CARD_SELECTOR = (
+    "div[class*='dws-vehicle-item'], div.dws-vehicle-listing-item, "
+    "div[class*='dws-listing'], div[data-vehicle-id]"
+)
+READY_POLL_INTERVAL = 0.25
+
+# Numbers in card text and hrefs that look like vehicle detail pages
+NUMBER_RE = re.compile(r'\d+')
+PRICE_TEXT_RE = re.compile(r'\$?([\d,]+)')
+VEHICLE_LINK_RE = re.compile(r'/(vehicle|inventory|car)/')
+
+# Pagination controls: ?page_no=2 style links and "Page 1 of 4" status text
+PAGE_PARAM_RE = re.compile(r'[?&](page_no|page|pn|pg)=(\d+)', re.I)
+PAGE_STATUS_RE = re.compile(r'Page\s+(\d+)\s+of\s+(\d+)', re.I)
+
+# Infinite-scroll listings: DWS widget settings, or a visible "load more" control
+INFINITE_SCROLL_CHECK_JS = (
+    "return Array.from(document.querySelectorAll('script[type=\"application/json\"]'))"
+    ".some(s => /\"(enableInfiniteScroll|autoLoadMore)\":true/.test(s.textContent));"
+)
+LOAD_MORE_XPATH = (
+    "//button[contains(translate(normalize-space(.), 'LOADMORESHOW', 'loadmoreshow'), 'load more') "
+    "or contains(translate(normalize-space(.), 'LOADMORESHOW', 'loadmoreshow'), 'show more')] | "
+    "//a[contains(translate(normalize-space(.), 'LOADMORESHOW', 'loadmoreshow'), 'load more')]"
+)
+
+# Selenium's default page load timeout, restored after detail fetches
+DEFAULT_PAGE_LOAD_TIMEOUT = 300
+
+
+def _with_query_param(url: str, name: str, value) -> str:
+    """url with query parameter name set to value"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != name]
+    query.append((name, str(value)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+_CAR_LIST = TypeAdapter(List[CarListing])
+
+
+class ParsedPage:
+    """
+    Everything a crawl needs from one inventory page, from a single parse
+
+    Picklable so pages can be parsed in a ParsePool worker; the vehicles
+    cross the process boundary as JSON rather than as pickled models.
+    """
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        # Vehicles from JSON-LD and inline JSON, and the DWS feeds the page loads
+        self.structured: List[CarListing] = []
+        self.feeds: List[str] = []
+        # Vehicle cards found, the ones parsed so far, and the HTML of the
+        # rest in chunks for parse workers
+        self.cards = 0
+        self.cars: List[CarListing] = []
+        self.chunks: List[str] = []
+        # find_pager() result, and detail links for pages without cards
+        self.pager: Tuple[Dict[int, str], Optional[str], int, Optional[int]] = ({}, None, 1, None)
+        self.vehicle_links: List[str] = []
+        self.errors: List[str] = []
+        # Worker-side stage timings and (stage, exception type) of failures,
+        # recorded into the scrape by the API process
+        self.timings: Dict[str, float] = {}
+        self.error_types: List[Tuple[str, str]] = []
+
+    def add_chunk(self, chunk: "ParsedPage"):
+        """Fold a parsed card chunk into the page"""
+        self.cars.extend(chunk.cars)
+        self.errors.extend(chunk.errors)
+        self.error_types.extend(chunk.error_types)
+        for name, seconds in chunk.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["structured"] = pydantic_core.to_json(self.structured)
+        state["cars"] = pydantic_core.to_json(self.cars)
+        return state
+
+    def __setstate__(self, state):
+        state["structured"] = _CAR_LIST.validate_json(state["structured"])
+        state["cars"] = _CAR_LIST.validate_json(state["cars"])
+        self.__dict__.update(state)
+
+
+def find_pager(soup, page_url: str) -> Tuple[Dict[int, str], Optional[str], int, Optional[int]]:
+    """
+    Read an inventory page's pagination controls
+
+    Returns:
+        (absolute URLs of the DWS-style ?page_no=N links by page number, the
+        page query parameter, and the current and total pages from the
+        "Page 1 of N" status; total is None without a status)
+    """
+    links = {}
+    param = None
+    for link in soup.find_all('a', href=PAGE_PARAM_RE):
+        match = PAGE_PARAM_RE.search(link['href'])
+        param = param or match.group(1)
+        links.setdefault(int(match.group(2)), urljoin(page_url, link['href']))
+
+    current, total = 1, None
+    status = soup.find(string=PAGE_STATUS_RE)
+    if status:
+        match = PAGE_STATUS_RE.search(status)
+        current, total = int(match.group(1)), int(match.group(2))
+    return links, param, current, total
+
+
+def parse_page_source(page_source: str, page_url: str, base_url: str, chunk_size: int = 0) -> ParsedPage:
+    """Parse an inventory page in a parse worker process, see CarDealerScraper._parse_page_source"""
+    parser = CarDealerScraper()
+    page = parser._parse_page_source(page_source, page_url, base_url, chunk_size)
+    page.timings = parser._timings
+    page.error_types = parser._error_types
+    return page
+
+
+def parse_card_chunk(chunk_html: str, base_url: str) -> ParsedPage:
+    """Parse a chunk of vehicle card HTML in a parse worker process"""
+    parser = CarDealerScraper()
+    chunk = ParsedPage()
+    soup = parser._parse_html(chunk_html)
+    root = soup.body or soup
+    elements = root.find_all(True, recursive=False)
+    chunk.cards = len(elements)
+    parser._parse_vehicle_cards(elements, base_url, chunk.cars, chunk.errors)
+    chunk.timings = parser._timings
+    chunk.error_types = parser._error_types
+    return chunk
+
 
 class CarDealerScraper:
     """Scraper for US Auto Dealers websites"""
 
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        driver_pool: Optional[DriverPool] = None,
+        ready_timeout: float = config.READY_TIMEOUT,
+        detail_concurrency: int = config.DETAIL_CONCURRENCY,
+        detail_timeout: float = config.DETAIL_TIMEOUT,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        vehicle_callback: Optional[Callable[[CarListing], None]] = None,
+        detail_cache: Optional[DetailCache] = None,
+        policy: Optional[FetchPolicy] = None,
+        parse_pool: Optional[ParsePool] = None
+    ):
         self.headless = headless
+        self.driver_pool = driver_pool
+        self.ready_timeout = ready_timeout
+        self.ready_stable_seconds = config.READY_STABLE_SECONDS
+        self.ready_empty_grace = config.READY_EMPTY_GRACE
+        self.detail_concurrency = detail_concurrency
+        self.detail_timeout = detail_timeout
+        # Called with the number of vehicles parsed so far as a scrape advances
+        self.progress_callback = progress_callback
+        # Called with each distinct vehicle as soon as it is parsed, possibly
+        # from page or detail worker threads
+        self.vehicle_callback = vehicle_callback
+        # Parsed detail pages shared between scrapes, for enrichment
+        self.detail_cache = detail_cache
+        # Per-host rate limits, retries and circuit breakers for every page load
+        self.policy = policy or fetch_policy.POLICY
+        # Worker processes for page parsing; None parses on the scrape thread
+        self.parse_pool = parse_pool
+        # (stage, exception type) of parse failures, handed back by parse workers
+        self._error_types: List[Tuple[str, str]] = []
+        self._emit_lock = threading.Lock()
+        self._emitted = set()
+        self._emitted_count = 0
+        # Seconds per stage for the current scrape, summed across worker threads,
+        # and the highest process RSS sampled as stages finished
+        self._timings = {}
+        self._timings_lock = threading.Lock()
+        self._peak_rss = 0
+        # Crawl limits, set per scrape_inventory call
+        self._max_pages = config.MAX_PAGES
+        self._max_vehicles = None
+        self._truncated = False
+        # Set when a paged inventory feed already covered every listing page
+        self._listing_complete = False
+        # Set by iter_inventory when its consumer stops reading
+        self._stop = None
         self.driver = None
+        self._pooled = None
 
     def _init_driver(self):
-        """Initialize Selenium WebDriver"""
-        import os
-        import shutil
-
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-
-        # Check if running in Railway/Nixpacks environment
-        chrome_bin = shutil.which("chromium") or shutil.which("chromium-browser") or shutil.which("google-chrome")
-
-        # Try multiple possible chromedriver locations
-        chromedriver_path = (
-            shutil.which("chromedriver") or
-            shutil.which("chromium-chromedriver") or
-            shutil.which("chromedriver-chromium") or
-            "/usr/bin/chromedriver" if os.path.exists("/usr/bin/chromedriver") else None or
-            "/usr/lib/chromium-browser/chromedriver" if os.path.exists("/usr/lib/chromium-browser/chromedriver") else None
-        )
+        """Initialize Selenium WebDriver, checking one out of the pool when available"""
+        with self._stage("driver_acquire"):
+            if self._shared_pool():
+                self._pooled = self.driver_pool.acquire()
+                self.driver = self._pooled.driver
+            else:
+                self.driver = create_chrome_driver(self.headless)
 
-        logger.info(f"Chrome binary detected: {chrome_bin}")
-        logger.info(f"ChromeDriver detected: {chromedriver_path}")
-
-        if chrome_bin:
-            logger.info(f"Using system Chrome at: {chrome_bin}")
-            chrome_options.binary_location = chrome_bin
-
-        # If we found system chromedriver, use it directly
-        if chromedriver_path and os.path.exists(chromedriver_path):
-            logger.info(f"Using system ChromeDriver at: {chromedriver_path}")
-            service = Service(chromedriver_path)
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        # If we have chromium installed (Railway), try without explicit service
-        elif chrome_bin:
-            logger.info("System Chrome found but no chromedriver in PATH, trying default initialization")
-            try:
-                self.driver = webdriver.Chrome(options=chrome_options)
-            except Exception as e:
-                logger.error(f"Default initialization failed: {e}")
-                # Fallback to webdriver-manager as last resort
-                logger.info("Trying webdriver-manager as fallback")
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        # Local development - use webdriver-manager
-        else:
-            logger.info("No system Chrome found, using webdriver-manager")
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+    def _shared_pool(self) -> Optional[DriverPool]:
+        """The shared driver pool, if its browsers match this scraper's headless setting"""
+        if self.driver_pool and self.headless == self.driver_pool.headless:
+            return self.driver_pool
+        return None
 
     def _close_driver(self):
-        """Close the WebDriver"""
-        if self.driver:
+        """Close the WebDriver, or hand it back to the pool for reuse"""
+        if self._pooled:
+            self.driver_pool.release(self._pooled)
+            self._pooled = None
+            self.driver = None
+        elif self.driver:
             self.driver.quit()
             self.driver = None
 
+    @contextmanager
+    def _stage(self, name: str):
+        """Time a scrape stage into the stage histogram and this scrape's timings"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_timing(name, time.perf_counter() - started)
+
+    def _add_timing(self, name: str, seconds: float):
+        """Record a stage's time and sample memory; stages are page-level, so this runs a few times per page"""
+        metrics.observe_stage(name, seconds)
+        rss = metrics.rss_bytes()
+        with self._timings_lock:
+            self._timings[name] = self._timings.get(name, 0.0) + seconds
+            if rss and rss > self._peak_rss:
+                self._peak_rss = rss
+
+    def _fetch_html(self, url: str, timeout: float = None) -> str:
+        with self._stage("http_fetch"):
+            return self.policy.call(url, lambda: fetch_html(url, timeout=timeout))
+
+    def _navigate(self, url: str, driver=None):
+        """Load url in the browser under the fetch policy"""
+        driver = driver or self.driver
+        with self._stage("navigation"):
+            self.policy.call(url, lambda: driver.get(url), kind="browser")
+
+    def _parse_html(self, page_source: str, scope: Optional[Callable[[str], str]] = None) -> BeautifulSoup:
+        """
+        Parse page source into a BeautifulSoup tree
+
+        Args:
+            scope: Cuts the page down to what the caller reads before the tree
+                is built (html_scope); skipped when PARSE_SCOPE is off
+        """
+        with self._stage("html_parse"):
+            if scope and config.PARSE_SCOPE:
+                page_source = scope(page_source)
+            return BeautifulSoup(page_source, 'lxml')
+
+    def _record_error(self, stage: str, error: BaseException):
+        metrics.record_error(stage, error)
+        self._error_types.append((stage, type(error).__name__))
+
+    def _parse_page(self, page_source: str, page_url: str, base_url: str) -> ParsedPage:
+        """Parse an inventory page, in the parse pool when there is one"""
+        if self.parse_pool is None:
+            return self._parse_page_source(page_source, page_url, base_url)
+        try:
+            page = self.parse_pool.run(
+                parse_page_source, page_source, page_url, base_url, self.parse_pool.chunk_size
+            )
+            # Stream the first chunk's vehicles while the workers parse the rest
+            stream_cards = not self._feed_replaces_cards(page)
+            if stream_cards:
+                self._emit_vehicles(page.cars)
+            for chunk in self.parse_pool.map(parse_card_chunk, page.chunks, base_url):
+                page.add_chunk(chunk)
+                if stream_cards:
+                    self._emit_vehicles(chunk.cars)
+            page.chunks = []
+        except Exception as e:
+            logger.warning(f"Parse pool failed for {page_url}, parsing in-process: {e}")
+            metrics.record_error("parse_pool", e)
+            return self._parse_page_source(page_source, page_url, base_url)
+
+        # Account for the worker's time and failures in this scrape
+        for name, seconds in page.timings.items():
+            self._add_timing(name, seconds)
+        for stage, error_type in page.error_types:
+            metrics.ERRORS.inc(stage=stage, type=error_type)
+        return page
+
+    def _parse_page_source(self, page_source: str, page_url: str, base_url: str, chunk_size: int = 0) -> ParsedPage:
+        """
+        Parse an inventory page: title, structured data, pager and vehicle cards
+
+        Args:
+            chunk_size: When set, only the first chunk_size cards are parsed and
+                the HTML of the rest is left in ParsedPage.chunks for parse workers
+        """
+        soup = self._parse_html(page_source, scope=scope_inventory_page)
+        try:
+            return self._read_page(soup, page_url, base_url, chunk_size)
+        finally:
+            # Break the tree's reference cycles now rather than at the next full GC
+            soup.decompose()
+
+    def _read_page(self, soup, page_url: str, base_url: str, chunk_size: int) -> ParsedPage:
+        page = ParsedPage()
+        title = soup.find('title')
+        page.title = title.get_text() if title else None
+
+        if config.STRUCTURED_DATA:
+            with self._stage("structured_extraction"):
+                page.structured, page.feeds = extract_page_data(soup, page_url)
+        page.pager = find_pager(soup, page_url)
+        if page.structured:
+            return page
+
+        vehicle_elements = self._find_vehicle_elements(soup)
+        page.cards = len(vehicle_elements)
+        if not vehicle_elements:
+            page.vehicle_links = self._find_vehicle_links(soup)
+            return page
+        if chunk_size and len(vehicle_elements) > chunk_size:
+            with self._stage("card_extraction"):
+                page.chunks = [
+                    "".join(str(element) for element in vehicle_elements[i:i + chunk_size])
+                    for i in range(chunk_size, len(vehicle_elements), chunk_size)
+                ]
+            vehicle_elements = vehicle_elements[:chunk_size]
+        self._parse_vehicle_cards(
+            vehicle_elements, base_url, page.cars, page.errors, emit=not self._feed_replaces_cards(page)
+        )
+        return page
+
+    @staticmethod
+    def _feed_replaces_cards(page: ParsedPage) -> bool:
+        """Whether a page's cards wait for its DWS feed, whose vehicles replace them when it has any"""
+        return bool(page.feeds) and config.DWS_FEED_FETCH
+
+    def _report_progress(self, vehicles: int):
+        """Tell progress_callback how many vehicles have been parsed so far"""
+        if self.progress_callback:
+            try:
+                self.progress_callback(vehicles)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    def _emit_vehicle(self, car: CarListing):
+        """Pass a newly parsed vehicle to vehicle_callback, skipping repeats and anything past max_vehicles"""
+        if not self.vehicle_callback or self._stopped():
+            return
+        with self._emit_lock:
+            key = vehicle_key(car)
+            if key is not None:
+                if key in self._emitted:
+                    return
+                self._emitted.add(key)
+            if self._max_vehicles and self._emitted_count >= self._max_vehicles:
+                return
+            self._emitted_count += 1
+        try:
+            self.vehicle_callback(car)
+        except Exception as e:
+            logger.warning(f"Vehicle callback failed: {e}")
+
+    def _emit_vehicles(self, cars: List[CarListing]):
+        for car in cars:
+            self._emit_vehicle(car)
+
     def _extract_number(self, text: str) -> Optional[int]:
         """Extract number from text"""
         if not text:
             return None
-        match = re.search(r'\d+', text.replace(',', ''))
+        match = NUMBER_RE.search(text.replace(',', ''))
         return int(match.group()) if match else None
 
     def _extract_price(self, text: str) -> Optional[float]:
         """Extract price from text"""
         if not text:
             return None
-        match = re.search(r'\$?([\d,]+)', text)
+        match = PRICE_TEXT_RE.search(text)
         if match:
             return float(match.group(1).replace(',', ''))
         return None
 
+    def _visible_text(self, element) -> str:
+        """Text of an element, skipping screen-reader copies hidden with the 'hide' class"""
+        parts = []
+        for text in element.find_all(string=True):
+            if isinstance(text, Comment):
+                continue
+            parent = text.parent
+            hidden = False
+            while parent is not None and parent is not element:
+                if 'hide' in (parent.get('class') or []):
+                    hidden = True
+                    break
+                parent = parent.parent
+            if not hidden and text.strip():
+                parts.append(text.strip())
+        return ''.join(parts)
+
     def _parse_vehicle_title(self, title: str) -> dict:
         """Parse vehicle title to extract year, make, model"""
         result = {"year": None, "make": None, "model": None}
@@ -126,239 +502,984 @@ class CarDealerScraper:
 
         return result
 
-    def scrape_inventory(self, url: str = "https://www.usautosofdallas.com/") -> ScraperResponse:
+    def scrape_inventory(
+        self,
+        url: str = "https://www.usautosofdallas.com/",
+        fetch_mode: str = "auto",
+        max_detail_pages: int = config.MAX_DETAIL_PAGES,
+        max_pages: int = config.MAX_PAGES,
+        max_vehicles: Optional[int] = config.MAX_VEHICLES or None,
+        enrich: str = "off",
+        enrich_max_pages: int = config.ENRICH_MAX_PAGES,
+        enrich_budget: float = config.ENRICH_BUDGET
+    ) -> ScraperResponse:
         """
         Scrape the entire inventory from the dealership website
 
         Args:
             url: The dealership website URL
+            fetch_mode: "http" parses the server-rendered HTML without a browser,
+                "browser" always uses Selenium, and "auto" tries HTTP first and
+                falls back to Selenium when the static HTML has no vehicle cards
+            max_detail_pages: Most vehicle detail pages to visit when the
+                inventory page has no cards and detail links are scraped instead
+            max_pages: Most inventory pages (or load-more rounds) to crawl
+            max_vehicles: Stop crawling once this many vehicles are found
+            enrich: Fill fields missing from listing cards from detail pages:
+                "off", "specs" (VIN, stock number, colours, drivetrain...) or
+                "full" (also features, description and more images)
+            enrich_max_pages: Most detail pages to fetch for enrichment
+            enrich_budget: Seconds after which no further detail pages are started
 
         Returns:
             ScraperResponse with all car listings
         """
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"fetch_mode must be one of {FETCH_MODES}, got {fetch_mode!r}")
+        if enrich not in ENRICH_DEPTHS:
+            raise ValueError(f"enrich must be one of {ENRICH_DEPTHS}, got {enrich!r}")
+
         errors = []
         cars = []
+        pages = []
+        used_mode = fetch_mode
+        self._max_pages = max(1, max_pages)
+        self._max_vehicles = max_vehicles
+        self._truncated = False
+        self._listing_complete = False
+        self._emitted = set()
+        self._emitted_count = 0
+        self._timings = {}
+        self._error_types = []
+        self._peak_rss = metrics.rss_bytes() or 0
+        started = time.perf_counter()
+
+        # Navigate to the inventory page
+        inventory_url = url.rstrip('/') + '/inventory'
+
+        # Fail fast for a host that keeps failing, before a browser is checked out
+        blocked = False
+        try:
+            self.policy.check(inventory_url)
+        except CircuitOpen as e:
+            logger.warning(f"Skipping scrape of {url}: {e}")
+            errors.append(f"Scraping error: {str(e)}")
+            blocked = True
+
+        if not blocked and fetch_mode in ("auto", "http"):
+            used_mode = "http"
+            try:
+                found = self._scrape_static(inventory_url, url, cars, errors, pages, fetch_mode, max_detail_pages)
+                if not found:
+                    if fetch_mode == "http":
+                        errors.append("No vehicles found in static HTML")
+                    else:
+                        logger.info("Static HTML has no vehicle cards, falling back to browser")
+                        used_mode = "browser"
+                        pages.clear()
+            except Exception as e:
+                logger.warning(f"HTTP fetch of {inventory_url} failed: {e}")
+                metrics.record_error("http_fetch", e)
+                if fetch_mode == "http" or isinstance(e, CircuitOpen):
+                    errors.append(f"Scraping error: {str(e)}")
+                else:
+                    used_mode = "browser"
+
+        wait_time = None
+        if used_mode == "browser" and not blocked:
+            wait_time = self._scrape_with_browser(inventory_url, url, cars, errors, pages, fetch_mode, max_detail_pages)
+
+        # The same car can show up on several pages while the lot changes under us
+        cars = self._dedupe(cars)
+        if self._max_vehicles and len(cars) > self._max_vehicles:
+            cars = cars[:self._max_vehicles]
+            self._truncated = True
+
+        enrichment = None
+        listing_cars = None
+        if enrich != "off":
+            # Enrichment fills VINs, which would change vehicle_key() between
+            # enriched and plain scrapes; the store keeps the listing's view
+            listing_cars = cars
+            cars, enrichment = self._enrich_vehicles(cars, url, fetch_mode, enrich, enrich_max_pages, enrich_budget)
+
+        logger.info(f"Successfully scraped {len(cars)} vehicles from {len(pages)} pages")
+
+        elapsed = time.perf_counter() - started
+        metrics.SCRAPES.inc(fetch_mode=used_mode, outcome="success" if cars else "empty")
+        metrics.SCRAPE_SECONDS.observe(elapsed, fetch_mode=used_mode)
+        metrics.VEHICLES.inc(len(cars))
+        if self._peak_rss:
+            metrics.SCRAPE_PEAK_RSS.observe(self._peak_rss, fetch_mode=used_mode)
+        timings = {name: round(seconds, 4) for name, seconds in self._timings.items()}
+        timings["total"] = round(elapsed, 4)
+
+        return ScraperResponse(
+            success=len(cars) > 0,
+            total_cars=len(cars),
+            cars=cars,
+            errors=errors,
+            fetch_mode=used_mode,
+            wait_time=wait_time,
+            pages_crawled=len(pages),
+            pages=pages,
+            truncated=self._truncated,
+            enrichment=enrichment,
+            listing_cars=listing_cars,
+            timings=timings,
+            peak_memory_mb=round(self._peak_rss / 1024 / 1024, 1) if self._peak_rss else None
+        )
+
+    def iter_inventory(
+        self,
+        url: str = "https://www.usautosofdallas.com/",
+        **options
+    ) -> Iterator[Union[CarListing, ScraperResponse]]:
+        """
+        Scrape like scrape_inventory, yielding each vehicle as soon as it is parsed
+
+        The scrape runs on a background thread. Distinct vehicles are yielded in
+        the order they are parsed, and the complete ScraperResponse is yielded
+        last. Closing the generator early stops the scrape at its next page.
+        Takes the same options as scrape_inventory.
+        """
+        events = queue.Queue()
+        done = object()
+        previous_callback = self.vehicle_callback
+        self.vehicle_callback = events.put
+        stop = self._stop = threading.Event()
 
+        def run():
+            try:
+                events.put(self.scrape_inventory(url, **options))
+            except Exception as e:
+                events.put(e)
+            finally:
+                self.vehicle_callback = previous_callback
+                self._stop = None
+                events.put(done)
+
+        threading.Thread(target=run, name="scrape-stream", daemon=True).start()
+        try:
+            while True:
+                item = events.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def _scrape_static(
+        self,
+        inventory_url: str,
+        base_url: str,
+        cars: List[CarListing],
+        errors: List[str],
+        pages: List[PageResult],
+        fetch_mode: str = "auto",
+        max_detail_pages: int = config.MAX_DETAIL_PAGES
+    ) -> bool:
+        """
+        Fetch the inventory page over pooled HTTP and parse its vehicle cards
+
+        Further pages found in the pagination controls are fetched
+        concurrently. In "http" mode a page without cards falls back to
+        fetching vehicle detail pages over HTTP as well.
+
+        Returns:
+            True if the static HTML produced vehicles
+        """
+        logger.info(f"Fetching {inventory_url} over HTTP")
+        started = time.monotonic()
+        page_source = self._fetch_html(inventory_url)
+        logger.info(f"Page source length: {len(page_source)} characters")
+        page = self._parse_page(page_source, inventory_url, base_url)
+
+        found = self._page_vehicles(page, cars, errors, follow_feed=True)
+        if not found:
+            if fetch_mode != "http":
+                return False
+            logger.info("No vehicle cards in static HTML, looking for vehicle detail links")
+            vehicle_links = page.vehicle_links[:max_detail_pages]
+            cars.extend(self._scrape_vehicle_details(base_url, vehicle_links, errors, fetch_mode))
+            return bool(vehicle_links)
+
+        self._report_progress(len(cars))
+        pages.append(PageResult(
+            url=inventory_url,
+            vehicles=found,
+            seconds=round(time.monotonic() - started, 3)
+        ))
+
+        if self._listing_complete:
+            return True
+        page_urls = self._page_urls(page.pager)
+        if page_urls and not self._reached_vehicle_limit(cars):
+            self._crawl_pages_http(page_urls, base_url, cars, errors, pages)
+        return True
+
+    def _crawl_pages_http(
+        self,
+        page_urls: List[str],
+        base_url: str,
+        cars: List[CarListing],
+        errors: List[str],
+        pages: List[PageResult]
+    ):
+        """Fetch and parse further inventory pages concurrently, keeping page order"""
+        def fetch_page(page_url):
+            started = time.monotonic()
+            page_cars, page_errors = [], []
+            if self._stopped():
+                return page_cars, page_errors, 0.0
+            page = self._parse_page(self._fetch_html(page_url), page_url, base_url)
+            self._page_vehicles(page, page_cars, page_errors)
+            return page_cars, page_errors, round(time.monotonic() - started, 3)
+
+        workers = max(1, min(config.PAGE_CONCURRENCY, len(page_urls)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page") as executor:
+            futures = [executor.submit(fetch_page, page_url) for page_url in page_urls]
+            for page_url, future in zip(page_urls, futures):
+                try:
+                    page_cars, page_errors, seconds = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching inventory page {page_url}: {e}")
+                    metrics.record_error("page_fetch", e)
+                    errors.append(f"Failed to fetch page {page_url}: {str(e)}")
+                    continue
+                cars.extend(page_cars)
+                errors.extend(page_errors)
+                self._report_progress(len(cars))
+                pages.append(PageResult(url=page_url, vehicles=len(page_cars), seconds=seconds))
+
+    def _page_urls(self, pager: tuple) -> List[str]:
+        """
+        URLs of the inventory pages after the current one, up to max_pages in total
+
+        Takes find_pager()'s pagination links (?page_no=2) and "Page 1 of N"
+        status, filling in page numbers the pager doesn't link to directly.
+        """
+        links, param, current, total = pager
+        links = dict(links)
+        if param and total:
+            template = next(iter(links.values()))
+            for number in range(current + 1, total + 1):
+                links.setdefault(number, _with_query_param(template, param, number))
+
+        last = current + self._max_pages - 1
+        if any(number > last for number in links):
+            self._truncated = True
+        return [links[number] for number in sorted(links) if current < number <= last]
+
+    def _stopped(self) -> bool:
+        return self._stop is not None and self._stop.is_set()
+
+    def _reached_vehicle_limit(self, cars: List[CarListing]) -> bool:
+        if self._stopped():
+            return True
+        if self._max_vehicles and len(cars) >= self._max_vehicles:
+            self._truncated = True
+            return True
+        return False
+
+    def _dedupe(self, cars: List[CarListing]) -> List[CarListing]:
+        """Drop repeat sightings of the same vehicle, keeping the first"""
+        seen = set()
+        unique = []
+        for car in cars:
+            key = vehicle_key(car)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(car)
+        return unique
+
+    def _scrape_with_browser(
+        self,
+        inventory_url: str,
+        url: str,
+        cars: List[CarListing],
+        errors: List[str],
+        pages: List[PageResult],
+        fetch_mode: str = "browser",
+        max_detail_pages: int = config.MAX_DETAIL_PAGES
+    ) -> Optional[float]:
+        """
+        Render the inventory page in Chrome and parse cards, or detail pages as a fallback
+
+        Infinite-scroll and "load more" listings are expanded in place, and
+        paginated listings are walked page by page in the same browser.
+
+        Returns:
+            Seconds spent waiting for the page to become ready
+        """
+        wait_time = None
         try:
             logger.info(f"Starting scrape of {url}")
             self._init_driver()
 
-            # Navigate to the inventory page
-            inventory_url = url.rstrip('/') + '/inventory'
             logger.info(f"Navigating to {inventory_url}")
-            self.driver.get(inventory_url)
+            started = time.monotonic()
+            self._navigate(inventory_url)
 
-            # Wait for page to load
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-            except Exception as e:
-                logger.warning(f"Timeout waiting for page load: {e}")
+            # Wait until vehicle cards have rendered, then parse the page once
+            wait_time = self._wait_for_inventory()
+            self._load_all_vehicles()
 
-            # Get page source and parse with BeautifulSoup
             page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'lxml')
+            page = self._parse_page(page_source, inventory_url, url)
 
             # Debug: Log page title to verify we got the right page
-            page_title = soup.find('title')
-            logger.info(f"Page title: {page_title.get_text() if page_title else 'No title found'}")
-
-            # Debug: Save HTML snippet for analysis
+            logger.info(f"Page title: {page.title if page.title is not None else 'No title found'}")
             logger.info(f"Page source length: {len(page_source)} characters")
 
-            # Wait a bit more for dynamic content to load
-            import time
-            time.sleep(3)
-
-            # Get fresh page source after wait
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'lxml')
-
-            # This site uses DWS (Dealer Website Solutions) framework
-            # Look for vehicle containers with dws classes
-            vehicle_elements = []
-
-            # Try DWS-specific selectors first
-            dws_vehicle_items = soup.find_all('div', class_=lambda x: x and 'dws-vehicle-item' in str(x))
-            if dws_vehicle_items:
-                logger.info(f"Found {len(dws_vehicle_items)} vehicles using DWS vehicle-item class")
-                vehicle_elements = dws_vehicle_items
-
-            # Try alternative DWS selectors
-            if not vehicle_elements:
-                dws_listings = soup.find_all('div', class_=lambda x: x and 'dws-listing' in str(x))
-                if dws_listings:
-                    logger.info(f"Found {len(dws_listings)} vehicles using DWS listing class")
-                    vehicle_elements = dws_listings
-
-            # Try finding by data attributes
-            if not vehicle_elements:
-                data_vehicle_elems = soup.find_all('div', attrs={'data-vehicle-id': True})
-                if data_vehicle_elems:
-                    logger.info(f"Found {len(data_vehicle_elems)} vehicles using data-vehicle-id attribute")
-                    vehicle_elements = data_vehicle_elems
+            found = self._page_vehicles(page, cars, errors, follow_feed=True)
 
             # If no specific vehicle cards found, try to find individual vehicle links
-            if not vehicle_elements:
+            if not found:
                 logger.info("No vehicle cards found, looking for vehicle detail links")
-                # Look for links that might lead to vehicle details
-                links = soup.find_all('a', href=re.compile(r'/(vehicle|inventory|car)/'))
-                vehicle_links = list(set([link.get('href') for link in links if link.get('href')]))
-                logger.info(f"Found {len(vehicle_links)} potential vehicle links")
+                vehicle_links = page.vehicle_links[:max_detail_pages]
 
-                # Scrape each vehicle detail page
-                for link in vehicle_links[:50]:  # Limit to first 50 to avoid too long scraping
-                    try:
-                        car = self._scrape_vehicle_detail(url, link)
-                        if car:
-                            cars.append(car)
-                    except Exception as e:
-                        logger.error(f"Error scraping vehicle at {link}: {e}")
-                        errors.append(f"Failed to scrape {link}: {str(e)}")
+                # Hand the listing browser back before detail workers need one
+                self._close_driver()
+                cars.extend(self._scrape_vehicle_details(url, vehicle_links, errors, fetch_mode))
 
             else:
-                # Parse each vehicle card
-                for vehicle_elem in vehicle_elements:
-                    try:
-                        car = self._parse_vehicle_card(vehicle_elem, url)
-                        if car:
-                            cars.append(car)
-                    except Exception as e:
-                        logger.error(f"Error parsing vehicle card: {e}")
-                        errors.append(f"Failed to parse vehicle: {str(e)}")
+                self._report_progress(len(cars))
+                pages.append(PageResult(
+                    url=inventory_url,
+                    vehicles=found,
+                    seconds=round(time.monotonic() - started, 3),
+                    **self._page_stats()
+                ))
 
-            logger.info(f"Successfully scraped {len(cars)} vehicles")
+                page_urls = [] if self._listing_complete else self._page_urls(page.pager)
+                for page_url in page_urls:
+                    if self._reached_vehicle_limit(cars):
+                        break
+                    wait_time += self._scrape_browser_page(page_url, url, cars, errors, pages)
 
         except Exception as e:
             logger.error(f"Error during scraping: {e}")
+            metrics.record_error("browser", e)
             errors.append(f"Scraping error: {str(e)}")
 
         finally:
             self._close_driver()
 
-        return ScraperResponse(
-            success=len(cars) > 0,
-            total_cars=len(cars),
-            cars=cars,
-            errors=errors
-        )
+        return wait_time
+
+    def _scrape_browser_page(
+        self,
+        page_url: str,
+        base_url: str,
+        cars: List[CarListing],
+        errors: List[str],
+        pages: List[PageResult]
+    ) -> float:
+        """
+        Load one further inventory page in the current browser and parse its cards
+
+        Returns:
+            Seconds spent waiting for the page to become ready
+        """
+        started = time.monotonic()
+        wait_time = 0.0
+        try:
+            logger.info(f"Navigating to {page_url}")
+            self._navigate(page_url)
+            wait_time = self._wait_for_inventory()
+            stats = self._page_stats()
+            page = self._parse_page(self.driver.page_source, page_url, base_url)
+            page_cars = []
+            self._page_vehicles(page, page_cars, errors)
+            cars.extend(page_cars)
+            self._report_progress(len(cars))
+            pages.append(PageResult(
+                url=page_url,
+                vehicles=len(page_cars),
+                seconds=round(time.monotonic() - started, 3),
+                **stats
+            ))
+        except Exception as e:
+            logger.error(f"Error scraping inventory page {page_url}: {e}")
+            metrics.record_error("page_fetch", e)
+            errors.append(f"Failed to fetch page {page_url}: {str(e)}")
+        return wait_time
+
+    def _page_stats(self) -> dict:
+        """Bytes transferred and load time of the current browser page, for PageResult"""
+        try:
+            stats = page_stats(self.driver)
+        except Exception as e:
+            logger.debug(f"Page stats unavailable: {e}")
+            return {}
+        logger.info(f"Page loaded {stats['bytes']} bytes in {stats['requests']} requests, load time {stats['load_time']}s")
+        return {"bytes": stats["bytes"], "load_time": stats["load_time"]}
+
+    def _load_all_vehicles(self):
+        """
+        Expand infinite-scroll and "load more" listings until no new cards appear
+
+        Runs at most max_pages - 1 rounds and stops early at max_vehicles.
+        """
+        try:
+            infinite = self.driver.execute_script(INFINITE_SCROLL_CHECK_JS)
+        except Exception:
+            infinite = False
+
+        count = len(self.driver.find_elements(By.CSS_SELECTOR, VEHICLE_CARD_SELECTOR))
+        for _ in range(self._max_pages - 1):
+            if self._stopped() or (self._max_vehicles and count >= self._max_vehicles):
+                break
+
+            buttons = [b for b in self.driver.find_elements(By.XPATH, LOAD_MORE_XPATH) if b.is_displayed()]
+            if buttons:
+                self.driver.execute_script("arguments[0].click();", buttons[0])
+            elif infinite:
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            else:
+                break
+
+            # Give the next batch up to the empty-page grace period to arrive
+            deadline = time.monotonic() + self.ready_empty_grace
+            new_count = count
+            while time.monotonic() < deadline:
+                time.sleep(READY_POLL_INTERVAL)
+                new_count = len(self.driver.find_elements(By.CSS_SELECTOR, VEHICLE_CARD_SELECTOR))
+                if new_count > count:
+                    break
+            if new_count <= count:
+                break
+            logger.info(f"Loaded more vehicles: {count} -> {new_count}")
+            count = new_count
+            self._wait_for_inventory()
+
+    def _wait_for_inventory(self) -> float:
+        """
+        Wait until vehicle cards are on the page and their count stops changing
+
+        Gives up once the document has finished loading with no cards for
+        ready_empty_grace seconds, or after ready_timeout seconds overall.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        deadline = started + self.ready_timeout
+        last_count = -1
+        stable_since = started
+        empty_since = None
+
+        while True:
+            now = time.monotonic()
+            try:
+                count = len(self.driver.find_elements(By.CSS_SELECTOR, VEHICLE_CARD_SELECTOR))
+                loaded = self.driver.execute_script("return document.readyState") == "complete"
+            except Exception as e:
+                logger.warning(f"Readiness check failed: {e}")
+                break
+
+            if count != last_count:
+                last_count = count
+                stable_since = now
+
+            if count > 0 and now - stable_since >= self.ready_stable_seconds:
+                logger.info(f"{count} vehicle cards ready")
+                break
+
+            if count == 0 and loaded:
+                empty_since = empty_since or now
+                if now - empty_since >= self.ready_empty_grace:
+                    logger.info("Page loaded without vehicle cards")
+                    break
+            else:
+                empty_since = None
+
+            if now >= deadline:
+                logger.warning(f"Timed out after {self.ready_timeout}s waiting for vehicle cards ({count} found)")
+                break
+
+            time.sleep(READY_POLL_INTERVAL)
+
+        waited = time.monotonic() - started
+        self._add_timing("readiness_wait", waited)
+        return round(waited, 3)
+
+    def _find_vehicle_links(self, soup) -> List[str]:
+        """Links that might lead to vehicle detail pages, deduplicated in page order"""
+        links = soup.find_all('a', href=VEHICLE_LINK_RE)
+        vehicle_links = list(dict.fromkeys(link.get('href') for link in links if link.get('href')))
+        logger.info(f"Found {len(vehicle_links)} potential vehicle links")
+        return vehicle_links
+
+    def _find_vehicle_elements(self, soup) -> list:
+        """Locate vehicle card elements on an inventory page"""
+        vehicle_elements, selector = find_vehicle_elements(soup)
+        if vehicle_elements:
+            logger.info(f"Found {len(vehicle_elements)} vehicles using {selector}")
+        return vehicle_elements
+
+    def _page_vehicles(
+        self,
+        page: ParsedPage,
+        cars: List[CarListing],
+        errors: List[str],
+        follow_feed: bool = False
+    ) -> int:
+        """
+        Add a parsed page's vehicles: embedded structured data first, then the
+        DWS inventory feeds it loads, vehicle cards as the fallback
+
+        Args:
+            follow_feed: Also fetch the further pages of a DWS inventory feed;
+                set for the first listing page only
+
+        Returns:
+            Vehicles (or vehicle cards) found on the page
+        """
+        if page.structured:
+            logger.info(f"Found {len(page.structured)} vehicles in embedded structured data")
+            self._emit_vehicles(page.structured)
+            cars.extend(page.structured)
+            return len(page.structured)
+
+        # Cards of a page with a feed were held back: the feed's vehicles have
+        # other keys (VIN rather than URL), so streaming both would send every vehicle twice
+        feed_cars = self._fetch_feeds(page.feeds, errors, follow_feed) if config.DWS_FEED_FETCH else []
+        if feed_cars:
+            self._emit_vehicles(feed_cars)
+            cars.extend(feed_cars)
+            return len(feed_cars)
+        # Cards already streamed as they were parsed are skipped as repeats
+        self._emit_vehicles(page.cars)
+        cars.extend(page.cars)
+        errors.extend(page.errors)
+        return page.cards
+
+    def _fetch_feeds(self, feeds: List[str], errors: List[str], follow_feed: bool = False) -> List[CarListing]:
+        """Vehicles from the DWS inventory feeds a page loads"""
+        cars = []
+        for feed_url in feeds:
+            try:
+                cars.extend(self._fetch_feed(feed_url, errors, follow_feed))
+            except Exception as e:
+                logger.warning(f"Inventory feed {feed_url} failed, using vehicle cards: {e}")
+                metrics.record_error("feed_fetch", e)
+        if cars:
+            logger.info(f"Found {len(cars)} vehicles in the DWS inventory feed")
+        return cars
+
+    def _fetch_feed(self, feed_url: str, errors: List[str], follow_pages: bool) -> List[CarListing]:
+        """
+        Vehicles from a DWS inventory feed
+
+        With follow_pages, the feed's further pages (from its reported total)
+        are fetched concurrently too. The HTML pager is skipped only when every
+        feed page loaded; failed pages are reported in errors and the pager
+        then crawls the listing as usual.
+        """
+        document = self._load_feed(feed_url)
+        with self._stage("structured_extraction"):
+            cars = vehicles_from_json(document, feed_url, SOURCE_DWS_FEED)
+            total = feed_total(document)
+        if not follow_pages or not cars or total is None:
+            return cars
+
+        page_urls, more = feed_page_urls(feed_url, total, self._max_pages)
+
+        def fetch_page(page_url):
+            try:
+                page_document = self._load_feed(page_url)
+                with self._stage("structured_extraction"):
+                    return vehicles_from_json(page_document, page_url, SOURCE_DWS_FEED)
+            except Exception as e:
+                logger.warning(f"Inventory feed page {page_url} failed: {e}")
+                metrics.record_error("feed_fetch", e)
+                errors.append(f"Failed to fetch inventory feed page {page_url}: {str(e)}")
+                return None
+
+        failed = 0
+        if page_urls:
+            workers = max(1, min(config.PAGE_CONCURRENCY, len(page_urls)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed") as executor:
+                for page_cars in executor.map(fetch_page, page_urls):
+                    if page_cars is None:
+                        failed += 1
+                    else:
+                        cars.extend(page_cars)
+        if not failed:
+            self._truncated = self._truncated or more
+            self._listing_complete = True
+        return cars
+
+    def _load_feed(self, feed_url: str):
+        document = parse_json(self._fetch_html(feed_url))
+        if document is None:
+            raise ValueError("feed is not JSON or JSONP")
+        return document
+
+    def _parse_vehicle_cards(
+        self,
+        vehicle_elements: list,
+        base_url: str,
+        cars: List[CarListing],
+        errors: List[str],
+        emit: bool = True
+    ):
+        """Parse each vehicle card, collecting failures into errors and, with emit, streaming each vehicle"""
+        # Cards are timed into one card_extraction sample for the page, not one per card
+        parsing = 0.0
+        for vehicle_elem in vehicle_elements:
+            try:
+                started = time.perf_counter()
+                try:
+                    car = self._parse_vehicle_card(vehicle_elem, base_url)
+                finally:
+                    parsing += time.perf_counter() - started
+                if car:
+                    cars.append(car)
+                    if emit:
+                        self._emit_vehicle(car)
+            except Exception as e:
+                logger.error(f"Error parsing vehicle card: {e}")
+                self._record_error("card_extraction", e)
+                errors.append(f"Failed to parse vehicle: {str(e)}")
+        if vehicle_elements:
+            self._add_timing("card_extraction", parsing)
 
     def _parse_vehicle_card(self, element, base_url: str) -> Optional[CarListing]:
         """Parse a vehicle card element"""
         car_data = {}
 
         try:
-            # Extract title/name - DWS specific selectors
-            title_elem = (
-                element.find(class_=re.compile(r'dws.*title|title.*dws', re.I)) or
-                element.find('h2') or element.find('h3') or
-                element.find('h4') or element.find(class_=re.compile(r'title|name|vehicle.*name', re.I))
-            )
-            if title_elem:
-                title = title_elem.get_text(strip=True)
+            fields = scan_card(element)
+
+            if fields.title:
+                title = self._visible_text(fields.title)
                 if title:  # Only parse if we have a title
                     parsed = self._parse_vehicle_title(title)
                     car_data.update(parsed)
 
-            # Extract price - DWS specific
-            price_elem = (
-                element.find(class_=re.compile(r'dws.*price|price.*dws', re.I)) or
-                element.find(class_=re.compile(r'price', re.I))
-            )
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
+            if fields.price:
+                price_text = fields.price.get_text(strip=True)
                 if price_text:
                     car_data['price'] = self._extract_price(price_text)
 
-            # Extract mileage - DWS specific
-            mileage_elem = (
-                element.find(class_=re.compile(r'dws.*mileage|mileage.*dws', re.I)) or
-                element.find(class_=re.compile(r'mileage|miles|odometer', re.I))
-            )
-            if mileage_elem:
-                mileage_text = mileage_elem.get_text(strip=True)
+            if fields.mileage:
+                mileage_text = fields.mileage.get_text(strip=True)
                 if mileage_text:
                     car_data['mileage'] = self._extract_number(mileage_text)
         except Exception as e:
             logger.error(f"Error extracting vehicle data: {e}")
+            self._record_error("card_extraction", e)
             return None
 
         # Extract link
-        link_elem = element.find('a', href=True)
-        if link_elem:
-            href = link_elem['href']
+        if fields.link:
+            href = fields.link['href']
             if not href.startswith('http'):
                 href = base_url.rstrip('/') + '/' + href.lstrip('/')
             car_data['listing_url'] = href
 
         # Extract images
         images = []
-        for img in element.find_all('img'):
+        for img in fields.images:
             src = img.get('src') or img.get('data-src')
             if src and not src.endswith(('.svg', '.gif')):
                 if not src.startswith('http'):
                     src = base_url.rstrip('/') + '/' + src.lstrip('/')
                 images.append(src)
         car_data['image_urls'] = images
+        car_data['source'] = SOURCE_DOM_CARD
 
-        return CarListing(**car_data) if car_data else None
+        return CarListing(**car_data)
 
-    def _scrape_vehicle_detail(self, base_url: str, path: str) -> Optional[CarListing]:
-        """Scrape a single vehicle detail page"""
+    def _scrape_vehicle_details(
+        self,
+        base_url: str,
+        links: List[str],
+        errors: List[str],
+        fetch_mode: str = "auto"
+    ) -> List[CarListing]:
+        """
+        Scrape vehicle detail pages concurrently
+
+        Up to detail_concurrency pages are fetched at once. Results keep the
+        order of links and per-link failures are collected into errors.
+        """
+        if not links:
+            return []
+
+        workers = max(1, min(self.detail_concurrency, len(links)))
+        cars = []
+        with self._detail_drivers(workers, fetch_mode) as detail_pool, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detail") as executor:
+            futures = [
+                executor.submit(self._scrape_vehicle_detail, base_url, link, fetch_mode, detail_pool)
+                for link in links
+            ]
+            for link, future in zip(links, futures):
+                try:
+                    car = future.result()
+                    if car:
+                        cars.append(car)
+                        self._emit_vehicle(car)
+                        self._report_progress(len(cars))
+                except Exception as e:
+                    logger.error(f"Error scraping vehicle at {link}: {e}")
+                    metrics.record_error("detail_fetch", e)
+                    errors.append(f"Failed to scrape {link}: {str(e)}")
+
+        return cars
+
+    @contextmanager
+    def _detail_drivers(self, workers: int, fetch_mode: str):
+        """
+        Browsers for detail page workers: the shared pool, or when there is
+        none a temporary pool with at most one browser per worker, launched
+        only if a page needs one. None in "http" mode.
+        """
+        detail_pool = None
+        if fetch_mode != "http" and not self._shared_pool():
+            detail_pool = DriverPool(size=workers, headless=self.headless)
         try:
-            url = path if path.startswith('http') else base_url.rstrip('/') + '/' + path.lstrip('/')
-            logger.info(f"Scraping vehicle detail: {url}")
+            yield detail_pool
+        finally:
+            if detail_pool:
+                detail_pool.shutdown()
 
-            self.driver.get(url)
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+    def _enrich_vehicles(
+        self,
+        cars: List[CarListing],
+        base_url: str,
+        fetch_mode: str,
+        depth: str,
+        max_pages: int,
+        budget: float
+    ):
+        """
+        Fill fields missing from listing cards from the vehicles' detail pages
+
+        Details cached for an unchanged card are reused; other candidates are
+        fetched concurrently, up to max_pages of them. Pages not started within
+        budget seconds are skipped, and failed pages leave the card as it was
+        without counting as scrape errors.
+
+        Returns:
+            (cars with details merged, in the same order, EnrichmentResult)
+        """
+        started = time.monotonic()
+        deadline = started + budget
+        summary = EnrichmentResult(depth=depth)
+        enriched = list(cars)
+        pending = []
+        for i, car in enumerate(cars):
+            if not needs_enrichment(car, depth):
+                continue
+            summary.candidates += 1
+            key = vehicle_key(car)
+            detail = self.detail_cache.get(key, car) if self.detail_cache else None
+            if detail is not None:
+                enriched[i] = merge_details(car, detail, depth)
+                summary.cached += 1
+            elif len(pending) < max_pages:
+                pending.append((i, key))
+            else:
+                summary.skipped += 1
+
+        def fetch_detail(car, detail_pool):
+            if time.monotonic() >= deadline:
+                return None
+            return self._scrape_vehicle_detail(base_url, car.listing_url, fetch_mode, detail_pool)
+
+        if pending:
+            logger.info(f"Enriching {len(pending)} vehicles from detail pages ({summary.cached} cached)")
+            workers = max(1, min(self.detail_concurrency, len(pending)))
+            with self._detail_drivers(workers, fetch_mode) as detail_pool, \
+                    ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich") as executor:
+                futures = [(i, key, executor.submit(fetch_detail, cars[i], detail_pool)) for i, key in pending]
+                for i, key, future in futures:
+                    try:
+                        detail = future.result()
+                    except Exception as e:
+                        logger.warning(f"Enrichment of {cars[i].listing_url} failed: {e}")
+                        metrics.record_error("enrichment", e)
+                        summary.failed += 1
+                        continue
+                    if detail is None:
+                        summary.skipped += 1
+                        continue
+                    if self.detail_cache and key:
+                        self.detail_cache.put(key, cars[i], detail)
+                    enriched[i] = merge_details(cars[i], detail, depth)
+                    summary.fetched += 1
+
+        elapsed = time.monotonic() - started
+        self._add_timing("enrichment", elapsed)
+        summary.seconds = round(elapsed, 3)
+        for outcome in ("cached", "fetched", "failed", "skipped"):
+            metrics.ENRICHED_VEHICLES.inc(getattr(summary, outcome), outcome=outcome)
+        if summary.candidates:
+            logger.info(
+                f"Enrichment: {summary.fetched} fetched, {summary.cached} cached, "
+                f"{summary.failed} failed, {summary.skipped} skipped in {summary.seconds}s"
             )
+        return enriched, summary
 
-            soup = BeautifulSoup(self.driver.page_source, 'lxml')
-            car_data = {'listing_url': url}
-
-            # Extract title
-            title_elem = soup.find('h1') or soup.find('h2')
-            if title_elem:
-                parsed = self._parse_vehicle_title(title_elem.get_text(strip=True))
-                car_data.update(parsed)
-
-            # Extract all text content for additional details
-            text_content = soup.get_text()
-
-            # Look for VIN
-            vin_match = re.search(r'VIN[:\s]+([A-HJ-NPR-Z0-9]{17})', text_content, re.IGNORECASE)
-            if vin_match:
-                car_data['vin'] = vin_match.group(1)
-
-            # Look for stock number
-            stock_match = re.search(r'Stock[#\s:]+([A-Z0-9-]+)', text_content, re.IGNORECASE)
-            if stock_match:
-                car_data['stock_number'] = stock_match.group(1)
-
-            # Extract price
-            price_elem = soup.find(class_=re.compile(r'price'))
-            if price_elem:
-                car_data['price'] = self._extract_price(price_elem.get_text(strip=True))
-
-            # Extract mileage
-            mileage_match = re.search(r'(\d+,?\d*)\s*miles?', text_content, re.IGNORECASE)
-            if mileage_match:
-                car_data['mileage'] = self._extract_number(mileage_match.group(1))
-
-            # Extract images
-            images = []
-            for img in soup.find_all('img'):
-                src = img.get('src') or img.get('data-src')
-                if src and not src.endswith(('.svg', '.gif')) and 'logo' not in src.lower():
-                    if not src.startswith('http'):
-                        src = base_url.rstrip('/') + '/' + src.lstrip('/')
-                    images.append(src)
-            car_data['image_urls'] = images[:10]  # Limit to 10 images
-
-            return CarListing(**car_data)
+    def _scrape_vehicle_detail(
+        self,
+        base_url: str,
+        path: str,
+        fetch_mode: str = "auto",
+        driver_pool: Optional[DriverPool] = None
+    ) -> Optional[CarListing]:
+        """Scrape a single vehicle detail page"""
+        url = path if path.startswith('http') else base_url.rstrip('/') + '/' + path.lstrip('/')
+        logger.info(f"Scraping vehicle detail: {url}")
 
-        except Exception as e:
-            logger.error(f"Error scraping detail page {path}: {e}")
-            return None
+        with self._stage("detail_fetch"):
+            page_source = self._fetch_detail_html(url, fetch_mode, driver_pool or self._shared_pool())
+        return self._parse_vehicle_detail(page_source, url, base_url)
+
+    def _fetch_detail_html(self, url: str, fetch_mode: str, driver_pool: Optional[DriverPool]) -> str:
+        """Get a detail page over HTTP, or in a pooled browser when HTTP isn't allowed or fails"""
+        if fetch_mode in ("auto", "http"):
+            try:
+                return self.policy.call(url, lambda: fetch_html(url, timeout=self.detail_timeout))
+            except Exception as e:
+                # A failing host won't do better in a browser
+                if fetch_mode == "http" or isinstance(e, CircuitOpen):
+                    raise
+                logger.warning(f"HTTP fetch of {url} failed, using browser: {e}")
+
+        if driver_pool is None:
+            raise RuntimeError("No browser available for detail page")
+
+        with driver_pool.driver() as driver:
+            driver.set_page_load_timeout(self.detail_timeout)
+            try:
+                self.policy.call(url, lambda: driver.get(url), kind="browser")
+                WebDriverWait(driver, self.detail_timeout).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                return driver.page_source
+            finally:
+                # Pooled drivers are shared with full inventory scrapes
+                driver.set_page_load_timeout(DEFAULT_PAGE_LOAD_TIMEOUT)
+
+    def _parse_vehicle_detail(self, page_source: str, url: str, base_url: str) -> CarListing:
+        """Parse a vehicle detail page, from its structured data when it has any"""
+        soup = self._parse_html(page_source, scope=strip_page)
+        try:
+            return self._read_vehicle_detail(soup, url, base_url)
+        finally:
+            soup.decompose()
+
+    def _detail_vehicle(self, structured: List[CarListing], url: str) -> Optional[CarListing]:
+        """
+        The structured vehicle a detail page is about
+
+        Detail pages may also list similar vehicles, so only a vehicle whose
+        URL matches the page, or the page's only vehicle when it has no URL,
+        counts. Returns None otherwise, so the DOM parser reads the page.
+        """
+        page_url = normalize_url(url)
+        for car in structured:
+            if car.listing_url and normalize_url(car.listing_url) == page_url:
+                return car
+        if len(structured) == 1 and not structured[0].listing_url:
+            car = structured[0]
+            car.listing_url = url
+            return car
+        return None
+
+    def _read_vehicle_detail(self, soup, url: str, base_url: str) -> CarListing:
+        if config.STRUCTURED_DATA:
+            with self._stage("structured_extraction"):
+                structured, _ = extract_page_data(soup, url)
+            car = self._detail_vehicle(structured, url)
+            if car:
+                return car
+
+        car_data = {'listing_url': url, 'source': SOURCE_DETAIL_PAGE}
+
+        # Extract title
+        title_elem = soup.find('h1') or soup.find('h2')
+        if title_elem:
+            parsed = self._parse_vehicle_title(title_elem.get_text(strip=True))
+            car_data.update(parsed)
+
+        # Extract all text content for additional details
+        text_content = soup.get_text()
+
+        # Look for VIN
+        vin_match = re.search(r'VIN[:\s]+([A-HJ-NPR-Z0-9]{17})', text_content, re.IGNORECASE)
+        if vin_match:
+            car_data['vin'] = vin_match.group(1)
+
+        # Look for stock number
+        stock_match = re.search(r'Stock[#\s:]+([A-Z0-9-]+)', text_content, re.IGNORECASE)
+        if stock_match:
+            car_data['stock_number'] = stock_match.group(1)
+
+        # Extract price
+        price_elem = soup.find(class_=re.compile(r'price'))
+        if price_elem:
+            car_data['price'] = self._extract_price(price_elem.get_text(strip=True))
+
+        # Extract mileage
+        mileage_match = re.search(r'(\d+,?\d*)\s*miles?', text_content, re.IGNORECASE)
+        if mileage_match:
+            car_data['mileage'] = self._extract_number(mileage_match.group(1))
+
+        # Extract labelled specs (colours, transmission, engine...)
+        for name, value in self._parse_detail_specs(soup).items():
+            car_data.setdefault(name, value)
+
+        # Extract the features list under a "Features"/"Options" heading
+        for heading in soup.find_all(['h2', 'h3', 'h4', 'h5', 'strong']):
+            if FEATURES_HEADING_RE.match(heading.get_text(strip=True)):
+                feature_list = heading.find_next('ul')
+                if feature_list:
+                    features = [li.get_text(" ", strip=True) for li in feature_list.find_all('li')]
+                    car_data['features'] = [f for f in features if f][:MAX_DETAIL_FEATURES]
+                    break
+
+        # Extract the dealer's description
+        description_elem = soup.find(class_=DESCRIPTION_CLASS_RE)
+        if description_elem:
+            description = description_elem.get_text(" ", strip=True)
+            if description:
+                car_data['description'] = description
+
+        # Extract images
+        images = []
+        for img in soup.find_all('img'):
+            src = img.get('src') or img.get('data-src')
+            if src and not src.endswith(('.svg', '.gif')) and 'logo' not in src.lower():
+                if not src.startswith('http'):
+                    src = base_url.rstrip('/') + '/' + src.lstrip('/')
+                images.append(src)
+        car_data['image_urls'] = images[:10]  # Limit to 10 images
+
+        return CarListing(**car_data)
+
+    def _parse_detail_specs(self, soup) -> dict:
+        """CarListing fields from the labelled spec lines on a detail page, first value per field"""
+        lines = [line.strip() for line in soup.get_text("\n").splitlines() if line.strip()]
+        specs = {}
+        for i, line in enumerate(lines):
+            label, _, value = line.partition(':')
+            name = DETAIL_SPEC_LABELS.get(label.strip().lower())
+            if not name or name in specs:
+                continue
+            value = value.strip()
+            if not value and i + 1 < len(lines):
+                value = lines[i + 1]
+            if value and len(value) <= DETAIL_SPEC_MAX_LENGTH and value.rstrip(':').lower() not in DETAIL_SPEC_LABELS:
+                specs[name] = value
+        return specs
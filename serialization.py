@@ -0,0 +1,187 @@
+"""
+Fast JSON encoding and compression for API responses.
+
+Models are encoded to bytes by pydantic-core directly, and everything else by
+orjson when it is installed (the stdlib json module otherwise), so large
+scrape results skip the model_dump() dict copy and the stdlib encoder that
+JSONResponse uses. Responses are gzip or brotli compressed when the client
+accepts it; brotli needs the optional brotli package. ETag helpers let
+unchanged results be answered with 304 Not Modified.
+"""
+import gzip
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+import pydantic_core
+from starlette.responses import Response
+import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class RawJSON(bytes):
+    """Already-encoded JSON, embedded as-is by encode_fields()"""
+
+
+def dumps(data) -> bytes:
+    """Encode plain Python data (dicts, lists, strings, numbers) as JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_fields(fields: Dict[str, object]) -> bytes:
+    """JSON object from fields whose values are Python data or RawJSON, in the given order"""
+    parts = [
+        dumps(key) + b":" + (value if isinstance(value, RawJSON) else dumps(value))
+        for key, value in fields.items()
+    ]
+    return b"{" + b",".join(parts) + b"}"
+
+
+def encode_model(model, extra: Optional[dict] = None) -> bytes:
+    """
+    Encode a pydantic model straight to JSON bytes, with extra top-level keys
+
+    Args:
+        model: Model to encode; fields marked exclude=True are left out as in model_dump()
+        extra: Keys appended to the encoded object, e.g. cache info
+
+    Returns:
+        The same JSON as model_dump() plus extra, without building the dict
+    """
+    body = pydantic_core.to_json(model)
+    if not extra:
+        return body
+    tail = dumps(extra)
+    separator = b"," if body != b"{}" else b""
+    return body[:-1] + separator + tail[1:]
+
+
+def encode_llm_format(result, extra: Optional[dict] = None) -> bytes:
+    """
+    Encode ScraperResponse.to_llm_format() directly, plus extra top-level keys
+
+    Each car's full_details is written by pydantic-core with exclude_none,
+    instead of being dumped to a dict and encoded a second time.
+    """
+    vehicles = pydantic_core.to_json(
+        [{"summary": car.to_llm_summary(), "full_details": car} for car in result.cars],
+        exclude_none=True
+    )
+    return encode_fields({
+        "summary": f"Found {result.total_cars} vehicles at the dealership",
+        "scraped_at": result.scraped_at,
+        "vehicles": RawJSON(vehicles),
+        "errors": result.errors if result.errors else None,
+        **(extra or {})
+    })
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header
+
+    Returns:
+        "br", "gzip" or None for an uncompressed body. Brotli wins ties when
+        the brotli package is installed.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    candidates = [
+        (weights.get(name, weights.get("*", 0.0)), -i, name)
+        for i, name in enumerate(available)
+    ]
+    quality, _, name = max(candidates)
+    return name if quality > 0 else None
+
+
+def compress(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """
+    Compress a response body for the client, if it accepts an encoding we support
+
+    Returns:
+        (body, Content-Encoding or None). Bodies under RESPONSE_COMPRESS_MIN_BYTES
+        and deployments with RESPONSE_COMPRESSION off are left as they are.
+    """
+    if not config.RESPONSE_COMPRESSION or len(body) < config.RESPONSE_COMPRESS_MIN_BYTES:
+        return body, None
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding == "br":
+        return brotli.compress(body, quality=config.BROTLI_QUALITY), "br"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=config.GZIP_LEVEL), "gzip"
+    return body, None
+
+
+def make_etag(content_hash: str, *variant) -> str:
+    """
+    Weak ETag for a content hash in one representation
+
+    variant holds the options that change the body's shape (format, budgets),
+    so each representation of the same inventory gets its own tag. The tag is
+    weak because bodies also carry per-request details such as cache age.
+    """
+    representation = hashlib.sha1(repr(variant).encode("utf-8")).hexdigest()[:8]
+    return f'W/"{content_hash[:24]}-{representation}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag, using weak comparison"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def not_modified(headers: Optional[dict] = None) -> Response:
+    """304 response carrying the validator headers"""
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    return Response(status_code=304, headers=headers)
+
+
+def json_response(
+    body: bytes,
+    accept_encoding: Optional[str] = None,
+    status_code: int = 200,
+    headers: Optional[dict] = None
+) -> Response:
+    """Response for an encoded JSON body, compressed as the client allows"""
+    body, encoding = compress(body, accept_encoding)
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
@@ -0,0 +1,274 @@
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import List, Optional
+from cache import normalize_url
+from models import CarListing, StoredVehicle
+
+logger = logging.getLogger(__name__)
+
+
+def dealership_id(url: str) -> str:
+    """Stable identifier for a dealership: its normalized host and path"""
+    return normalize_url(url).split("://", 1)[1]
+
+
+def vehicle_key(car: CarListing) -> Optional[str]:
+    """Identity of a vehicle within a dealership: VIN, else stock number, else listing URL"""
+    if car.vin:
+        return f"vin:{car.vin.upper()}"
+    if car.stock_number:
+        return f"stock:{car.stock_number}"
+    if car.listing_url:
+        return f"url:{car.listing_url.rstrip('/')}"
+    return None
+
+
+class InventoryStore(ABC):
+    """
+    Persistent storage for scraped inventory, one snapshot per dealership
+
+    Each vehicle's earlier versions are kept too, so a dealership's inventory
+    can be read back as it stood at any earlier scrape.
+    """
+
+    @abstractmethod
+    def save_inventory(
+        self,
+        url: str,
+        cars: List[CarListing],
+        scraped_at: Optional[str] = None,
+        mark_removed: bool = True
+    ) -> int:
+        """
+        Save one scrape's vehicles in a single batch
+
+        Vehicles already stored are updated, new ones inserted. With
+        mark_removed, stored vehicles missing from this scrape are flagged as
+        removed so they drop out of the current inventory.
+
+        Returns:
+            Number of vehicles written
+        """
+
+    @abstractmethod
+    def get_inventory(self, url: str, include_removed: bool = False) -> List[StoredVehicle]:
+        """Current (or all known) vehicles for a dealership"""
+
+    @abstractmethod
+    def get_inventory_at(self, url: str, at: str) -> List[StoredVehicle]:
+        """
+        Vehicles a dealership had listed as of the scrape at or before `at`
+
+        Args:
+            url: The dealership website URL
+            at: ISO timestamp, compared with the stored scraped_at values
+
+        Returns:
+            The vehicles, each with the data and scraped_at of its version then
+        """
+
+    @abstractmethod
+    def get_vehicle(self, url: str, key: str) -> Optional[StoredVehicle]:
+        """A single stored vehicle by its vehicle_key"""
+
+    @abstractmethod
+    def list_dealerships(self) -> List[dict]:
+        """Every dealership with stored inventory and when it was last scraped"""
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class SQLiteInventoryStore(InventoryStore):
+    """
+    InventoryStore backed by a local SQLite file
+
+    vehicle_history holds one row per version of a vehicle, valid from the
+    scrape that first saw that data until the scrape that changed or removed
+    it. Versions closed more than history_days ago are pruned (0 keeps them).
+    """
+
+    def __init__(self, path: str = "inventory.db", history_days: float = 30.0):
+        self.path = path
+        self.history_days = history_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS vehicles (
+                    dealership TEXT NOT NULL,
+                    vehicle_key TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    scraped_at TEXT NOT NULL,
+                    removed_at TEXT,
+                    PRIMARY KEY (dealership, vehicle_key)
+                );
+                CREATE TABLE IF NOT EXISTS vehicle_history (
+                    dealership TEXT NOT NULL,
+                    vehicle_key TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    valid_from TEXT NOT NULL,
+                    valid_to TEXT
+                );
+                CREATE INDEX IF NOT EXISTS vehicle_history_by_dealership
+                    ON vehicle_history (dealership, vehicle_key, valid_to);
+                CREATE TABLE IF NOT EXISTS dealerships (
+                    dealership TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    scraped_at TEXT NOT NULL,
+                    total_cars INTEGER NOT NULL
+                );
+            """)
+            if self._conn.execute("SELECT 1 FROM vehicle_history LIMIT 1").fetchone() is None:
+                # Databases from before vehicle_history: start it from the current snapshot
+                self._conn.execute(
+                    """
+                    INSERT INTO vehicle_history (dealership, vehicle_key, data, valid_from, valid_to)
+                    SELECT dealership, vehicle_key, data, scraped_at, removed_at FROM vehicles
+                    """
+                )
+
+    def save_inventory(
+        self,
+        url: str,
+        cars: List[CarListing],
+        scraped_at: Optional[str] = None,
+        mark_removed: bool = True
+    ) -> int:
+        dealership = dealership_id(url)
+        scraped_at = scraped_at or datetime.now().isoformat()
+
+        rows = {}
+        for car in cars:
+            key = vehicle_key(car)
+            if key is None:
+                logger.warning(f"Skipping vehicle without VIN, stock number or URL: {car.to_llm_summary()}")
+                continue
+            rows[key] = car.model_dump_json(exclude_none=True)
+
+        with self._lock, self._conn:
+            self._save_history(dealership, rows, scraped_at, mark_removed)
+            self._conn.executemany(
+                """
+                INSERT INTO vehicles (dealership, vehicle_key, data, first_seen, scraped_at, removed_at)
+                VALUES (?, ?, ?, ?, ?, NULL)
+                ON CONFLICT (dealership, vehicle_key) DO UPDATE SET
+                    data = excluded.data,
+                    scraped_at = excluded.scraped_at,
+                    removed_at = NULL
+                """,
+                [(dealership, key, data, scraped_at, scraped_at) for key, data in rows.items()]
+            )
+            if mark_removed:
+                self._conn.execute(
+                    """
+                    UPDATE vehicles SET removed_at = ?
+                    WHERE dealership = ? AND removed_at IS NULL AND scraped_at != ?
+                    """,
+                    (scraped_at, dealership, scraped_at)
+                )
+            self._conn.execute(
+                """
+                INSERT INTO dealerships (dealership, url, scraped_at, total_cars)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (dealership) DO UPDATE SET
+                    url = excluded.url,
+                    scraped_at = excluded.scraped_at,
+                    total_cars = excluded.total_cars
+                """,
+                (dealership, url, scraped_at, len(rows))
+            )
+
+        logger.info(f"Stored {len(rows)} vehicles for {dealership}")
+        return len(rows)
+
+    def get_inventory(self, url: str, include_removed: bool = False) -> List[StoredVehicle]:
+        query = "SELECT * FROM vehicles WHERE dealership = ?"
+        if not include_removed:
+            query += " AND removed_at IS NULL"
+        query += " ORDER BY first_seen, rowid"
+        with self._lock:
+            rows = self._conn.execute(query, (dealership_id(url),)).fetchall()
+        return [self._to_stored(row) for row in rows]
+
+    def get_inventory_at(self, url: str, at: str) -> List[StoredVehicle]:
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT h.dealership, h.vehicle_key, h.data, h.valid_from AS scraped_at,
+                       NULL AS removed_at, COALESCE(v.first_seen, h.valid_from) AS first_seen
+                FROM vehicle_history h
+                LEFT JOIN vehicles v ON v.dealership = h.dealership AND v.vehicle_key = h.vehicle_key
+                WHERE h.dealership = ? AND h.valid_from <= ? AND (h.valid_to IS NULL OR h.valid_to > ?)
+                ORDER BY h.valid_from, h.rowid
+                """,
+                (dealership_id(url), at, at)
+            ).fetchall()
+        return [self._to_stored(row) for row in rows]
+
+    def get_vehicle(self, url: str, key: str) -> Optional[StoredVehicle]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM vehicles WHERE dealership = ? AND vehicle_key = ?",
+                (dealership_id(url), key)
+            ).fetchone()
+        return self._to_stored(row) if row else None
+
+    def list_dealerships(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dealership, url, scraped_at, total_cars FROM dealerships ORDER BY dealership"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _save_history(self, dealership: str, rows: dict, scraped_at: str, mark_removed: bool):
+        """Close the versions this scrape changed or (with mark_removed) removed and open the new ones"""
+        current = dict(self._conn.execute(
+            "SELECT vehicle_key, data FROM vehicle_history WHERE dealership = ? AND valid_to IS NULL",
+            (dealership,)
+        ).fetchall())
+        changed = [key for key, data in rows.items() if current.get(key) != data]
+        closed = [key for key in changed if key in current]
+        if mark_removed:
+            closed += [key for key in current if key not in rows]
+
+        self._conn.executemany(
+            """
+            UPDATE vehicle_history SET valid_to = ?
+            WHERE dealership = ? AND vehicle_key = ? AND valid_to IS NULL
+            """,
+            [(scraped_at, dealership, key) for key in closed]
+        )
+        self._conn.executemany(
+            """
+            INSERT INTO vehicle_history (dealership, vehicle_key, data, valid_from, valid_to)
+            VALUES (?, ?, ?, ?, NULL)
+            """,
+            [(dealership, key, rows[key], scraped_at) for key in changed]
+        )
+        if self.history_days > 0:
+            cutoff = (datetime.now() - timedelta(days=self.history_days)).isoformat()
+            self._conn.execute(
+                "DELETE FROM vehicle_history WHERE dealership = ? AND valid_to < ?",
+                (dealership, cutoff)
+            )
+
+    def _to_stored(self, row) -> StoredVehicle:
+        return StoredVehicle(
+            dealership=row["dealership"],
+            vehicle_key=row["vehicle_key"],
+            first_seen=row["first_seen"],
+            scraped_at=row["scraped_at"],
+            removed_at=row["removed_at"],
+            car=CarListing.model_validate_json(row["data"])
+        )
@@ -0,0 +1,260 @@
+"""
+Vehicles from structured data embedded in inventory and detail pages.
+
+Reads schema.org JSON-LD blocks, inline JSON (application/json scripts and
+scripts that are a single JSONP call) and the DealerCenter (DWS) inventory
+feed: the JSONP that the async listing widget loads to fill its
+{{VinNumber}}-style card templates. Field names are matched
+case-insensitively against FIELD_ALIASES, so schema.org and DWS spellings
+share one mapping, and nested schema.org values (brand.name, offers.price,
+mileageFromOdometer.value) are unwrapped. A JSON object counts as a vehicle
+when it has at least two of VEHICLE_KEYS.
+"""
+import json
+import math
+import re
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from models import CarListing
+
+# Strategies recorded in CarListing.source
+SOURCE_JSON_LD = "json_ld"
+SOURCE_INLINE_JSON = "inline_json"
+SOURCE_DWS_FEED = "dws_feed"
+
+JSON_LD_TYPE = "application/ld+json"
+JSON_TYPE = "application/json"
+
+# A script that is nothing but a JSONP call: callback({...}) or window["cb"]([...]);
+JSONP_RE = re.compile(r'^\s*[\w$.\[\]"\']+\s*\(\s*(?P<json>[\[{].*[\]}])\s*\)\s*;?\s*$', re.S)
+
+# DWS async listing feed, loaded as <script src="/inv-scripts-v2/inv/vehicles?...&cb=...">,
+# paged by its pn (zero-based page) and ps (page size) parameters
+DWS_FEED_RE = re.compile(r'/inv-scripts[^?]*/inv/vehicles\?', re.I)
+DWS_PAGE_PARAM = "pn"
+DWS_PAGE_SIZE_PARAM = "ps"
+
+# CarListing field -> lower-cased JSON keys, most specific first. The two-letter
+# codes are the ones DWS feeds return for the f=id|sn|ye|ma|mo|... field list
+FIELD_ALIASES = {
+    "vin": ("vin", "vinnumber", "vehicleidentificationnumber"),
+    "stock_number": ("stocknumber", "stockno", "stock", "sku", "sn"),
+    "year": ("year", "modelyear", "vehiclemodeldate", "modeldate", "productiondate", "ye"),
+    "make": ("make", "brand", "manufacturer", "ma"),
+    "model": ("model", "mo"),
+    "price": ("price", "saleprice", "internetprice", "sellingprice", "offers", "pr"),
+    "mileage": ("mileage", "miles", "odometer", "mileagefromodometer", "mi"),
+    "exterior_color": ("exteriorcolor", "extcolor", "color", "ec"),
+    "interior_color": ("interiorcolor", "intcolor", "vehicleinteriorcolor", "ic"),
+    "transmission": ("transmission", "vehicletransmission", "transmissiondetail", "ta"),
+    "fuel_type": ("fueltype", "ft"),
+    "engine": ("engine", "vehicleengine", "en"),
+    "drivetrain": ("drivetrain", "drivewheelconfiguration", "drivetype", "dtt", "dt"),
+    "body_style": ("bodystyle", "bodytype", "bt"),
+    "description": ("description", "vehicledescription", "comments"),
+    "features": ("features", "equipment", "options", "eq"),
+    "image_urls": ("images", "imageurls", "photos", "photourls", "image", "vehicleimage", "imageurl", "im"),
+    "listing_url": ("url", "detailurl", "vehicledetailurl", "vdpurl", "link"),
+}
+# Trim keys; CarListing has no trim field, so the trim is appended to the model as on listing cards
+TRIM_KEYS = ("trim", "trimlevel", "tr")
+TEXT_FIELDS = (
+    "vin", "stock_number", "make", "model", "exterior_color", "interior_color",
+    "transmission", "fuel_type", "engine", "drivetrain", "body_style", "description"
+)
+VEHICLE_KEYS = ("vin", "stock_number", "make", "model", "year")
+# Keys of nested schema.org objects that hold the value itself, and an image's address
+NESTED_VALUE_KEYS = ("value", "price", "lowprice", "name", "url", "contenturl")
+IMAGE_URL_KEYS = ("contenturl", "url", "src")
+# Feed keys holding the size of the whole listing
+TOTAL_KEYS = ("totalcount", "totalrecords", "totalvehicles", "recordcount", "vehiclecount", "total")
+
+NUMBER_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+MAX_IMAGES = 10
+
+
+def _scalar(value):
+    """First usable scalar out of schema.org nesting: lists and {"name"}/{"value"}/{"price"} objects"""
+    for _ in range(4):
+        if isinstance(value, list):
+            value = value[0] if value else None
+        elif isinstance(value, dict):
+            fields = {str(key).lower(): item for key, item in value.items()}
+            value = next((fields[key] for key in NESTED_VALUE_KEYS if fields.get(key) not in (None, "")), None)
+        else:
+            break
+    if isinstance(value, str):
+        value = value.strip() or None
+    # Flags in widget settings ("make": false) are never vehicle values
+    return value if not isinstance(value, (list, dict, bool)) else None
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER_RE.search(str(value))
+    return float(match.group(0).replace(",", "")) if match else None
+
+
+def _image_urls(value, page_url: str) -> List[str]:
+    items = value if isinstance(value, list) else [value]
+    urls = []
+    for item in items:
+        if isinstance(item, dict):
+            fields = {str(key).lower(): field for key, field in item.items()}
+            item = next((fields[key] for key in IMAGE_URL_KEYS if fields.get(key)), None)
+        src = _scalar(item)
+        if isinstance(src, str) and not src.lower().endswith((".svg", ".gif")):
+            urls.append(urljoin(page_url, src))
+    return list(dict.fromkeys(urls))[:MAX_IMAGES]
+
+
+def car_from_mapping(data: dict, page_url: str, source: str) -> Optional[CarListing]:
+    """
+    Map one JSON object onto a CarListing
+
+    Returns:
+        The listing, or None when the object doesn't look like a vehicle
+    """
+    fields = {str(key).lower().lstrip("@"): value for key, value in data.items()}
+
+    def pick(name):
+        for alias in FIELD_ALIASES[name]:
+            value = fields.get(alias)
+            if value not in (None, "", [], {}):
+                return value
+        return None
+
+    if sum(1 for name in VEHICLE_KEYS if _scalar(pick(name)) is not None) < 2:
+        return None
+
+    car_data = {"source": source}
+    for name in TEXT_FIELDS:
+        value = _scalar(pick(name))
+        if value is not None:
+            car_data[name] = str(value)
+    if "vin" in car_data:
+        car_data["vin"] = car_data["vin"].upper()
+    trim = _scalar(next((fields[key] for key in TRIM_KEYS if fields.get(key) not in (None, "")), None))
+    if trim is not None and "model" in car_data and str(trim).lower() not in car_data["model"].lower():
+        car_data["model"] = f"{car_data['model']} {trim}"
+
+    year = _number(_scalar(pick("year")))
+    if year and 1900 <= year <= 2100:
+        car_data["year"] = int(year)
+    price = _number(_scalar(pick("price")))
+    if price:
+        # DWS feeds use 0 for "call for price"
+        car_data["price"] = price
+    mileage = _number(_scalar(pick("mileage")))
+    if mileage is not None:
+        car_data["mileage"] = int(mileage)
+
+    features = pick("features")
+    if isinstance(features, list):
+        car_data["features"] = [str(item) for item in (_scalar(f) for f in features) if item is not None]
+    images = pick("image_urls")
+    if images is not None:
+        car_data["image_urls"] = _image_urls(images, page_url)
+    url = _scalar(pick("listing_url"))
+    if isinstance(url, str):
+        car_data["listing_url"] = urljoin(page_url, url)
+
+    return CarListing(**car_data)
+
+
+def vehicles_from_json(document, page_url: str, source: str) -> List[CarListing]:
+    """Every vehicle object in a JSON document, in document order; vehicles aren't searched for nested vehicles"""
+    cars = []
+    stack = [document]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            car = car_from_mapping(node, page_url, source)
+            if car:
+                cars.append(car)
+            else:
+                stack.extend(reversed([value for value in node.values() if isinstance(value, (dict, list))]))
+    return cars
+
+
+def parse_json(text: str):
+    """A JSON document, or the argument of a JSONP call; None when the text is neither"""
+    text = text.strip()
+    match = JSONP_RE.match(text) if text[:1] not in ("{", "[") else None
+    try:
+        return json.loads(match.group("json") if match else text)
+    except ValueError:
+        return None
+
+
+def extract_page_data(soup, page_url: str) -> Tuple[List[CarListing], List[str]]:
+    """
+    Vehicles in a page's JSON-LD and inline JSON, plus the DWS feeds it loads
+
+    Returns:
+        (vehicles found inline, absolute URLs of DWS inventory feeds)
+    """
+    cars = []
+    feeds = []
+    for script in soup.find_all("script"):
+        src = script.get("src")
+        if src:
+            if DWS_FEED_RE.search(src):
+                feeds.append(urljoin(page_url, src))
+            continue
+        text = script.string
+        if not text:
+            continue
+
+        script_type = (script.get("type") or "").lower()
+        if script_type == JSON_LD_TYPE:
+            source = SOURCE_JSON_LD
+        elif script_type == JSON_TYPE or JSONP_RE.match(text):
+            source = SOURCE_INLINE_JSON
+        else:
+            continue
+        document = parse_json(text)
+        if document is not None:
+            cars.extend(vehicles_from_json(document, page_url, source))
+    return cars, list(dict.fromkeys(feeds))
+
+
+def feed_total(document) -> Optional[int]:
+    """Size of the whole listing when a feed reports it"""
+    if not isinstance(document, dict):
+        return None
+    for key, value in document.items():
+        if str(key).lower() in TOTAL_KEYS:
+            total = _number(value)
+            return int(total) if total is not None else None
+    return None
+
+
+def feed_page_urls(feed_url: str, total: int, max_pages: int) -> Tuple[List[str], bool]:
+    """
+    URLs of the DWS feed pages after feed_url, from its page size and the listing total
+
+    Returns:
+        (further page URLs, up to max_pages in all, and whether more pages exist
+        beyond them)
+    """
+    parts = urlsplit(feed_url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    values = dict(params)
+    page_size = int(_number(values.get(DWS_PAGE_SIZE_PARAM)) or 0)
+    if not page_size or DWS_PAGE_PARAM not in values:
+        return [], False
+
+    current = int(_number(values[DWS_PAGE_PARAM]) or 0)
+    page_count = math.ceil(total / page_size)
+    last = min(page_count, current + max_pages) - 1
+    urls = []
+    for number in range(current + 1, last + 1):
+        query = urlencode([(name, number if name == DWS_PAGE_PARAM else value) for name, value in params])
+        urls.append(urlunsplit(parts._replace(query=query)))
+    return urls, page_count - 1 > last
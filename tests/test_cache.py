@@ -0,0 +1,159 @@
+import asyncio
+import pytest
+from cache import ResponseCache, normalize_url
+from models import ScraperResponse
+
+
+def response(success=True, total=0):
+    return ScraperResponse(success=success, total_cars=total, cars=[], scraped_at="2024-01-01T00:00:00")
+
+
+class GatedFetch:
+    """A fetch that counts its calls and finishes when released"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result or response()
+        self.error = error
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_normalize_url():
+    assert normalize_url("WWW.Dealer.com/inventory/") == "https://dealer.com/inventory"
+    assert normalize_url("http://dealer.com") == normalize_url("https://www.dealer.com/")
+
+
+def test_make_key_ignores_option_order():
+    assert ResponseCache.make_key("dealer.com", a=1, b=2) == ResponseCache.make_key("https://www.dealer.com/", b=2, a=1)
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def run():
+        cache = ResponseCache()
+        fetch = GatedFetch()
+        calls = [asyncio.create_task(cache.get_or_fetch("k", fetch)) for _ in range(3)]
+        await fetch.started.wait()
+        fetch.release.set()
+        results = await asyncio.gather(*calls)
+
+        assert fetch.calls == 1
+        assert sorted(status for _, status, _ in results) == ["coalesced", "coalesced", "miss"]
+        assert all(value is fetch.result for value, _, _ in results)
+        assert (await cache.get_or_fetch("k", fetch))[1] == "hit"
+        assert cache.stats()["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_leader_leaves_fetch_for_waiters():
+    async def run():
+        cache = ResponseCache()
+        fetch = GatedFetch()
+        leader = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await fetch.started.wait()
+        waiter = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        fetch.release.set()
+
+        value, status, _ = await waiter
+        assert (value, status) == (fetch.result, "coalesced")
+        assert cache.peek("k").value is fetch.result
+
+    asyncio.run(run())
+
+
+def test_cancelled_fetch_is_a_regular_error_for_waiters():
+    async def run():
+        cache = ResponseCache()
+        fetch = GatedFetch()
+        waiter = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        await fetch.started.wait()
+
+        await cache.shutdown()
+        with pytest.raises(RuntimeError):
+            await waiter
+
+    asyncio.run(run())
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    async def run():
+        cache = ResponseCache()
+        fetch = GatedFetch(error=ValueError("site down"))
+        calls = [asyncio.create_task(cache.get_or_fetch("k", fetch)) for _ in range(2)]
+        await fetch.started.wait()
+        fetch.release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert fetch.calls == 1
+        assert cache.peek("k") is None
+
+    asyncio.run(run())
+
+
+def test_unsuccessful_results_are_not_cached():
+    async def run():
+        cache = ResponseCache()
+        fetch = GatedFetch(result=response(success=False))
+        fetch.release.set()
+        await cache.get_or_fetch("k", fetch)
+        assert (await cache.get_or_fetch("k", fetch))[1] == "miss"
+        assert fetch.calls == 2
+
+    asyncio.run(run())
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    async def run():
+        cache = ResponseCache(ttl=0.0, stale_ttl=60.0)
+        old = response(total=1)
+        cache.put("k", old)
+        await asyncio.sleep(0.01)
+        fetch = GatedFetch(result=response(total=2))
+
+        first = await cache.get_or_fetch("k", fetch)
+        second = await cache.get_or_fetch("k", fetch)
+        assert [first[:2], second[:2]] == [(old, "stale"), (old, "stale")]
+
+        await fetch.started.wait()
+        fetch.release.set()
+        while cache.stats()["in_flight"]:
+            await asyncio.sleep(0)
+        assert fetch.calls == 1
+        assert cache.peek("k").value is fetch.result
+
+    asyncio.run(run())
+
+
+def test_force_refresh_skips_fresh_entry():
+    async def run():
+        cache = ResponseCache()
+        cache.put("k", response(total=1))
+        fetch = GatedFetch(result=response(total=2))
+        fetch.release.set()
+        value, status, _ = await cache.get_or_fetch("k", fetch, force_refresh=True)
+        assert (value.total_cars, status) == (2, "refresh")
+
+    asyncio.run(run())
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, response())
+    assert cache.peek("a") is None
+    assert cache.stats()["entries"] == 2
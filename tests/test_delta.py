@@ -0,0 +1,78 @@
+from delta import diff_inventory, fingerprint
+from models import CarListing, StoredVehicle
+from storage import vehicle_key
+
+URL = "https://www.dealer.com/"
+
+
+def car(vin, price=20000.0, **fields):
+    return CarListing(vin=vin, make="Ford", model="F-150", year=2020, price=price, **fields)
+
+
+def stored(*cars, scraped_at="2024-01-01T00:00:00"):
+    return [
+        StoredVehicle(
+            dealership="dealer.com",
+            vehicle_key=vehicle_key(item),
+            first_seen=scraped_at,
+            scraped_at=scraped_at,
+            car=item
+        )
+        for item in cars
+    ]
+
+
+def test_first_scrape_adds_everything():
+    delta = diff_inventory(URL, [], [car("A"), car("B")], "2024-01-02T00:00:00")
+    assert [item.vin for item in delta.added] == ["A", "B"]
+    assert delta.previous_scraped_at is None
+    assert delta.dealership == "dealer.com"
+
+
+def test_added_removed_modified_and_unchanged():
+    previous = stored(car("A"), car("B"), car("C", price=30000.0))
+    current = [car("A"), car("C", price=28000.0), car("D")]
+
+    delta = diff_inventory(URL, previous, current, "2024-01-02T00:00:00")
+
+    assert [item.vin for item in delta.added] == ["D"]
+    assert [item.vin for item in delta.removed] == ["B"]
+    assert delta.unchanged == 1
+    assert len(delta.modified) == 1
+    change = delta.modified[0]
+    assert change.vehicle_key == "vin:C"
+    assert set(change.changes) == {"price"}
+    assert (change.changes["price"].old, change.changes["price"].new) == (30000.0, 28000.0)
+    assert delta.previous_scraped_at == "2024-01-01T00:00:00"
+
+
+def test_removed_can_be_left_out():
+    delta = diff_inventory(URL, stored(car("A"), car("B")), [car("A")], "now", include_removed=False)
+    assert delta.removed == []
+    assert delta.unchanged == 1
+
+
+def test_listing_metadata_is_not_a_change():
+    previous = stored(car("A", source="dom_card"))
+    delta = diff_inventory(URL, previous, [car("A", source="json_ld")], "now")
+    assert delta.modified == []
+    assert delta.unchanged == 1
+
+
+def test_vehicles_without_identity_and_duplicates_are_skipped():
+    anonymous = CarListing(make="Ford", model="Focus")
+    delta = diff_inventory(URL, [], [car("A"), car("A"), anonymous], "now")
+    assert [item.vin for item in delta.added] == ["A"]
+
+
+def test_keys_fall_back_to_stock_number_and_url():
+    by_stock = CarListing(stock_number="S1", make="Ford")
+    by_url = CarListing(listing_url="https://dealer.com/used/1/", make="Ford")
+    assert vehicle_key(car("abc")) == "vin:ABC"
+    assert vehicle_key(by_stock) == "stock:S1"
+    assert vehicle_key(by_url) == "url:https://dealer.com/used/1"
+
+
+def test_fingerprint_is_stable():
+    assert fingerprint(car("A")) == fingerprint(car("A"))
+    assert fingerprint(car("A")) != fingerprint(car("A", price=1.0))
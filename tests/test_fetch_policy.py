@@ -0,0 +1,240 @@
+import pytest
+import requests
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import fetch_policy
+from fetch_policy import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, FetchPolicy, TokenBucket, is_transient
+)
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep in fetch_policy"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(fetch_policy.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(fetch_policy.time, "sleep", clock.sleep)
+    return clock
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.before_call("a.com")
+        breaker.record_failure("a.com")
+    assert breaker.state == CLOSED
+
+    breaker.record_failure("a.com")
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+    with pytest.raises(CircuitOpen) as excinfo:
+        breaker.before_call("a.com")
+    assert excinfo.value.retry_after == pytest.approx(60)
+
+
+def test_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure("a.com")
+    breaker.record_success()
+    breaker.record_failure("a.com")
+    assert breaker.state == CLOSED
+    assert breaker.failures == 1
+
+
+def test_breaker_half_open_admits_one_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("a.com")
+    clock.now += 61
+
+    breaker.before_call("a.com")
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call("a.com")
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call("a.com")
+
+
+def test_breaker_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("a.com")
+    clock.now += 61
+    breaker.before_call("a.com")
+
+    breaker.record_failure("a.com")
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    assert breaker.retry_after() == pytest.approx(60)
+
+
+def test_breaker_released_probe_lets_next_call_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("a.com")
+    clock.now += 61
+    breaker.before_call("a.com")
+
+    breaker.release_probe()
+    breaker.before_call("a.com")
+    assert breaker.state == HALF_OPEN
+
+
+def test_token_bucket_allows_burst_then_waits(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 1.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_token_bucket_without_rate_never_waits(clock):
+    bucket = TokenBucket(rate=0, burst=1)
+    assert [bucket.acquire() for _ in range(5)] == [0.0] * 5
+    assert clock.sleeps == []
+
+
+@pytest.mark.parametrize("error, expected", [
+    (http_error(503), True),
+    (http_error(429), True),
+    (http_error(404), False),
+    (http_error(403), False),
+    (requests.Timeout("timed out"), True),
+    (requests.ConnectionError("reset"), True),
+    (TimeoutException("page load"), True),
+    (WebDriverException("unknown error: net::ERR_CONNECTION_RESET"), True),
+    (WebDriverException("no such element"), False),
+    (ValueError("bad html"), False),
+])
+def test_is_transient(error, expected):
+    assert is_transient(error) is expected
+
+
+def test_call_retries_transient_failures(clock):
+    policy = FetchPolicy(rate=0, retries=2, failure_threshold=10)
+    outcomes = [requests.Timeout("slow"), http_error(502), "page"]
+
+    def fetch():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert policy.call("https://a.com/inventory", fetch) == "page"
+    host = policy.status()["hosts"][0]
+    assert (host["requests"], host["retries"], host["state"]) == (3, 2, CLOSED)
+    assert len(clock.sleeps) == 2
+
+
+def test_call_gives_up_after_retries(clock):
+    policy = FetchPolicy(rate=0, retries=1, failure_threshold=10)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        raise requests.Timeout("slow")
+
+    with pytest.raises(requests.Timeout):
+        policy.call("https://a.com/", fetch)
+    assert len(calls) == 2
+    assert policy.status()["hosts"][0]["failures"] == 1
+
+
+def test_call_does_not_retry_permanent_errors(clock):
+    policy = FetchPolicy(rate=0, retries=3)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        raise http_error(404)
+
+    with pytest.raises(requests.HTTPError):
+        policy.call("https://a.com/", fetch)
+    assert len(calls) == 1
+    assert clock.sleeps == []
+    assert policy.states() == {"a.com": CLOSED}
+
+
+def test_call_honours_retry_after(clock, monkeypatch):
+    monkeypatch.setattr(fetch_policy.random, "uniform", lambda low, high: low)
+    policy = FetchPolicy(rate=0, retries=1, backoff_max=8.0, failure_threshold=10)
+    outcomes = [http_error(429, {"Retry-After": "5"}), "page"]
+
+    def fetch():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert policy.call("https://a.com/", fetch) == "page"
+    assert clock.sleeps == [5.0]
+
+
+def test_call_caps_retry_after_at_backoff_max(clock, monkeypatch):
+    monkeypatch.setattr(fetch_policy.random, "uniform", lambda low, high: low)
+    policy = FetchPolicy(rate=0, retries=1, backoff_max=2.0, failure_threshold=10)
+    outcomes = [http_error(503, {"Retry-After": "120"}), "page"]
+
+    def fetch():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    policy.call("https://a.com/", fetch)
+    assert clock.sleeps == [2.0]
+
+
+def test_open_breaker_fails_fast(clock):
+    policy = FetchPolicy(rate=0, retries=5, failure_threshold=2, reset_timeout=30)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        raise requests.ConnectionError("refused")
+
+    with pytest.raises(requests.ConnectionError):
+        policy.call("https://www.a.com/one", fetch)
+    assert len(calls) == 2
+
+    with pytest.raises(CircuitOpen):
+        policy.call("https://a.com/two", fetch)
+    with pytest.raises(CircuitOpen):
+        policy.check("https://a.com/three")
+    assert len(calls) == 2
+    assert policy.status()["hosts"][0]["rejected"] == 1
+
+
+def test_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(fetch_policy.random, "uniform", lambda low, high: high)
+    policy = FetchPolicy(backoff_base=0.5, backoff_max=3.0)
+    assert [policy.backoff(attempt) for attempt in (1, 2, 3, 4)] == [0.5, 1.0, 2.0, 3.0]
@@ -0,0 +1,69 @@
+from bs4 import BeautifulSoup
+import config
+from extraction import find_vehicle_elements
+from html_scope import parse_document, scope_inventory_page, strip_page
+from test_streaming import INVENTORY_PAGE
+
+PAGE = """<html><head><title>Used Cars</title>
+<style>.card { color: red }</style>
+<script>var tracking = 1;</script>
+<script type="application/ld+json">{"@type": "Car", "brand": "Ford", "model": "Focus"}</script>
+<script src="/inv-scripts-v2/inv/vehicles?pn=0&amp;ps=15"></script>
+<script src="/js/app.js"></script>
+</head><body>
+<!-- header -->
+<nav><a href="/">Home</a><a href="/inventory/?page_no=2">Next</a></nav>
+<div class="modal"><p>Sign up for our newsletter</p></div>
+<div class="vehicle-item" data-vehicle-id="1"><a href="/inventory/ford/focus/1/">2019 Ford Focus</a>
+<svg><path d="M0 0"/></svg><span>$12,995</span></div>
+<div><span>Page 1 of 2</span></div>
+</body></html>"""
+
+
+def test_strip_page_drops_scripts_styles_svg_and_comments():
+    stripped = strip_page(PAGE)
+    assert "tracking" not in stripped
+    assert "color: red" not in stripped
+    assert "<svg" not in stripped
+    assert "header" not in stripped
+    assert "/js/app.js" not in stripped
+    # What structured_data reads stays
+    assert "application/ld+json" in stripped
+    assert "/inv-scripts-v2/inv/vehicles" in stripped
+    assert "$12,995" in stripped
+
+
+def test_structured_data_scripts_dropped_when_disabled(monkeypatch):
+    monkeypatch.setattr(config, "STRUCTURED_DATA", False)
+    stripped = strip_page(PAGE)
+    assert "application/ld+json" not in stripped
+    # Feed script tags are kept by src, independent of inline structured data
+    assert "/inv-scripts-v2/inv/vehicles" in stripped
+
+
+def test_scope_keeps_title_cards_links_and_page_status():
+    soup = BeautifulSoup(scope_inventory_page(PAGE), "lxml")
+    assert soup.title.get_text() == "Used Cars"
+    assert [a["href"] for a in soup.find_all("a")] == ["/", "/inventory/?page_no=2", "/inventory/ford/focus/1/"]
+    assert "newsletter" not in soup.get_text()
+    assert "Page 1 of 2" in soup.get_text()
+    card = soup.find("div", attrs={"data-vehicle-id": "1"})
+    assert card is not None and "$12,995" in card.get_text()
+
+
+def test_scoped_inventory_page_has_the_same_cards():
+    full, _ = find_vehicle_elements(BeautifulSoup(INVENTORY_PAGE, "lxml"))
+    scoped, _ = find_vehicle_elements(BeautifulSoup(scope_inventory_page(INVENTORY_PAGE), "lxml"))
+    assert len(scoped) == len(full) == 15
+    assert [card.get_text(" ", strip=True) for card in scoped] == [card.get_text(" ", strip=True) for card in full]
+    assert len(scope_inventory_page(INVENTORY_PAGE)) < len(INVENTORY_PAGE) / 2
+
+
+def test_unparseable_input_is_returned_unchanged():
+    assert strip_page("") == ""
+    assert scope_inventory_page("") == ""
+
+
+def test_parse_document_handles_xml_declarations():
+    root = parse_document('<?xml version="1.0" encoding="utf-8"?><html><body><p>ok</p></body></html>')
+    assert root.findtext(".//p") == "ok"
@@ -0,0 +1,61 @@
+import socket
+import pytest
+import jobs
+from jobs import check_callback_url
+
+
+@pytest.mark.parametrize("url", [
+    "ftp://hooks.example.com/done",
+    "file:///etc/passwd",
+    "https:///no-host",
+    "hooks.example.com/done",
+])
+def test_callback_must_be_an_http_url(url):
+    with pytest.raises(ValueError, match="http or https"):
+        check_callback_url(url)
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/hook",
+    "http://localhost:8000/hook",
+    "http://10.0.0.5/hook",
+    "http://192.168.1.10/hook",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/hook",
+    "http://[fe80::1]/hook",
+    "http://0.0.0.0/hook",
+])
+def test_callback_to_a_non_public_address_is_rejected(url):
+    with pytest.raises(ValueError, match="non-public"):
+        check_callback_url(url)
+
+
+def test_private_callbacks_can_be_allowed():
+    check_callback_url("http://127.0.0.1:9000/hook", allow_private=True)
+
+
+def test_every_resolved_address_must_be_public(monkeypatch):
+    def getaddrinfo(host, port, proto=0):
+        return [(socket.AF_INET, socket.SOCK_STREAM, proto, "", (address, port)) for address in ("93.184.216.34", "10.1.2.3")]
+
+    monkeypatch.setattr(jobs.socket, "getaddrinfo", getaddrinfo)
+    with pytest.raises(ValueError, match="10.1.2.3"):
+        check_callback_url("https://hooks.example.com/done")
+
+
+def test_public_callback_is_allowed(monkeypatch):
+    def getaddrinfo(host, port, proto=0):
+        assert (host, port) == ("hooks.example.com", 443)
+        return [(socket.AF_INET, socket.SOCK_STREAM, proto, "", ("93.184.216.34", port))]
+
+    monkeypatch.setattr(jobs.socket, "getaddrinfo", getaddrinfo)
+    check_callback_url("https://hooks.example.com/done")
+
+
+def test_unresolvable_host_is_rejected(monkeypatch):
+    def getaddrinfo(host, port, proto=0):
+        raise socket.gaierror("Name or service not known")
+
+    monkeypatch.setattr(jobs.socket, "getaddrinfo", getaddrinfo)
+    with pytest.raises(ValueError, match="can't be resolved"):
+        check_callback_url("https://missing.example.com/done")
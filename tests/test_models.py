@@ -0,0 +1,77 @@
+from models import CarListing, ScraperResponse
+
+
+def car(i, **fields):
+    values = {
+        "vin": f"VIN{i}",
+        "make": "Ford",
+        "model": "F-150",
+        "year": 2020,
+        "price": 25000.0 + i,
+        "mileage": 30000,
+        "listing_url": f"https://www.dealer.com/inventory/{i}",
+    }
+    return CarListing(**{**values, **fields})
+
+
+def response(cars):
+    return ScraperResponse(success=True, total_cars=len(cars), cars=cars)
+
+
+def test_compact_table_leaves_out_empty_columns():
+    compact = response([car(1), car(2)]).to_compact_llm_format()
+    assert compact["columns"] == ["year", "make", "model", "price", "mileage", "vin", "url"]
+    assert compact["url_base"] == "https://www.dealer.com"
+    assert compact["table"].splitlines() == [
+        "year|make|model|price|mileage|vin|url",
+        "2020|Ford|F-150|25001|30000|VIN1|/inventory/1",
+        "2020|Ford|F-150|25002|30000|VIN2|/inventory/2",
+    ]
+    assert (compact["vehicles_included"], compact["vehicles_omitted"]) == (2, 0)
+    assert compact["chars"] == len(compact["table"])
+
+
+def test_compact_cells_stay_on_one_line():
+    compact = response([car(1, exterior_color="Red | Black\nTwo-tone", price=19999.5)]).to_compact_llm_format()
+    row = compact["table"].splitlines()[1]
+    assert "19999.50" in row
+    assert "Red / Black Two-tone" in row
+
+
+def test_optional_columns_are_opt_in():
+    cars = [car(1, description="Clean", image_urls=["https://img.dealer.com/1.jpg"])]
+    assert "image" not in response(cars).to_compact_llm_format()["columns"]
+    compact = response(cars).to_compact_llm_format(include_images=True, include_description=True)
+    assert compact["columns"][-2:] == ["description", "image"]
+
+
+def test_budget_shortens_text_then_drops_columns():
+    cars = [car(i, description="Low miles, one owner, " * 20) for i in range(3)]
+    full = response(cars).to_compact_llm_format(include_description=True)
+
+    shortened = response(cars).to_compact_llm_format(include_description=True, max_chars=len(full["table"]) - 100)
+    assert shortened["shortened_columns"] == ["description"]
+    assert shortened["dropped_columns"] == []
+    assert all(len(line.split("|")[-1]) <= 100 for line in shortened["table"].splitlines()[1:])
+
+    tight = response(cars).to_compact_llm_format(include_description=True, max_chars=200)
+    assert tight["chars"] <= 200
+    assert tight["dropped_columns"][0] == "description"
+    assert tight["columns"][:5] == ["year", "make", "model", "price", "mileage"]
+
+
+def test_budget_leaves_out_trailing_vehicles_last():
+    compact = response([car(i) for i in range(50)]).to_compact_llm_format(max_tokens=50)
+    assert compact["chars"] <= 200
+    assert compact["columns"] == ["year", "make", "model", "price", "mileage"]
+    assert 0 < compact["vehicles_included"] < 50
+    assert compact["vehicles_included"] + compact["vehicles_omitted"] == 50
+    assert compact["summary"].endswith(f"showing the first {compact['vehicles_included']}")
+
+
+def test_tighter_of_two_budgets_wins():
+    cars = [car(i) for i in range(20)]
+    by_chars = response(cars).to_compact_llm_format(max_chars=300)
+    both = response(cars).to_compact_llm_format(max_chars=300, max_tokens=1000)
+    assert both["table"] == by_chars["table"]
+    assert both["estimated_tokens"] == -(-both["chars"] // 4)
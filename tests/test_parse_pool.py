@@ -0,0 +1,55 @@
+import pytest
+import config
+from parse_pool import ParsePool
+from scraper import CarDealerScraper
+from test_streaming import INVENTORY_PAGE, URL, feed_response
+
+BASE_URL = "https://www.usautosofdallas.com"
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParsePool(workers=1, chunk_size=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_pooled_page_matches_in_process_parse(pool, monkeypatch):
+    monkeypatch.setattr(config, "DWS_FEED_FETCH", False)
+    expected = CarDealerScraper()._parse_page(INVENTORY_PAGE, URL, BASE_URL)
+
+    streamed = []
+    page = CarDealerScraper(parse_pool=pool, vehicle_callback=streamed.append)._parse_page(
+        INVENTORY_PAGE, URL, BASE_URL
+    )
+
+    # 15 cards: the first 4 in the page task, the other 11 in three chunks
+    assert page.cards == expected.cards == 15
+    assert page.chunks == []
+    assert [car.model_dump() for car in page.cars] == [car.model_dump() for car in expected.cars]
+    assert [car.listing_url for car in streamed] == [car.listing_url for car in page.cars]
+    assert pool.stats()["chunks"] >= 3
+
+
+def test_pooled_cards_wait_for_the_feed(pool, monkeypatch):
+    monkeypatch.setattr(config, "DWS_FEED_FETCH", True)
+    streamed = []
+    page = CarDealerScraper(parse_pool=pool, vehicle_callback=streamed.append)._parse_page(
+        INVENTORY_PAGE, URL, BASE_URL
+    )
+    assert page.feeds and len(page.cars) == 15
+    assert streamed == []
+
+
+def test_pooled_scrape_streams_feed_vehicles_once(pool, monkeypatch):
+    import scraper
+    monkeypatch.setattr(config, "DWS_FEED_FETCH", True)
+    monkeypatch.setattr(
+        scraper, "fetch_html", lambda url, timeout=None: feed_response() if "/inv/vehicles" in url else INVENTORY_PAGE
+    )
+    streamed = []
+    result = CarDealerScraper(parse_pool=pool, vehicle_callback=streamed.append).scrape_inventory(
+        URL, fetch_mode="http", max_pages=1
+    )
+    assert len(streamed) == len(result.cars) == 15
+
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+import scheduler
+from models import ScraperResponse
+from scheduler import RefreshScheduler, ScheduledDealer, parse_schedule
+from workers import ExecutorSaturated
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: (low + high) / 2)
+
+
+def test_parse_schedule():
+    spec = "https://a.com|600, https://b.com ,,https://c.com|"
+    assert parse_schedule(spec, 300.0) == [
+        ("https://a.com", 600.0),
+        ("https://b.com", 300.0),
+        ("https://c.com", 300.0),
+    ]
+
+
+def test_parse_schedule_skips_bad_entries():
+    spec = "https://a.com|soon,|600,https://b.com|0,https://c.com|-5,https://d.com|60"
+    assert parse_schedule(spec, 300.0) == [("https://d.com", 60.0)]
+
+
+def test_failures_back_off_up_to_the_limit(no_jitter):
+    refresher = RefreshScheduler(refresh=None, max_backoff=1000.0)
+    dealer = ScheduledDealer("https://a.com", 100.0)
+    assert refresher._next_delay(dealer) == 100.0
+    dealer.consecutive_failures = 1
+    assert refresher._next_delay(dealer) == 200.0
+    dealer.consecutive_failures = 3
+    assert refresher._next_delay(dealer) == 800.0
+    dealer.consecutive_failures = 20
+    assert refresher._next_delay(dealer) == 1000.0
+
+
+def test_backoff_never_shortens_a_long_interval(no_jitter):
+    refresher = RefreshScheduler(refresh=None, max_backoff=60.0)
+    dealer = ScheduledDealer("https://a.com", 600.0)
+    dealer.consecutive_failures = 2
+    assert refresher._next_delay(dealer) == 600.0
+
+
+def test_run_records_failure_and_success(no_jitter):
+    results = [RuntimeError("boom"), ScraperResponse(success=True, total_cars=3, cars=[])]
+
+    async def refresh(url, ttl):
+        outcome = results.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def run():
+        refresher = RefreshScheduler(refresh)
+        refresher._limit = asyncio.Semaphore(1)
+        dealer = ScheduledDealer("https://a.com", 100.0)
+        await refresher._run(dealer)
+        assert (dealer.last_status, dealer.consecutive_failures, dealer.last_error) == ("failed", 1, "boom")
+        await refresher._run(dealer)
+        assert (dealer.last_status, dealer.consecutive_failures, dealer.last_vehicles) == ("succeeded", 0, 3)
+        assert dealer.runs == 2 and dealer.failures == 1
+
+    asyncio.run(run())
+
+
+def test_full_queue_defers_without_counting_a_failure():
+    async def refresh(url, ttl):
+        raise ExecutorSaturated(queue_depth=4, retry_after=7)
+
+    async def run():
+        refresher = RefreshScheduler(refresh)
+        refresher._limit = asyncio.Semaphore(1)
+        dealer = ScheduledDealer("https://a.com", 100.0)
+        await refresher._run(dealer)
+        assert dealer.runs == 0 and dealer.consecutive_failures == 0
+        assert not dealer.running
+
+    asyncio.run(run())
@@ -0,0 +1,102 @@
+import gzip
+import json
+import pytest
+import config
+import serialization
+from models import CarListing, ScraperResponse
+from serialization import etag_matches, make_etag, negotiate_encoding
+
+
+@pytest.fixture
+def no_brotli(monkeypatch):
+    monkeypatch.setattr(serialization, "brotli", None)
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    # Only its presence matters to negotiate_encoding()
+    monkeypatch.setattr(serialization, "brotli", object())
+
+
+def result():
+    return ScraperResponse(
+        success=True,
+        total_cars=2,
+        cars=[
+            CarListing(vin="A", make="Ford", model="F-150", year=2020, price=20000.0),
+            CarListing(vin="B", make="Honda", model="Civic", year=2019)
+        ],
+        timings={"total": 1.5}
+    )
+
+
+def test_encode_model_matches_model_dump():
+    response = result()
+    body = json.loads(serialization.encode_model(response, {"cache": {"status": "miss"}}))
+    assert body == {**json.loads(response.model_dump_json()), "cache": {"status": "miss"}}
+    assert "timings" not in body
+
+
+def test_encode_llm_format_matches_to_llm_format():
+    response = result()
+    body = json.loads(serialization.encode_llm_format(response, {"cache": {"status": "hit"}}))
+    assert body == {**response.to_llm_format(), "cache": {"status": "hit"}}
+
+
+def test_negotiate_encoding_without_brotli(no_brotli):
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("gzip;q=nonsense") is None
+
+
+def test_negotiate_encoding_with_brotli(with_brotli):
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0, *") == "gzip"
+    assert negotiate_encoding("identity") is None
+
+
+def test_compress_small_bodies_are_left_alone(no_brotli):
+    body = b"{}"
+    assert serialization.compress(body, "gzip") == (body, None)
+
+
+def test_compress_gzip(no_brotli, monkeypatch):
+    monkeypatch.setattr(config, "RESPONSE_COMPRESS_MIN_BYTES", 10)
+    body = serialization.dumps({"vehicles": ["F-150"] * 100})
+    compressed, encoding = serialization.compress(body, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+
+    monkeypatch.setattr(config, "RESPONSE_COMPRESSION", False)
+    assert serialization.compress(body, "gzip") == (body, None)
+
+
+def test_make_etag_depends_on_content_and_representation():
+    etag = make_etag("abc123", "scrape", True, None, False)
+    assert etag.startswith('W/"abc123-')
+    assert etag == make_etag("abc123", "scrape", True, None, False)
+    assert etag != make_etag("abc123", "scrape", False, None, False)
+    assert etag != make_etag("abc123", "scrape", True, {"max_tokens": 500}, False)
+    assert etag != make_etag("def456", "scrape", True, None, False)
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = make_etag("abc123", "scrape")
+    strong = etag[2:]
+    assert etag_matches(etag, etag)
+    assert etag_matches(strong, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"other"', etag)
+
+
+def test_not_modified_keeps_validators():
+    response = serialization.not_modified({"ETag": 'W/"x"'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"x"'
+    assert response.headers["vary"] == "Accept-Encoding"
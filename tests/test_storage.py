@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+import pytest
+from models import CarListing
+from storage import SQLiteInventoryStore, dealership_id
+
+URL = "https://www.dealer.com/"
+
+
+def car(vin, price=20000.0):
+    return CarListing(vin=vin, make="Ford", model="F-150", year=2020, price=price)
+
+
+def days_ago(days):
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteInventoryStore(str(tmp_path / "inventory.db"))
+    yield store
+    store.close()
+
+
+def test_dealership_id_normalizes_the_url():
+    assert dealership_id("HTTPS://www.Dealer.com/") == dealership_id(URL)
+
+
+def test_save_and_read_back(store):
+    assert store.save_inventory(URL, [car("A"), car("B")], scraped_at="2024-01-01T00:00:00") == 2
+    vehicles = store.get_inventory(URL)
+    assert [item.vehicle_key for item in vehicles] == ["vin:A", "vin:B"]
+    assert vehicles[0].car.price == 20000.0
+    assert store.get_vehicle(URL, "vin:B").car.vin == "B"
+    assert store.get_vehicle(URL, "vin:Z") is None
+
+
+def test_vehicles_without_identity_are_skipped(store):
+    assert store.save_inventory(URL, [car("A"), CarListing(make="Ford")]) == 1
+
+
+def test_missing_vehicles_are_marked_removed(store):
+    store.save_inventory(URL, [car("A"), car("B")], scraped_at="2024-01-01T00:00:00")
+    store.save_inventory(URL, [car("A", price=19000.0)], scraped_at="2024-01-02T00:00:00")
+    assert [item.vehicle_key for item in store.get_inventory(URL)] == ["vin:A"]
+    everything = {item.vehicle_key: item for item in store.get_inventory(URL, include_removed=True)}
+    assert everything["vin:B"].removed_at == "2024-01-02T00:00:00"
+    assert everything["vin:A"].first_seen == "2024-01-01T00:00:00"
+    assert everything["vin:A"].car.price == 19000.0
+
+
+def test_partial_scrape_keeps_unseen_vehicles(store):
+    store.save_inventory(URL, [car("A"), car("B")], scraped_at="2024-01-01T00:00:00")
+    store.save_inventory(URL, [car("A")], scraped_at="2024-01-02T00:00:00", mark_removed=False)
+    assert len(store.get_inventory(URL)) == 2
+
+
+def test_returning_vehicle_is_no_longer_removed(store):
+    store.save_inventory(URL, [car("A")], scraped_at="2024-01-01T00:00:00")
+    store.save_inventory(URL, [], scraped_at="2024-01-02T00:00:00")
+    store.save_inventory(URL, [car("A")], scraped_at="2024-01-03T00:00:00")
+    assert store.get_vehicle(URL, "vin:A").removed_at is None
+
+
+def test_list_dealerships(store):
+    store.save_inventory(URL, [car("A")], scraped_at="2024-01-01T00:00:00")
+    store.save_inventory("https://other.com/", [car("B"), car("C")], scraped_at="2024-01-02T00:00:00")
+    assert store.list_dealerships() == [
+        {"dealership": "dealer.com", "url": URL, "scraped_at": "2024-01-01T00:00:00", "total_cars": 1},
+        {"dealership": "other.com", "url": "https://other.com/", "scraped_at": "2024-01-02T00:00:00", "total_cars": 2},
+    ]
+
+
+def test_inventory_as_of_an_earlier_scrape(store):
+    # Recent timestamps, so the versions are inside the history_days window
+    day1, noon, day2 = (days_ago(2), days_ago(1.5), days_ago(1))
+    store.save_inventory(URL, [car("A"), car("B")], scraped_at=day1)
+    store.save_inventory(URL, [car("A", price=19000.0), car("C")], scraped_at=day2)
+
+    before = store.get_inventory_at(URL, noon)
+    assert {item.vehicle_key: item.car.price for item in before} == {"vin:A": 20000.0, "vin:B": 20000.0}
+    assert all(item.scraped_at == day1 for item in before)
+
+    after = store.get_inventory_at(URL, day2)
+    assert {item.vehicle_key: item.car.price for item in after} == {"vin:A": 19000.0, "vin:C": 20000.0}
+    assert store.get_inventory_at(URL, days_ago(3)) == []
+
+
+def test_unchanged_vehicle_keeps_one_version(store):
+    store.save_inventory(URL, [car("A")], scraped_at="2024-01-01T00:00:00")
+    store.save_inventory(URL, [car("A")], scraped_at="2024-01-02T00:00:00")
+    versions = store._conn.execute("SELECT valid_from, valid_to FROM vehicle_history").fetchall()
+    assert [tuple(row) for row in versions] == [("2024-01-01T00:00:00", None)]
+
+
+def test_old_versions_are_pruned(tmp_path):
+    store = SQLiteInventoryStore(str(tmp_path / "inventory.db"), history_days=1)
+    store.save_inventory(URL, [car("A")], scraped_at="2000-01-01T00:00:00")
+    store.save_inventory(URL, [car("A", price=19000.0)], scraped_at="2000-01-02T00:00:00")
+    store.save_inventory(URL, [car("A", price=18000.0)])
+    assert store.get_inventory_at(URL, "2000-01-01T12:00:00") == []
+    store.close()
@@ -0,0 +1,95 @@
+import json
+import os
+import time
+import pytest
+import config
+import scraper
+from scraper import CarDealerScraper
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URL = "https://www.usautosofdallas.com/"
+with open(os.path.join(ROOT, "inventory_page.html"), encoding="utf-8") as f:
+    INVENTORY_PAGE = f.read()
+
+
+def feed_response(vehicles=15):
+    """A DWS feed answer in the short-code shape the captured page asks for"""
+    document = {"TotalCount": vehicles, "Vehicles": [
+        {"sn": f"S{i}", "ye": 2020, "ma": "Ford", "mo": "F-150", "pr": 30000 + i, "vin": f"1FTFW1E50MFA{i:05d}"}
+        for i in range(vehicles)
+    ]}
+    return f"dws_inventory_listing_4({json.dumps(document)});"
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Serve the captured inventory page and its DWS feed instead of the network"""
+    responses = {"feed": feed_response()}
+
+    def fetch_html(url, timeout=None):
+        if "/inv/vehicles" in url:
+            if isinstance(responses["feed"], Exception):
+                raise responses["feed"]
+            return responses["feed"]
+        return INVENTORY_PAGE
+
+    monkeypatch.setattr(scraper, "fetch_html", fetch_html)
+    monkeypatch.setattr(config, "DWS_FEED_FETCH", True)
+    return responses
+
+
+def scrape_streamed(**options):
+    streamed = []
+    parser = CarDealerScraper(vehicle_callback=streamed.append, **options)
+    result = parser.scrape_inventory(URL, fetch_mode="http", max_pages=1)
+    return result, streamed
+
+
+def test_feed_vehicles_are_streamed_once(site):
+    result, streamed = scrape_streamed()
+    assert {car.source for car in result.cars} == {"dws_feed"}
+    assert len(streamed) == len(result.cars) == 15
+    assert [car.vin for car in streamed] == [car.vin for car in result.cars]
+
+
+def test_cards_are_streamed_when_the_feed_fails(site):
+    site["feed"] = ValueError("feed down")
+    result, streamed = scrape_streamed()
+    assert {car.source for car in result.cars} == {"dom_card"}
+    assert len(streamed) == len(result.cars) == 15
+
+
+def test_cards_are_streamed_as_parsed_without_feed_fetching(site, monkeypatch):
+    monkeypatch.setattr(config, "DWS_FEED_FETCH", False)
+    result, streamed = scrape_streamed()
+    assert len(streamed) == len(result.cars) == 15
+
+
+def test_stream_respects_max_vehicles(site):
+    streamed = []
+    parser = CarDealerScraper(vehicle_callback=streamed.append)
+    result = parser.scrape_inventory(URL, fetch_mode="http", max_pages=1, max_vehicles=5)
+    assert len(streamed) == len(result.cars) == 5
+
+
+def test_iter_inventory_yields_vehicles_then_the_response(site):
+    items = list(CarDealerScraper().iter_inventory(URL, fetch_mode="http", max_pages=1))
+    response = items.pop()
+    assert response.success
+    assert [car.vin for car in items] == [car.vin for car in response.cars]
+
+
+def test_closing_iter_inventory_stops_its_scrape(site):
+    streamed = []
+    parser = CarDealerScraper(vehicle_callback=streamed.append)
+    stream = parser.iter_inventory(URL, fetch_mode="http", max_pages=1)
+    next(stream)
+    stream.close()
+    # The stopped scrape hands the callback back, and the next scrape runs in full
+    for _ in range(100):
+        if parser.vehicle_callback == streamed.append and parser._stop is None:
+            break
+        time.sleep(0.05)
+    assert parser.vehicle_callback == streamed.append
+    result = parser.scrape_inventory(URL, fetch_mode="http", max_pages=1)
+    assert len(streamed) == len(result.cars) == 15
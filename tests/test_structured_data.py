@@ -0,0 +1,128 @@
+import json
+from bs4 import BeautifulSoup
+from structured_data import (
+    SOURCE_DWS_FEED, SOURCE_INLINE_JSON, SOURCE_JSON_LD, car_from_mapping, extract_page_data, feed_page_urls,
+    feed_total, parse_json, vehicles_from_json
+)
+
+PAGE_URL = "https://www.dealer.com/inventory/"
+FEED_URL = "https://www.dealer.com/inv-scripts/inv/vehicles?pn=0&ps=20&sort=price"
+
+
+def test_parse_json_and_jsonp():
+    assert parse_json('{"a": 1}') == {"a": 1}
+    assert parse_json(' callback([{"a": 1}]); ') == [{"a": 1}]
+    assert parse_json("var x = 1;") is None
+
+
+def test_car_from_schema_org_vehicle():
+    car = car_from_mapping({
+        "@type": "Car",
+        "vehicleIdentificationNumber": "1ftfw1e50mfa00000",
+        "brand": {"@type": "Brand", "name": "Ford"},
+        "model": "F-150",
+        "vehicleModelDate": "2021",
+        "offers": {"@type": "Offer", "price": "32,995"},
+        "mileageFromOdometer": {"value": "12,345", "unitCode": "SMI"},
+        "image": [{"contentUrl": "/photos/1.jpg"}, "/photos/2.jpg", "/icons/badge.svg"],
+        "url": "/used/ford-f150-1/"
+    }, PAGE_URL, SOURCE_JSON_LD)
+
+    assert car.vin == "1FTFW1E50MFA00000"
+    assert (car.make, car.model, car.year) == ("Ford", "F-150", 2021)
+    assert (car.price, car.mileage) == (32995.0, 12345)
+    assert car.image_urls == ["https://www.dealer.com/photos/1.jpg", "https://www.dealer.com/photos/2.jpg"]
+    assert car.listing_url == "https://www.dealer.com/used/ford-f150-1/"
+    assert car.source == SOURCE_JSON_LD
+
+
+def test_non_vehicles_are_ignored():
+    assert car_from_mapping({"@type": "Organization", "name": "Dealer"}, PAGE_URL, SOURCE_JSON_LD) is None
+    assert car_from_mapping({"make": False, "model": True}, PAGE_URL, SOURCE_INLINE_JSON) is None
+
+
+def test_call_for_price_is_not_a_price():
+    car = car_from_mapping({"make": "Ford", "model": "Edge", "price": 0}, PAGE_URL, SOURCE_INLINE_JSON)
+    assert car.price is None
+
+
+def test_extract_page_data_finds_json_ld_inline_json_and_feeds():
+    vehicles = {"results": {"vehicles": [
+        {"make": "Honda", "model": "Civic", "year": 2019},
+        {"make": "Toyota", "model": "Camry", "year": 2020},
+    ]}}
+    html = f"""
+    <html><head>
+      <script type="application/ld+json">{json.dumps({"@type": "Car", "brand": "Ford", "model": "Focus"})}</script>
+      <script type="application/json">{json.dumps(vehicles)}</script>
+      <script>window.analytics = {{"make": "Ford"}};</script>
+      <script src="/inv-scripts/v1/inv/vehicles?pn=0&amp;ps=20"></script>
+      <script src="/inv-scripts/v1/inv/vehicles?pn=0&amp;ps=20"></script>
+      <script src="/js/app.js"></script>
+    </head></html>
+    """
+    cars, feeds = extract_page_data(BeautifulSoup(html, "html.parser"), PAGE_URL)
+
+    assert [(car.make, car.source) for car in cars] == [
+        ("Ford", SOURCE_JSON_LD), ("Honda", SOURCE_INLINE_JSON), ("Toyota", SOURCE_INLINE_JSON)
+    ]
+    assert feeds == ["https://www.dealer.com/inv-scripts/v1/inv/vehicles?pn=0&ps=20"]
+
+
+def test_feed_total():
+    assert feed_total({"TotalCount": "57", "vehicles": []}) == 57
+    assert feed_total({"vehicles": []}) is None
+    assert feed_total([]) is None
+
+
+def test_feed_page_urls_lists_the_remaining_pages():
+    urls, more = feed_page_urls(FEED_URL, total=57, max_pages=20)
+    assert urls == [
+        "https://www.dealer.com/inv-scripts/inv/vehicles?pn=1&ps=20&sort=price",
+        "https://www.dealer.com/inv-scripts/inv/vehicles?pn=2&ps=20&sort=price",
+    ]
+    assert more is False
+
+
+def test_feed_page_urls_stops_at_max_pages():
+    urls, more = feed_page_urls(FEED_URL, total=200, max_pages=3)
+    assert [url.split("pn=")[1].split("&")[0] for url in urls] == ["1", "2"]
+    assert more is True
+
+
+def test_feed_page_urls_single_page_or_unpaged_feed():
+    assert feed_page_urls(FEED_URL, total=15, max_pages=20) == ([], False)
+    assert feed_page_urls("https://www.dealer.com/inv-scripts/inv/vehicles?sort=price", 100, 20) == ([], False)
+
+
+def test_dws_feed_short_codes():
+    # Shape of a DWS feed answering f=id|sn|ye|ma|mo|tr|dt|ta|td|en|mi|dr|ec|ic|bt|pr|im|eq|vd|vin|...
+    feed = """dws_inventory_listing_4({"TotalCount": 16, "Vehicles": [
+        {"id": 343106, "sn": "R1234", "ye": 2024, "ma": "RAM", "mo": "2500", "tr": "Crew Cab",
+         "dt": "4WD", "ta": "Automatic", "en": "6.7L I6", "mi": "6,018", "ec": "Bright White",
+         "ic": "Black", "bt": "Truck", "pr": "$52,995", "im": ["/photos/343106-1.jpg"],
+         "eq": ["Tow Package", "Heated Seats"], "vin": "3c6ur5fl0rg000000"},
+        {"id": 343107, "sn": "R1235", "ye": 2019, "ma": "Honda", "mo": "Civic", "tr": "", "pr": 0}
+    ]});"""
+    document = parse_json(feed)
+    cars = vehicles_from_json(document, PAGE_URL, SOURCE_DWS_FEED)
+
+    assert feed_total(document) == 16
+    assert len(cars) == 2
+    ram = cars[0]
+    assert (ram.year, ram.make, ram.model) == (2024, "RAM", "2500 Crew Cab")
+    assert (ram.stock_number, ram.vin) == ("R1234", "3C6UR5FL0RG000000")
+    assert (ram.price, ram.mileage) == (52995.0, 6018)
+    assert (ram.drivetrain, ram.transmission, ram.engine, ram.body_style) == ("4WD", "Automatic", "6.7L I6", "Truck")
+    assert (ram.exterior_color, ram.interior_color) == ("Bright White", "Black")
+    assert ram.features == ["Tow Package", "Heated Seats"]
+    assert ram.image_urls == ["https://www.dealer.com/photos/343106-1.jpg"]
+    assert ram.source == SOURCE_DWS_FEED
+
+    civic = cars[1]
+    assert (civic.model, civic.price) == ("Civic", None)
+
+
+def test_trim_already_in_model_is_not_repeated():
+    car = car_from_mapping({"make": "RAM", "model": "2500 Crew Cab", "trim": "crew cab"}, PAGE_URL, SOURCE_INLINE_JSON)
+    assert car.model == "2500 Crew Cab"
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import pytest
+from workers import ExecutorSaturated, ScrapeExecutor
+
+
+def test_run_returns_the_result():
+    executor = ScrapeExecutor(max_workers=1, max_queue=0)
+    assert asyncio.run(executor.run(lambda a, b=0: a + b, 2, b=3)) == 5
+    assert executor.stats()["running"] == 0
+    executor.shutdown()
+
+
+def test_rejects_beyond_workers_and_queue():
+    executor = ScrapeExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def run():
+        waiting = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated) as raised:
+            await executor.run(release.wait)
+        assert raised.value.queue_depth == 2
+        release.set()
+        await asyncio.gather(*waiting)
+
+    asyncio.run(run())
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+def test_cancelled_caller_keeps_the_slot_until_the_thread_finishes():
+    executor = ScrapeExecutor(max_workers=1, max_queue=0)
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+
+    async def run():
+        task = asyncio.create_task(executor.run(work))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The thread is still busy, so there is no free slot yet
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(work)
+        release.set()
+        for _ in range(100):
+            if executor._pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor._pending == 0
+
+    asyncio.run(run())
+    executor.shutdown()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the scrape executor has no free worker or queue slot"""
+
+    def __init__(self, queue_depth: int, retry_after: int):
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+        super().__init__(f"Scrape queue is full ({queue_depth} scrapes pending)")
+
+
+class ScrapeExecutor:
+    """
+    Bounded thread pool for blocking scrape work
+
+    Selenium calls, sleeps and BeautifulSoup parsing run on these threads so the
+    asyncio event loop stays free for /health and other requests. At most
+    max_workers scrapes run at once and max_queue more may wait; anything beyond
+    that is rejected immediately with ExecutorSaturated instead of hanging.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 4):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scrape")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+        # Moving average of task duration, used to estimate Retry-After
+        self._avg_duration = 30.0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread and await its result"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturated(self._pending, self._retry_after())
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(self._timed, fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # A cancelled caller stops waiting, but a scrape already running keeps
+        # its slot until the thread actually finishes
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def _timed(self, fn, *args, **kwargs):
+        with self._lock:
+            self._running += 1
+        started = time.monotonic()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._running -= 1
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * elapsed
+
+    def _retry_after(self) -> int:
+        """Seconds until a slot is likely to free up (caller holds the lock)"""
+        waves = math.ceil(self._pending / self.max_workers)
+        return max(1, int(waves * self._avg_duration))
+
+    def stats(self) -> dict:
+        """Current queue depth and utilization"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": max(0, self._pending - self._running),
+                "rejected": self._rejected,
+                "avg_duration": round(self._avg_duration, 2)
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work; running scrapes finish on their own threads"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)